@@ -0,0 +1,98 @@
+"""Benchmark of mocked requests handled by the FastAPI endpoint and by the ASGI fast path.
+
+Requests are sent to the ASGI application in-process, so no server or network is measured. Each request matches the
+last of the configured routes and is recorded to the journal. Throughput is computed from CPU time of the whole
+process, i.e. it's the number of requests per second one core handles.
+
+Run from the repository root: `python -m benchmarks.fast_path`.
+"""
+
+import argparse
+import asyncio
+import http
+import json
+import os
+import pathlib
+import tempfile
+import time
+
+from trickster.config import get_config
+from trickster.model import Route
+from trickster.namespaces import get_namespaces
+from trickster.trickster_app import create_app
+
+from typing import Any
+
+BENCHMARK_CONFIG = {'internal_prefix': '/internal', 'journal_size': 1000, 'logging': {'version': 1}}
+
+
+def create_config_file(directory: pathlib.Path) -> None:
+    """Create configuration used by the benchmark and make Trickster load it."""
+    config_path = directory / 'config.json'
+    config_path.write_text(json.dumps(BENCHMARK_CONFIG))
+    os.environ['TRICKSTER_CONF_PATH'] = str(config_path)
+
+
+def create_apps(routes: int) -> dict[str, Any]:
+    """Create applications without and with the fast path, sharing one router with the given number of routes."""
+    config = get_config()
+    apps = {}
+    for name, fast_path in (('FastAPI endpoint', False), ('fast path', True)):
+        config.mocked_fast_path = fast_path
+        apps[name] = create_app()
+    get_namespaces(config=config).default.routes = [
+        Route.model_validate({'path': f'/items/{index}', 'responses': [{'status_code': 200, 'body': {'id': index}}]})
+        for index in range(routes)
+    ]
+    return apps
+
+
+async def call(app: Any, path: str) -> int:
+    """Send GET request to the application, return status code of the response."""
+    scope = {
+        'type': 'http', 'asgi': {'version': '3.0'}, 'http_version': '1.1', 'method': 'GET', 'scheme': 'http',
+        'path': path, 'raw_path': path.encode(), 'root_path': '', 'query_string': b'',
+        'headers': [(b'host', b'localhost')], 'client': ('127.0.0.1', 50000), 'server': ('localhost', 80),
+    }
+    status_code = 0
+
+    async def receive() -> dict[str, Any]:
+        return {'type': 'http.request', 'body': b'', 'more_body': False}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal status_code
+        if message['type'] == 'http.response.start':
+            status_code = message['status']
+
+    await app(scope, receive, send)
+    return status_code
+
+
+async def measure(app: Any, path: str, requests: int) -> float:
+    """Send requests to the application, return number of handled requests per second of CPU time."""
+    for _ in range(min(requests, 100)):
+        await call(app, path)
+    started = time.process_time()
+    for _ in range(requests):
+        if await call(app, path) != http.HTTPStatus.OK:
+            raise RuntimeError(f'Request to "{path}" was not matched.')
+    return requests / (time.process_time() - started)
+
+
+def main() -> None:
+    """Run the benchmark and print requests per second per core of both ways of handling mocked requests."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--routes', type=int, default=20, help='Number of configured routes')
+    parser.add_argument('--requests', type=int, default=5000, help='Number of measured requests')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        create_config_file(pathlib.Path(directory))
+        apps = create_apps(args.routes)
+    for name, app in apps.items():
+        throughput = asyncio.run(measure(app, f'/items/{args.routes - 1}', args.requests))
+        print(f'{name + ":":<20}{throughput:>10,.0f} requests/s per core')
+
+
+if __name__ == '__main__':
+    main()
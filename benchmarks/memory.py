@@ -0,0 +1,66 @@
+"""Benchmark of memory used by routes and by their compiled plan.
+
+Routes with two methods and one response are created and compiled with tracemalloc tracing allocations. Memory of the
+routes themselves and of the plan compiled for matching them is reported in bytes per route, for routes with literal
+paths and for routes with path variables.
+
+Run from the repository root: `python -m benchmarks.memory`.
+"""
+
+import argparse
+import gc
+import tracemalloc
+
+from trickster.model import Route
+from trickster.router import Router
+
+from typing import Callable, TypeVar
+
+T = TypeVar('T')
+
+
+def create_route(path: str) -> Route:
+    """Create route with two methods and one response."""
+    return Route.model_validate({
+        'path': path,
+        'http_methods': ['GET', 'POST'],
+        'responses': [{'status_code': 200, 'body': {'status': 'OK'}}],
+    })
+
+
+def get_allocated(function: Callable[[], T]) -> tuple[T, int]:
+    """Call the function, return its result and number of bytes it allocated and kept."""
+    gc.collect()
+    before = tracemalloc.get_traced_memory()[0]
+    result = function()
+    gc.collect()
+    return result, tracemalloc.get_traced_memory()[0] - before
+
+
+def measure(paths: list[str]) -> tuple[int, int]:
+    """Get bytes per route used by routes with given paths and by their compiled plan."""
+    routes, routes_size = get_allocated(lambda: [create_route(path) for path in paths])
+    router = Router(routes=routes)
+    _, plan_size = get_allocated(lambda: router.match_compiled('GET', '/non-existent'))
+    return routes_size // len(paths), plan_size // len(paths)
+
+
+def main() -> None:
+    """Run the benchmark and print bytes per route of routes, their plan and both together."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--routes', type=int, default=20000, help='Number of created routes')
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    scenarios = {
+        'literal paths': [f'/items/{index}' for index in range(args.routes)],
+        'variable paths': [f'/items/{index}/{{item_id:integer}}' for index in range(args.routes)],
+    }
+    print('bytes per route:    routes /  plan / total')
+    for name, paths in scenarios.items():
+        routes_size, plan_size = measure(paths)
+        print(f'{name + ":":<20}{routes_size:>6} / {plan_size:>5} / {routes_size + plan_size:>5}')
+
+
+if __name__ == '__main__':
+    main()
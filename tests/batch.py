@@ -0,0 +1,156 @@
+import http
+import uuid
+
+import pydantic
+import pytest
+
+from trickster.batch import Batch, BatchOperation
+from trickster.exceptions import ResourceNotFoundError, ValidationError
+from trickster.model import Route, Response, ResponseValidator
+from trickster.router import Router
+
+
+operations_adapter = pydantic.TypeAdapter(list[BatchOperation])
+
+
+def apply(router: Router, operations: list[dict]) -> list:
+    return Batch(router).apply(operations_adapter.validate_python(operations))
+
+
+def make_router() -> Router:
+    return Router(
+        routes=[Route(path='/users', responses=[Response(status_code=http.HTTPStatus.OK, body={'id': 1}, hits=2)])],
+        error_responses=[Response(status_code=http.HTTPStatus.NOT_FOUND, body={})]
+    )
+
+
+class TestBatch:
+    def test_apply(self):
+        router = make_router()
+        route_id = router.routes[0].id
+        response_id = router.routes[0].responses[0].id
+
+        results = apply(router, [
+            {'op': 'create_route', 'route': {'path': '/items'}},
+            {'op': 'create_response_validator', 'route_id': 0,
+             'validator': {'status_code': 200, 'json_schema': {'required': ['id']}}},
+            {'op': 'create_response', 'route_id': 0, 'response': {'status_code': 200, 'body': {'id': 2}}},
+            {'op': 'patch_route', 'route_id': str(route_id), 'patch': {'tags': ['users']}},
+            {'op': 'patch_response', 'route_id': str(route_id), 'response_id': str(response_id),
+             'patch': {'body': {'id': 3}}},
+        ])
+
+        assert [str(route.path) for route in router.routes] == ['/users', '/items']
+        assert router.routes[0].tags == ['users']
+        assert router.routes[0].responses[0].body == {'id': 3}
+        assert router.routes[0].responses[0].hits == 2
+        assert [response.body for response in router.routes[1].responses] == [{'id': 2}]
+        assert results[0] is router.routes[1]
+        assert results[3] is router.routes[0]
+        assert results[3].version == 2
+        assert router.version == 1
+
+    def test_apply_deletes(self):
+        router = make_router()
+        route = router.routes[0]
+        route.response_validators.append(ResponseValidator(status_code=http.HTTPStatus.OK, json_schema={}))
+        error_response_id = router.error_responses[0].id
+
+        results = apply(router, [
+            {'op': 'delete_response', 'route_id': str(route.id), 'response_id': str(route.responses[0].id)},
+            {'op': 'delete_response_validator', 'route_id': str(route.id),
+             'validator_id': str(route.response_validators[0].id)},
+            {'op': 'delete_route', 'route_id': str(route.id)},
+            {'op': 'create_route', 'route': {'path': '/items'}},
+            {'op': 'delete_routes'},
+            {'op': 'delete_error_response', 'response_id': str(error_response_id)},
+        ])
+
+        assert results[0].responses == []
+        assert results[1].response_validators == []
+        assert results[2] == [route.id]
+        assert results[4] == [results[3].id]
+        assert results[5] == [error_response_id]
+        assert router.routes == []
+        assert router.error_responses == []
+        assert route.responses != []
+
+    def test_apply_error_responses(self):
+        router = make_router()
+        error_response = router.error_responses[0]
+
+        results = apply(router, [
+            {'op': 'create_error_response', 'response': {'status_code': 500, 'body': {'error': True}}},
+            {'op': 'patch_error_response', 'response_id': str(error_response.id), 'patch': {'body': {'found': False}}},
+        ])
+
+        assert [response.body for response in router.error_responses] == [{'found': False}, {'error': True}]
+        assert router.error_responses[1] is results[0]
+        assert error_response.body == {}
+
+    def test_hits_are_kept(self):
+        router = make_router()
+        route = router.routes[0]
+        batch = Batch(router)
+        batch.edit_route(route.id)
+        batch.edit_error_response(router.error_responses[0].id)
+
+        route.hits = 5
+        route.responses[0].hits = 7
+        router.error_responses[0].hits = 3
+        batch.apply([])
+
+        assert router.routes[0] is not route
+        assert router.routes[0].hits == 5
+        assert router.routes[0].responses[0].hits == 7
+        assert router.error_responses[0].hits == 3
+
+    def test_failed_operation(self):
+        router = make_router()
+        routes = router.routes
+
+        with pytest.raises(ValidationError, match='Operation 1 failed: Unknown fields hits.'):
+            apply(router, [
+                {'op': 'create_route', 'route': {'path': '/items'}},
+                {'op': 'patch_route', 'route_id': 0, 'patch': {'hits': 1}},
+            ])
+
+        assert router.routes is routes
+        assert [str(route.path) for route in router.routes] == ['/users']
+
+    @pytest.mark.parametrize('operation, message', [
+        ({'op': 'delete_route', 'route_id': str(uuid.UUID(int=1))}, 'Route "00000000-0000-0000-0000-000000000001"'),
+        ({'op': 'delete_response', 'route_id': 0, 'response_id': str(uuid.UUID(int=1))}, 'Response "0000'),
+        ({'op': 'patch_response', 'route_id': 0, 'response_id': str(uuid.UUID(int=1)), 'patch': {}}, 'Response "'),
+        ({'op': 'delete_response_validator', 'route_id': 0, 'validator_id': str(uuid.UUID(int=1))}, 'Response_'),
+        ({'op': 'delete_error_response', 'response_id': str(uuid.UUID(int=1))}, 'Error response "'),
+    ])
+    def test_not_found(self, operation, message):
+        router = make_router()
+
+        with pytest.raises(ResourceNotFoundError, match=f'Operation 1 failed: {message}'):
+            apply(router, [{'op': 'create_route', 'route': {'path': '/items'}}, operation])
+
+    @pytest.mark.parametrize('reference', [1, 2, -1])
+    def test_invalid_reference(self, reference):
+        message = f'Operation 1 failed: Operation {reference} is not an earlier operation'
+        with pytest.raises(ValidationError, match=message):
+            apply(make_router(), [
+                {'op': 'create_error_response', 'response': {'status_code': 500, 'body': {}}},
+                {'op': 'patch_route', 'route_id': reference, 'patch': {}},
+            ])
+
+    def test_validated_after_all_operations(self):
+        router = make_router()
+        route = router.routes[0]
+
+        with pytest.raises(ValidationError, match=f'Route "{route.id}" is not valid'):
+            apply(router, [
+                {'op': 'patch_route', 'route_id': str(route.id),
+                 'patch': {'response_validators': [{'status_code': 200, 'json_schema': {'required': ['name']}}]}},
+                {'op': 'create_response', 'route_id': str(route.id),
+                 'response': {'status_code': 200, 'body': {'name': 'Mark Twain'}}},
+            ])
+
+        assert route.response_validators == []
+        assert len(route.responses) == 1
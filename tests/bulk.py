@@ -0,0 +1,132 @@
+import http
+import json
+
+import pytest
+
+from trickster.bulk import ImportItemError, ItemsParser, RouteImporter
+
+
+def parse(data: bytes, chunk_size: int) -> list:
+    parser = ItemsParser()
+    items = []
+    for position in range(0, len(data), chunk_size):
+        items.extend(parser.feed(data[position:position + chunk_size]))
+    items.extend(parser.feed(b'', final=True))
+    return items
+
+
+class TestItemsParser:
+    items = [{'path': '/items', 'tags': ['a', 'ř']}, 1, 2.5, -3e-5, 'text', None, True, [1, [2]]]
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 10, 1000])
+    def test_parse_array(self, chunk_size):
+        assert parse(json.dumps(self.items, ensure_ascii=False).encode(), chunk_size) == self.items
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 10, 1000])
+    def test_parse_array_escaped(self, chunk_size):
+        items = [*self.items, {'surrogate': '\U0001F600'}, float('-inf'), False]
+
+        assert parse(json.dumps(items).encode(), chunk_size) == items
+
+    @pytest.mark.parametrize('chunk_size', [1, 2, 3, 10, 1000])
+    def test_parse_ndjson(self, chunk_size):
+        data = '\n'.join(json.dumps(item, ensure_ascii=False) for item in self.items) + '\n\n'
+
+        assert parse(data.encode(), chunk_size) == self.items
+
+    @pytest.mark.parametrize('data', [b'', b'  \n', b'[]', b' [ ] '])
+    def test_parse_empty(self, data):
+        assert parse(data, 1) == []
+
+    def test_parse_ndjson_invalid_line(self):
+        items = parse(b'{"a": 1}\n{"a": \n{"a": 2}', 1000)
+
+        assert items[0] == {'a': 1}
+        assert isinstance(items[1], ImportItemError)
+        assert items[1].index == 1
+        assert items[2] == {'a': 2}
+
+    @pytest.mark.parametrize('data, message', [
+        (b'[1,]', 'Invalid json: Expecting value at item 1.'),
+        (b'[1 2]', 'Invalid json: Expecting "," delimiter at item 1.'),
+        (b'[1, 2', 'Invalid json: Unterminated array.'),
+        (b'[1] 2', 'Invalid json: Extra data after the end of the array.'),
+    ])
+    def test_parse_invalid_array(self, data, message):
+        with pytest.raises(ValueError, match=message):
+            parse(data, 1)
+
+    @pytest.mark.parametrize('data', [b'[1, {"a": x}, ', b'[1, {"a": "x\n', b'[1, {"a": 1 "b"', b'[1, {"a": "\\uXX'])
+    def test_parse_invalid_array_before_end(self, data):
+        with pytest.raises(ValueError, match='Invalid json: .* at item 1.'):
+            ItemsParser().feed(data)
+
+    def test_parse_long_item(self, mocker):
+        mocker.patch.object(ItemsParser, 'MAX_ITEM_SIZE', 10)
+        parser = ItemsParser()
+        parser.feed(b'["short", "')
+
+        with pytest.raises(ValueError, match='Invalid json: Item 1 is longer than 10 characters.'):
+            parser.feed(b'a' * 10)
+
+    def test_parse_long_line(self, mocker):
+        mocker.patch.object(ItemsParser, 'MAX_ITEM_SIZE', 10)
+
+        with pytest.raises(ValueError, match='Line 1 is longer than 10 characters.'):
+            parse(b'"short"\n"' + b'a' * 10, 4)
+
+    def test_parse_split_item_again_after_buffer_doubles(self, mocker):
+        parser = ItemsParser()
+        raw_decode = mocker.spy(parser._scanner, 'raw_decode')
+
+        items = [item for chunk in [b'["'] + [b'a'] * 1000 + [b'"]'] for item in parser.feed(chunk)]
+        items.extend(parser.feed(b'', final=True))
+
+        assert items == ['a' * 1000]
+        assert raw_decode.call_count < 20
+
+
+class TestRouteImporter:
+    def test_import(self, mocker):
+        mocker.patch.object(RouteImporter, 'BATCH_SIZE', 2)
+        routes = [{'path': f'/items/{index}', 'responses': [{'status_code': 200, 'body': {}}]} for index in range(5)]
+        importer = RouteImporter()
+
+        result = importer.import_chunks([json.dumps(routes).encode()])
+
+        assert result.imported == 5
+        assert result.errors == []
+        assert [str(route.path) for route in importer.routes] == [route['path'] for route in routes]
+        assert importer.routes[0].responses[0].status_code == http.HTTPStatus.OK
+
+    def test_import_errors(self, mocker):
+        mocker.patch.object(RouteImporter, 'BATCH_SIZE', 2)
+        routes = [
+            {'path': '/valid'},
+            {'path': '/method', 'http_methods': ['FETCH']},
+            {'path': '/valid'},
+            {
+                'path': '/invalid_response',
+                'responses': [{'status_code': 200, 'body': {}}],
+                'response_validators': [{'status_code': 200, 'json_schema': {'type': 'array'}}]
+            },
+            {},
+        ]
+        importer = RouteImporter()
+
+        result = importer.import_chunks([json.dumps(routes).encode()])
+
+        assert result.imported == 0
+        assert importer.routes == []
+        assert [error.index for error in result.errors] == [1, 3, 4]
+        assert result.errors[0].message.startswith('http_methods.0: Input should be')
+        assert 'doesn\'t match ony of the configured validators' in result.errors[1].message
+        assert result.errors[2].message == 'path: Field required'
+
+    def test_import_invalid_document(self):
+        importer = RouteImporter()
+
+        result = importer.import_chunks([b'[{"path": "/items"}, {"path": "/users"} {}]'])
+
+        assert result.imported == 0
+        assert result.errors == [ImportItemError(index=2, message='Invalid json: Expecting "," delimiter at item 2.')]
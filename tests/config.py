@@ -91,7 +91,22 @@ class TestConfig:
         assert config.model_dump() == {
             'internal_prefix': '/internal',
             'openapi_boostrap': None,
+            'openapi_specs': [],
+            'openapi_cache': None,
+            'openapi_examples': False,
+            'openapi_request_validation': False,
             'logging': {'version': 1},
+            'journal_size': 1000,
+            'shared_state': None,
+            'shared_hits_interval': 1.0,
+            'snapshot_path': None,
+            'snapshot_interval': 10.0,
+            'snapshot_load': True,
+            'reload_interval': None,
+            'reaper_interval': 1.0,
+            'namespace_header': 'X-Trickster-Namespace',
+            'namespace_prefix': None,
+            'mocked_fast_path': False,
             'settings': {'error_responses': []}
         }
 
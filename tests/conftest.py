@@ -10,6 +10,8 @@ from trickster.trickster_app import create_app
 from trickster.config import get_config
 from trickster.meta import project_root
 from trickster.router import get_router
+from trickster.shared_state import get_shared_state
+from trickster.snapshot import get_snapshotter
 from trickster.model import Route
 
 mocked_files_path = project_root / 'tests/mocked_files'
@@ -92,3 +94,23 @@ def mocked_openapi(mocked_config, request):
     yield
     get_router.cache_clear()
     mocked_config.openapi_boostrap = orig_config
+
+
+@pytest.fixture(scope='function')
+def mocked_shared_state(mocked_config, tmp_path):
+    get_shared_state.cache_clear()
+    mocked_config.shared_state = tmp_path / 'state.db'
+    mocked_config.shared_hits_interval = 0.0
+    yield get_shared_state(mocked_config)
+    mocked_config.shared_state = None
+    get_shared_state.cache_clear()
+
+
+@pytest.fixture(scope='function')
+def mocked_snapshotter(mocked_config, tmp_path):
+    get_snapshotter.cache_clear()
+    mocked_config.snapshot_path = tmp_path / 'snapshot.bin'
+    mocked_config.snapshot_interval = 0.01
+    yield get_snapshotter(mocked_config)
+    mocked_config.snapshot_path = None
+    get_snapshotter.cache_clear()
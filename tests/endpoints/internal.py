@@ -1,7 +1,10 @@
 import copy
+import datetime
 import http
+import json
 import uuid
 
+from trickster.metrics import get_metrics
 from trickster.model import Route, Response, ResponseValidator
 from tests.conftest import AUTH_TOKEN
 
@@ -14,6 +17,17 @@ class TestHealthcheck:
         assert result.json() == {'status': 'OK'}
 
 
+class TestMetrics:
+    def test_metrics(self, mocked_config, client):
+        get_metrics().counter('trickster_test_total', 'Test counter').increment()
+
+        result = client.get(f'{mocked_config.internal_prefix}/metrics')
+
+        assert result.status_code == 200
+        assert result.headers['Content-Type'] == 'text/plain; version=0.0.4; charset=utf-8'
+        assert 'trickster_test_total 1\n' in result.text
+
+
 class TestInternalEndpoints:
     payload_route = {
         'path': '/items',
@@ -63,6 +77,11 @@ class TestInternalEndpoints:
             },
             'hits': 0,
             'response_selector': 'first',
+            'request_validator': None,
+            'predicates': [],
+            'body_predicates': [],
+            'graphql': None,
+            'host': None,
             'http_methods': ['GET'],
             'path': '/users',
             'response_validators': [
@@ -94,7 +113,10 @@ class TestInternalEndpoints:
                     'status_code': 200,
                     'weight': 1.0
                 }
-            ]
+            ],
+            'tags': [],
+            'expires_at': None,
+            'version': 1
         }]
 
         result = client.get(
@@ -146,6 +168,147 @@ class TestInternalEndpoints:
         assert result.status_code == 400
         assert result.json()['error'] == 'Validation error'
 
+    def test_patch_route(self, mocked_config, mocked_router, client):
+        route = mocked_router.routes[0]
+        route.hits = 5
+
+        result = client.patch(
+            f'{mocked_config.internal_prefix}/routes/{route.id}',
+            json={'path': '/users/{user_id:int}', 'tags': ['users']},
+            headers={'Content-Type': 'application/merge-patch+json'}
+        )
+
+        assert result.status_code == 200
+        assert result.json()['path'] == '/users/{user_id:int}'
+        assert result.json()['tags'] == ['users']
+        assert result.json()['hits'] == 5
+        assert len(result.json()['responses']) == 2
+
+    def test_apply_batch(self, mocked_config, mocked_router, client):
+        route_id = mocked_router.routes[0].id
+
+        result = client.post(f'{mocked_config.internal_prefix}/batch', json=[
+            {'op': 'create_route', 'route': {'path': '/items'}},
+            {'op': 'create_response', 'route_id': 0, 'response': {'status_code': 200, 'body': {'id': 1}}},
+            {'op': 'delete_route', 'route_id': str(route_id)},
+            {'op': 'create_error_response', 'response': {'status_code': 500, 'body': {}}},
+        ])
+
+        assert result.status_code == 200
+        assert result.json()[0]['path'] == '/items'
+        assert result.json()[1]['responses'][0]['body'] == {'id': 1}
+        assert result.json()[2] == [str(route_id)]
+        assert result.json()[3]['status_code'] == 500
+        assert [str(route.path) for route in mocked_router.routes] == ['/items']
+
+    def test_apply_batch_failed(self, mocked_config, mocked_router, client):
+        result = client.post(f'{mocked_config.internal_prefix}/batch', json=[
+            {'op': 'create_route', 'route': {'path': '/items'}},
+            {'op': 'delete_route', 'route_id': str(uuid.UUID(int=1))},
+        ])
+
+        assert result.status_code == 404
+        assert result.json() == {
+            'error': 'Resource error',
+            'reason': 'Operation 1 failed: Route "00000000-0000-0000-0000-000000000001" was not found.'
+        }
+        assert [str(route.path) for route in mocked_router.routes] == ['/users']
+
+    def test_patch_route_ttl(self, mocked_config, mocked_router, client):
+        route = mocked_router.routes[0]
+
+        result = client.patch(f'{mocked_config.internal_prefix}/routes/{route.id}', json={'ttl': 60})
+
+        assert result.json()['expires_at'] is not None
+        assert mocked_router.next_expiration == route.expires_at
+
+    def test_create_routes_with_naive_and_aware_expiration(self, mocked_config, mocked_router, client):
+        routes = [
+            {'path': '/naive', 'expires_at': '2030-01-01T00:00:00'},
+            {'path': '/aware', 'expires_at': '2030-01-01T00:00:00Z'},
+            {'path': '/ttl', 'ttl': 60},
+        ]
+
+        results = [client.post(f'{mocked_config.internal_prefix}/routes', json=route) for route in routes]
+
+        assert [result.status_code for result in results] == [200, 200, 200]
+        assert results[0].json()['expires_at'] == '2030-01-01T00:00:00Z'
+        assert mocked_router.remove_expired_routes(datetime.datetime(2030, 1, 1, tzinfo=datetime.UTC)) == 3
+
+    def test_create_route_invalid_request_validator(self, mocked_config, mocked_router, client):
+        route = {'path': '/items', 'request_validator': {'query_schema': {'type': 'nonsense'}}}
+
+        result = client.post(f'{mocked_config.internal_prefix}/routes', json=route)
+
+        assert result.status_code == 400
+        assert 'JsonSchema of query of the request validator is invalid' in result.json()['reason']
+        assert [str(route.path) for route in mocked_router.routes] == ['/users']
+
+    def test_patch_route_invalid(self, mocked_config, mocked_router, client):
+        route = mocked_router.routes[0]
+
+        result = client.patch(f'{mocked_config.internal_prefix}/routes/{route.id}', json={'http_methods': ['FETCH']})
+
+        assert result.status_code == 400
+        assert result.json()['reason'].startswith('Failed validation: 1 validation error for InputRoute')
+        assert route.http_methods == [http.HTTPMethod.GET]
+
+    def test_patch_route_non_existent(self, mocked_config, client):
+        route_id = uuid.uuid4()
+
+        result = client.patch(f'{mocked_config.internal_prefix}/routes/{route_id}', json={'tags': []})
+
+        assert result.status_code == 404
+        assert result.json() == {'error': 'Resource error', 'reason': f'Route "{route_id}" was not found.'}
+
+    def test_patch_route_response(self, mocked_config, mocked_router, client):
+        route = mocked_router.routes[0]
+        response = route.responses[0]
+
+        result = client.patch(
+            f'{mocked_config.internal_prefix}/routes/{route.id}/responses/{response.id}',
+            json={'body': {'user_name': 'Samuel Clemens'}, 'delay': 0.5}
+        )
+
+        assert result.status_code == 200
+        assert result.json()['responses'][0]['body'] == {'user_id': 1234, 'user_name': 'Samuel Clemens'}
+        assert result.json()['responses'][0]['delay'] == [0.5, 0.5]
+        assert route.responses[0] is response
+
+    def test_patch_route_response_invalid(self, mocked_config, mocked_router, client):
+        route = mocked_router.routes[0]
+        response = route.responses[0]
+
+        invalid_body = client.patch(
+            f'{mocked_config.internal_prefix}/routes/{route.id}/responses/{response.id}',
+            json={'body': {'user_id': None}}
+        )
+        invalid_weight = client.patch(
+            f'{mocked_config.internal_prefix}/routes/{route.id}/responses/{response.id}', json={'weight': -1}
+        )
+
+        assert invalid_body.status_code == 400
+        assert invalid_weight.status_code == 400
+        assert response.body == {'user_id': 1234, 'user_name': 'Mark Twain'}
+        assert response.weight == 1.0
+
+    def test_patch_route_response_non_existent(self, mocked_config, mocked_router, client):
+        route_id = mocked_router.routes[0].id
+        response_id = uuid.uuid4()
+
+        missing_response = client.patch(
+            f'{mocked_config.internal_prefix}/routes/{route_id}/responses/{response_id}', json={}
+        )
+        missing_route = client.patch(
+            f'{mocked_config.internal_prefix}/routes/{response_id}/responses/{response_id}', json={}
+        )
+
+        assert missing_response.status_code == 404
+        assert missing_response.json() == {
+            'error': 'Resource error', 'reason': f'Response "{response_id}" was not found in route "{route_id}".'
+        }
+        assert missing_route.status_code == 404
+
     def test_delete_routes(self, mocked_config, mocked_router, client):
         result = client.delete(
             f'{mocked_config.internal_prefix}/routes', headers={'Authorization': f'Bearer {AUTH_TOKEN}'}
@@ -154,6 +317,77 @@ class TestInternalEndpoints:
         assert result.status_code == 200
         assert result.json() == []
 
+    def test_get_routes_filtered(self, mocked_config, mocked_router, client):
+        mocked_router.add_routes([Route(path='/items', tags=['items']), Route(path='/users/1', tags=['items'])])
+
+        result = client.get(
+            f'{mocked_config.internal_prefix}/routes', params={'path_prefix': '/users', 'tag': 'items'}
+        )
+
+        assert result.status_code == 200
+        assert [route['path'] for route in result.json()] == ['/users/1']
+
+    def test_get_routes_paginated(self, mocked_config, mocked_router, client):
+        mocked_router.add_routes([Route(path=f'/items/{index}') for index in range(3)])
+
+        first_page = client.get(f'{mocked_config.internal_prefix}/routes', params={'limit': 3})
+        cursor = first_page.headers['X-Next-Cursor']
+        second_page = client.get(f'{mocked_config.internal_prefix}/routes', params={'limit': 3, 'cursor': cursor})
+
+        assert [route['path'] for route in first_page.json()] == ['/users', '/items/0', '/items/1']
+        assert cursor == f"2:{first_page.json()[-1]['id']}"
+        assert [route['path'] for route in second_page.json()] == ['/items/2']
+        assert 'X-Next-Cursor' not in second_page.headers
+
+    def test_get_routes_paginated_after_deleted_route(self, mocked_config, mocked_router, client):
+        mocked_router.add_routes([Route(path=f'/items/{index}') for index in range(3)])
+
+        first_page = client.get(f'{mocked_config.internal_prefix}/routes', params={'limit': 2})
+        client.delete(f"{mocked_config.internal_prefix}/routes/{first_page.json()[-1]['id']}")
+        cursor = first_page.headers['X-Next-Cursor']
+        second_page = client.get(f'{mocked_config.internal_prefix}/routes', params={'limit': 2, 'cursor': cursor})
+
+        assert [route['path'] for route in first_page.json()] == ['/users', '/items/0']
+        assert [route['path'] for route in second_page.json()] == ['/items/1', '/items/2']
+        assert 'X-Next-Cursor' not in second_page.headers
+
+    def test_get_routes_invalid_cursor(self, mocked_config, mocked_router, client):
+        cursor = uuid.uuid4()
+
+        result = client.get(f'{mocked_config.internal_prefix}/routes', params={'cursor': str(cursor)})
+
+        assert result.status_code == 400
+        assert result.json() == {'error': 'Validation error', 'reason': f'Cursor "{cursor}" is invalid.'}
+
+    def test_get_routes_fields(self, mocked_config, mocked_router, client):
+        result = client.get(f'{mocked_config.internal_prefix}/routes', params={'fields': 'path, hits'})
+
+        assert result.status_code == 200
+        assert result.json() == [{'id': str(mocked_router.routes[0].id), 'path': '/users', 'hits': 0}]
+
+    def test_get_routes_unknown_fields(self, mocked_config, mocked_router, client):
+        result = client.get(f'{mocked_config.internal_prefix}/routes', params={'fields': 'path,name,size'})
+
+        assert result.status_code == 400
+        assert result.json() == {'error': 'Validation error', 'reason': 'Unknown fields name, size.'}
+
+    def test_delete_routes_return_ids(self, mocked_config, mocked_router, client):
+        route_id = mocked_router.routes[0].id
+
+        result = client.delete(f'{mocked_config.internal_prefix}/routes', params={'return_ids': True})
+
+        assert result.status_code == 200
+        assert result.json() == [str(route_id)]
+        assert mocked_router.routes == []
+
+    def test_delete_route_return_ids(self, mocked_config, mocked_router, client):
+        route_id = mocked_router.routes[0].id
+
+        result = client.delete(f'{mocked_config.internal_prefix}/routes/{route_id}', params={'return_ids': True})
+
+        assert result.status_code == 200
+        assert result.json() == [str(route_id)]
+
     def test_delete_route(self, mocked_config, mocked_router, client):
         additional_payload = {
             'path': '/books',
@@ -457,6 +691,59 @@ class TestInternalEndpoints:
         assert result.status_code == 200
         assert error_response_id not in [i['id'] for i in result.json()]
 
+    def test_delete_error_responses_return_ids(self, mocked_router, mocked_config, client):
+        mocked_router.add_error_response(Response(**self.payload_error_response))
+        error_response_id = mocked_router.error_responses[-1].id
+
+        result = client.delete(
+            f'{mocked_config.internal_prefix}/settings/error_responses',
+            params={'status_code': http.HTTPStatus.FORBIDDEN.value, 'return_ids': True}
+        )
+
+        assert result.status_code == 200
+        assert result.json() == [str(error_response_id)]
+
+    def test_delete_error_response_return_ids(self, mocked_router, mocked_config, client):
+        mocked_router.add_error_response(Response(**self.payload_error_response))
+        error_response_id = mocked_router.error_responses[-1].id
+
+        result = client.delete(
+            f'{mocked_config.internal_prefix}/settings/error_responses/{error_response_id}',
+            params={'return_ids': True}
+        )
+
+        assert result.status_code == 200
+        assert result.json() == [str(error_response_id)]
+
+    def test_patch_error_response(self, mocked_router, mocked_config, client):
+        error_response = mocked_router.error_responses[0]
+
+        result = client.patch(
+            f'{mocked_config.internal_prefix}/settings/error_responses/{error_response.id}',
+            json={'headers': {'Retry-After': '10'}}
+        )
+
+        assert result.status_code == 200
+        assert result.json()['id'] == str(error_response.id)
+        assert error_response.headers == {'Retry-After': '10'}
+
+    def test_patch_error_response_invalid(self, mocked_router, mocked_config, client):
+        error_response = mocked_router.error_responses[0]
+
+        result = client.patch(
+            f'{mocked_config.internal_prefix}/settings/error_responses/{error_response.id}', json={'status_code': 999}
+        )
+
+        assert result.status_code == 400
+
+    def test_patch_error_response_non_existent(self, mocked_config, client):
+        response_id = uuid.uuid4()
+
+        result = client.patch(f'{mocked_config.internal_prefix}/settings/error_responses/{response_id}', json={})
+
+        assert result.status_code == 404
+        assert result.json() == {'error': 'Resource error', 'reason': f'Error response "{response_id}" was not found.'}
+
     def test_delete_error_response_non_existent(self, mocked_config, client):
         non_existent_id = uuid.uuid4()
         result = client.delete(
@@ -476,3 +763,213 @@ class TestInternalEndpoints:
         )
 
         assert result.status_code == 404
+
+
+class TestOptimisticConcurrency:
+    response = {'status_code': 200, 'body': {'user_id': 1, 'user_name': 'Mark Twain'}}
+
+    def test_route_etag(self, mocked_config, mocked_router, client):
+        route_id = mocked_router.routes[0].id
+
+        fetched = client.get(f'{mocked_config.internal_prefix}/routes/{route_id}')
+        created = client.post(
+            f'{mocked_config.internal_prefix}/routes/{route_id}/responses',
+            json=self.response,
+            headers={'If-Match': fetched.headers['ETag']}
+        )
+        conflicting = client.post(
+            f'{mocked_config.internal_prefix}/routes/{route_id}/responses',
+            json=self.response,
+            headers={'If-Match': fetched.headers['ETag']}
+        )
+
+        assert fetched.headers['ETag'] == '"1"'
+        assert created.status_code == 200
+        assert created.headers['ETag'] == '"2"'
+        assert conflicting.status_code == 412
+        assert conflicting.json() == {
+            'error': 'Precondition error',
+            'reason': f'Route "{route_id}" was changed, current ETag is "2".'
+        }
+        assert len(mocked_router.routes[0].responses) == 3
+
+    def test_router_etag(self, mocked_config, mocked_router, client):
+        fetched = client.get(f'{mocked_config.internal_prefix}/routes')
+        error_responses = client.get(f'{mocked_config.internal_prefix}/settings/error_responses')
+        deleted = client.delete(f'{mocked_config.internal_prefix}/routes', headers={'If-Match': fetched.headers['ETag']})
+        conflicting = client.post(
+            f'{mocked_config.internal_prefix}/routes', json={'path': '/items'}, headers={'If-Match': '"1"'}
+        )
+
+        assert fetched.headers['ETag'] == error_responses.headers['ETag'] == '"1"'
+        assert deleted.headers['ETag'] == '"2"'
+        assert conflicting.status_code == 412
+        assert conflicting.json()['reason'] == 'Routes and error responses were changed, current ETag is "2".'
+        assert mocked_router.routes == []
+
+    def test_route_change_changes_router_etag(self, mocked_config, mocked_router, client):
+        route_id = mocked_router.routes[0].id
+
+        client.delete(f'{mocked_config.internal_prefix}/routes/{route_id}/responses')
+        result = client.get(f'{mocked_config.internal_prefix}/routes')
+
+        assert result.headers['ETag'] == '"2"'
+
+    def test_import_routes_precondition_failed(self, mocked_config, mocked_router, client):
+        result = client.post(
+            f'{mocked_config.internal_prefix}/routes/import', json=[{'path': '/items'}], headers={'If-Match': '"0"'}
+        )
+
+        assert result.status_code == 412
+        assert len(mocked_router.routes) == 1
+
+
+class TestImportRoutesEndpoint:
+    def test_import_routes_array(self, mocked_config, mocked_router, client):
+        routes = [{'path': f'/items/{index}'} for index in range(3)]
+        content = json.dumps(routes).encode()
+
+        result = client.post(
+            f'{mocked_config.internal_prefix}/routes/import', content=(content[i:i + 7] for i in range(0, 100, 7))
+        )
+
+        assert result.status_code == 200
+        assert result.json() == {'imported': 3, 'errors': []}
+        assert [str(route.path) for route in mocked_router.routes[-3:]] == ['/items/0', '/items/1', '/items/2']
+
+    def test_import_routes_ndjson(self, mocked_config, mocked_router, client):
+        content = '{"path": "/items/0"}\n{"path": "/items/1"}\n'
+
+        result = client.post(
+            f'{mocked_config.internal_prefix}/routes/import',
+            content=content,
+            headers={'content-type': 'application/x-ndjson'}
+        )
+
+        assert result.status_code == 200
+        assert result.json() == {'imported': 2, 'errors': []}
+        assert len(mocked_router.routes) == 3
+
+    def test_import_routes_invalid(self, mocked_config, mocked_router, client):
+        content = '{"path": "/items"}\n{"path": "/users", "http_methods": ["FETCH"]}\n{"path": \n'
+
+        result = client.post(f'{mocked_config.internal_prefix}/routes/import', content=content)
+
+        assert result.status_code == 400
+        assert [error['index'] for error in result.json()['errors']] == [1, 2]
+        assert result.json()['imported'] == 0
+        assert len(mocked_router.routes) == 1
+
+
+class TestJournalEndpoints:
+    def test_get_journal(self, mocked_config, mocked_router, client):
+        client.post('/users?page=2', json={'user_id': 1}, headers={'Authorization': f'Bearer {AUTH_TOKEN}'})
+
+        result = client.get(f'{mocked_config.internal_prefix}/journal')
+
+        assert result.status_code == 200
+        assert len(result.json()) == 1
+        assert result.json()[0]['method'] == 'POST'
+        assert result.json()[0]['path'] == '/users'
+        assert result.json()[0]['query_string'] == 'page=2'
+        assert result.json()[0]['body'] == '{"user_id": 1}'
+        assert result.json()[0]['status_code'] == 404
+
+    def test_delete_journal(self, mocked_config, mocked_router, client):
+        client.get('/users', headers={'Authorization': f'Bearer {AUTH_TOKEN}'})
+
+        result = client.delete(f'{mocked_config.internal_prefix}/journal')
+
+        assert result.status_code == 200
+        assert result.json() == []
+        assert mocked_router.journal.get_entries() == []
+
+    def test_verify_journal(self, mocked_config, mocked_router, client):
+        client.get('/users', headers={'Authorization': f'Bearer {AUTH_TOKEN}'})
+        client.get('/users')
+
+        result = client.post(
+            f'{mocked_config.internal_prefix}/journal/verify',
+            json={'http_method': 'GET', 'path': '/users', 'headers': {'Authorization': f'Bearer {AUTH_TOKEN}'}}
+        )
+
+        assert result.status_code == 200
+        assert result.json() == {'passed': True, 'count': 1, 'near_misses': []}
+
+    def test_verify_journal_failed(self, mocked_config, mocked_router, client):
+        client.get('/users')
+
+        result = client.post(
+            f'{mocked_config.internal_prefix}/journal/verify',
+            json={'route_id': str(mocked_router.routes[0].id), 'headers': {'Authorization': 'Bearer invalid'}}
+        )
+
+        assert result.status_code == 200
+        assert result.json()['passed'] is False
+        assert result.json()['count'] == 0
+        assert result.json()['near_misses'][0]['entry']['status_code'] == 401
+        assert result.json()['near_misses'][0]['mismatches'] == ['headers.Authorization']
+
+    def test_verify_journal_invalid(self, mocked_config, mocked_router, client):
+        result = client.post(f'{mocked_config.internal_prefix}/journal/verify', json={'body': {'user': 1}})
+
+        assert result.status_code == 400
+
+    def test_export_journal(self, mocked_config, mocked_router, client):
+        client.get('/users', headers={'Authorization': f'Bearer {AUTH_TOKEN}'})
+        client.get('/books')
+
+        result = client.get(f'{mocked_config.internal_prefix}/journal/export')
+        lines = result.text.splitlines()
+
+        assert result.status_code == 200
+        assert result.headers['content-type'] == 'application/x-ndjson'
+        assert result.headers['content-disposition'] == 'attachment; filename="journal.ndjson"'
+        assert [json.loads(line)['path'] for line in lines] == ['/users', '/books']
+        assert json.loads(lines[0])['response_body'] == mocked_router.routes[0].responses[0].body
+
+    def test_export_journal_har(self, mocked_config, mocked_router, client):
+        client.get('/users', headers={'Authorization': f'Bearer {AUTH_TOKEN}'})
+
+        result = client.get(f'{mocked_config.internal_prefix}/journal/export', params={'format': 'har'})
+        har_entries = result.json()['log']['entries']
+
+        assert result.status_code == 200
+        assert result.headers['content-type'] == 'application/json'
+        assert len(har_entries) == 1
+        assert har_entries[0]['request']['url'] == 'http://testserver/users'
+        assert har_entries[0]['response']['status'] == 200
+
+
+class TestSnapshotEndpoints:
+    def test_create_snapshot(self, mocked_snapshotter, mocked_router, mocked_config, client):
+        result = client.post(f'{mocked_config.internal_prefix}/snapshot')
+
+        assert result.status_code == 200
+        assert result.json()['path'] == str(mocked_snapshotter.path)
+        assert result.json()['size'] == mocked_snapshotter.path.stat().st_size
+
+    def test_create_snapshot_not_configured(self, mocked_router, mocked_config, client):
+        result = client.post(f'{mocked_config.internal_prefix}/snapshot')
+
+        assert result.status_code == 404
+        assert result.json() == {'error': 'Resource error', 'reason': 'Snapshots are not configured.'}
+
+    def test_restore_snapshot(self, mocked_snapshotter, mocked_router, mocked_config, client):
+        mocked_snapshotter.save(mocked_router)
+        route_id = mocked_router.routes[0].id
+        mocked_router.delete_routes()
+
+        result = client.post(f'{mocked_config.internal_prefix}/snapshot/restore')
+
+        assert result.status_code == 200
+        assert [route['id'] for route in result.json()] == [str(route_id)]
+        assert mocked_router.routes[0].id == route_id
+
+    def test_restore_snapshot_non_existent(self, mocked_snapshotter, mocked_router, mocked_config, client):
+        result = client.post(f'{mocked_config.internal_prefix}/snapshot/restore')
+
+        assert result.status_code == 404
+        assert result.json() == {
+            'error': 'Resource error', 'reason': f'Snapshot "{mocked_snapshotter.path}" was not found.'
+        }
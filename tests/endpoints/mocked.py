@@ -1,4 +1,8 @@
+import http
+
 from tests.conftest import AUTH_TOKEN
+from trickster.metrics import get_metrics
+from trickster.model import BodyPredicate, GraphQLPredicate, PredicateOperator, PredicateSource, RequestPredicate, RequestValidator, Response, Route
 
 
 class TestMockedEndpoints:
@@ -26,3 +30,89 @@ class TestMockedEndpoints:
 
         assert result.status_code == 401
         assert result.json() == {'auth': 'unauthorized'}
+
+    def test_mocked_response_invalid_request(self, mocked_router, client):
+        route = Route(
+            path='/items',
+            http_methods=[http.HTTPMethod.POST],
+            responses=[Response(status_code=http.HTTPStatus.OK, body={'created': True})],
+            request_validator=RequestValidator(
+                query_schema={'properties': {'limit': {'type': 'integer'}}},
+                body_schema={'required': ['name']},
+                status_code=http.HTTPStatus.UNPROCESSABLE_ENTITY
+            )
+        )
+        mocked_router.add_route(route)
+        invalid_requests = get_metrics().counter('trickster_invalid_requests_total', '')
+        invalid_count = invalid_requests.value
+
+        valid = client.post('/items?limit=1', json={'name': 'Twain'})
+        invalid = client.post('/items?limit=many', json={'name': 'Twain'})
+
+        assert valid.json() == {'created': True}
+        assert invalid.status_code == 422
+        assert invalid.json() == {
+            'error': 'Request validation error', 'reason': "Invalid query parameters at $.limit: 'many' is not of type 'integer'"
+        }
+        assert invalid_requests.value == invalid_count + 1
+        assert route.hits == 2
+        assert route.responses[0].hits == 1
+
+    def test_mocked_response_predicates(self, mocked_router, client):
+        mocked_router.add_routes([
+            Route(
+                path='/items',
+                responses=[Response(status_code=http.HTTPStatus.OK, body={'tenant': tenant})],
+                predicates=[
+                    RequestPredicate(source=PredicateSource.HEADER, name='X-Tenant', value=tenant),
+                    RequestPredicate(source=PredicateSource.COOKIE, name='debug', operator=PredicateOperator.ABSENT),
+                ]
+            )
+            for tenant in ['a', 'b', 'c', 'd', 'e', 'f']
+        ] + [Route(path='/items', responses=[Response(status_code=http.HTTPStatus.OK, body={'tenant': None})])])
+
+        assert client.get('/items', headers={'X-Tenant': 'e'}).json() == {'tenant': 'e'}
+        assert client.get('/items', headers={'X-Tenant': 'g'}).json() == {'tenant': None}
+        assert client.get('/items', headers={'X-Tenant': 'e'}, cookies={'debug': '1'}).json() == {'tenant': None}
+
+    def test_mocked_response_body_predicates(self, mocked_router, client):
+        mocked_router.add_routes([
+            Route(
+                path='/rpc',
+                http_methods=[http.HTTPMethod.POST],
+                responses=[Response(status_code=http.HTTPStatus.OK, body={'method': method})],
+                body_predicates=[BodyPredicate(path='$.method', value=method)]
+            )
+            for method in ['users.get', 'users.list']
+        ])
+
+        assert client.post('/rpc', json={'method': 'users.list'}).json() == {'method': 'users.list'}
+        assert client.post('/rpc', json={'method': 'users.delete'}).status_code == 404
+        assert client.post('/rpc', content=b'not json').status_code == 404
+
+    def test_mocked_response_graphql(self, mocked_router, client):
+        mocked_router.add_routes([
+            Route(
+                path='/graphql',
+                http_methods=[http.HTTPMethod.POST],
+                responses=[Response(status_code=http.HTTPStatus.OK, body={'data': {'operation': name}})],
+                graphql=GraphQLPredicate(operation_name=name)
+            )
+            for name in ['GetUser', 'GetUsers']
+        ])
+
+        result = client.post('/graphql', json={'query': 'query GetUsers { users { id } }'})
+        missing = client.post('/graphql', json={'query': 'query GetBooks { books { id } }'})
+
+        assert result.json() == {'data': {'operation': 'GetUsers'}}
+        assert missing.status_code == 404
+
+    def test_mocked_response_hosts(self, mocked_router, client):
+        mocked_router.add_routes([
+            Route(path='/v1/health', host=host, responses=[Response(status_code=http.HTTPStatus.OK, body={'host': host})])
+            for host in ['billing.local', 'users.local']
+        ])
+
+        assert client.get('/v1/health', headers={'Host': 'users.local'}).json() == {'host': 'users.local'}
+        assert client.get('/v1/health', headers={'Host': 'billing.local:8080'}).json() == {'host': 'billing.local'}
+        assert client.get('/v1/health').status_code == 404
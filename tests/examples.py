@@ -0,0 +1,76 @@
+import uuid
+
+import jsonschema
+import pytest
+
+from trickster.examples import ExampleGenerator
+
+
+ITEM = {
+    'type': 'object',
+    'required': ['id', 'name'],
+    'properties': {
+        'id': {'type': 'string', 'format': 'uuid'},
+        'name': {'type': 'string'},
+        'created': {'type': 'string', 'format': 'date-time'},
+        'price': {'type': 'number', 'minimum': 1, 'maximum': 2},
+        'count': {'type': 'integer', 'minimum': 0.5, 'maximum': 3},
+        'active': {'type': 'boolean'},
+        'state': {'type': 'string', 'enum': ['new', 'sold']},
+        'color': {'type': 'string', 'default': 'red'},
+        'parent': {'anyOf': [{'type': 'null'}, {'type': 'string'}]},
+        'tags': {'type': 'array', 'items': {'type': 'string'}},
+    }
+}
+
+
+class TestExampleGenerator:
+    def test_generate(self):
+        example = ExampleGenerator(ITEM, seed=1).generate()
+
+        jsonschema.validate(example, ITEM)
+        assert uuid.UUID(example['id']).version == 4
+        assert example['created'] == '2024-01-01T00:00:00Z'
+        assert 1 <= example['price'] <= 2
+        assert 1 <= example['count'] <= 3
+        assert example['color'] == 'red'
+        assert example['parent'] is None
+        assert len(example['tags']) == 1
+
+    def test_generate_is_deterministic(self):
+        assert ExampleGenerator(ITEM, seed=1).generate() == ExampleGenerator(ITEM, seed=1).generate()
+        assert ExampleGenerator(ITEM, seed=1).generate() != ExampleGenerator(ITEM, seed=2).generate()
+
+    @pytest.mark.parametrize('schema', [
+        {'type': 'integer', 'maximum': -10},
+        {'type': 'integer', 'minimum': -10},
+        {'type': 'number', 'maximum': 0.5},
+    ])
+    def test_generate_number_in_range(self, schema):
+        jsonschema.validate(ExampleGenerator(schema, seed=1).generate(), schema)
+
+    def test_generate_references(self):
+        schema = {
+            'type': 'array',
+            'items': {'$ref': '#/$defs/Item'},
+            '$defs': {'Item': ITEM, 'Tag': {'type': 'string'}},
+        }
+
+        assert ExampleGenerator(schema, 1, {'Item': {'id': 'example'}}).generate() == [{'id': 'example'}]
+        assert ExampleGenerator({**schema, 'items': {'$ref': '#/$defs/Tag'}}, 1).generate()[0].isalpha()
+        assert ExampleGenerator({**schema, 'items': {'$ref': '#/$defs/Missing'}}, 1).generate() == [None]
+
+    def test_generate_recursive(self):
+        schema = {
+            '$ref': '#/$defs/Node',
+            '$defs': {'Node': {
+                'type': 'object',
+                'required': ['name'],
+                'properties': {'name': {'type': 'string'}, 'children': {'type': 'array', 'items': {'$ref': '#/$defs/Node'}}}
+            }}
+        }
+
+        example = ExampleGenerator(schema, seed=1).generate()
+
+        jsonschema.validate(example, schema)
+        assert len(example['children']) == 1
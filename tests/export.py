@@ -0,0 +1,84 @@
+import http
+import json
+
+from trickster.export import ExportFormat, iter_har, iter_ndjson, to_har_entry
+from trickster.journal import JournalEntry
+from trickster.meta import get_metadata
+
+
+entries = [
+    JournalEntry(
+        method=http.HTTPMethod.POST,
+        path='/users',
+        query_string='page=2&sort=',
+        headers={'host': 'example.com', 'content-type': 'application/json'},
+        body='{"user_id": 1}',
+        status_code=201,
+        response_headers={'x-trickster': '1'},
+        response_body={'user_id': 1},
+        duration=0.25,
+    ),
+    JournalEntry(method=http.HTTPMethod.GET, path='/books', status_code=404),
+]
+
+
+class TestExportFormat:
+    def test_media_type(self):
+        assert ExportFormat.NDJSON.media_type == 'application/x-ndjson'
+        assert ExportFormat.HAR.media_type == 'application/json'
+
+    def test_export(self):
+        assert ''.join(ExportFormat.NDJSON.export(entries)) == ''.join(iter_ndjson(entries))
+        assert ''.join(ExportFormat.HAR.export(entries)) == ''.join(iter_har(entries))
+
+
+class TestExport:
+    def test_iter_ndjson(self):
+        lines = ''.join(iter_ndjson(entries)).splitlines()
+
+        assert [JournalEntry.model_validate_json(line) for line in lines] == entries
+
+    def test_iter_har(self):
+        har = json.loads(''.join(iter_har(entries)))
+
+        assert har['log']['version'] == '1.2'
+        assert har['log']['creator'] == {'name': get_metadata().name, 'version': get_metadata().version}
+        assert har['log']['entries'] == [to_har_entry(entry) for entry in entries]
+
+    def test_iter_har_empty(self):
+        assert json.loads(''.join(iter_har([])))['log']['entries'] == []
+
+    def test_to_har_entry(self):
+        har_entry = to_har_entry(entries[0])
+
+        assert har_entry['time'] == 250
+        assert har_entry['request'] == {
+            'method': 'POST',
+            'url': 'http://example.com/users?page=2&sort=',
+            'httpVersion': 'HTTP/1.1',
+            'cookies': [],
+            'headers': [{'name': 'host', 'value': 'example.com'}, {'name': 'content-type', 'value': 'application/json'}],
+            'queryString': [{'name': 'page', 'value': '2'}, {'name': 'sort', 'value': ''}],
+            'headersSize': -1,
+            'bodySize': 14,
+            'postData': {'mimeType': 'application/json', 'text': '{"user_id": 1}'},
+        }
+        assert har_entry['response'] == {
+            'status': 201,
+            'statusText': 'Created',
+            'httpVersion': 'HTTP/1.1',
+            'cookies': [],
+            'headers': [{'name': 'x-trickster', 'value': '1'}],
+            'content': {'size': 13, 'mimeType': 'application/json', 'text': '{"user_id":1}'},
+            'redirectURL': '',
+            'headersSize': -1,
+            'bodySize': 13,
+        }
+
+    def test_to_har_entry_without_body(self):
+        har_entry = to_har_entry(entries[1])
+
+        assert 'postData' not in har_entry['request']
+        assert har_entry['request']['url'] == 'http://localhost/books'
+        assert har_entry['response']['content']['text'] == ''
+        assert har_entry['response']['statusText'] == 'Not Found'
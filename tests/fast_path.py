@@ -0,0 +1,124 @@
+import http
+
+import pytest
+
+from fastapi.testclient import TestClient
+
+from tests.conftest import AUTH_TOKEN
+from trickster.fast_path import MockedFastPath
+from trickster.model import BodyPredicate, RequestValidator, Response, Route
+from trickster.namespaces import get_namespaces
+from trickster.trickster_app import create_app
+
+AUTH = {'Authorization': f'Bearer {AUTH_TOKEN}'}
+
+
+@pytest.fixture(scope='function')
+def fast_client(mocked_config):
+    mocked_config.mocked_fast_path = True
+    yield TestClient(create_app())
+    mocked_config.mocked_fast_path = False
+
+
+class TestMockedFastPath:
+    def test_middleware_is_added(self, fast_client, client):
+        assert any(middleware.cls is MockedFastPath for middleware in fast_client.app.user_middleware)
+        assert not any(middleware.cls is MockedFastPath for middleware in client.app.user_middleware)
+
+    def test_same_response_as_endpoint(self, fast_client, mocked_router, client):
+        mocked_router.routes[0].responses[0].headers = {'X-Header': 'value'}
+
+        expected = client.get('/users', headers=AUTH)
+        result = fast_client.get('/users', headers=AUTH)
+
+        assert result.status_code == expected.status_code == 200
+        assert result.content == expected.content
+        assert result.headers.raw == expected.headers.raw
+        assert mocked_router.routes[0].hits == 2
+        assert mocked_router.routes[0].responses[0].hits == 2
+
+    def test_journal(self, fast_client, mocked_router):
+        fast_client.post('/users?name=Twain', content=b'{"id": 1}')
+        fast_client.get('/users', headers=AUTH)
+
+        first, second = mocked_router.journal.get_entries()
+        assert (first.method, first.path, first.query_string, first.body) == ('POST', '/users', 'name=Twain', '{"id": 1}')
+        assert (first.route_id, first.status_code) == (None, 404)
+        assert (second.route_id, second.response_id) == (mocked_router.routes[0].id, mocked_router.routes[0].responses[0].id)
+
+    def test_not_found(self, fast_client, mocked_router):
+        assert fast_client.get('/non-existent-path').json() == {'error': 'Page not found'}
+
+        mocked_router.error_responses = []
+        result = fast_client.get('/non-existent-path')
+
+        assert result.status_code == 404
+        assert result.json() == {'error': 'Resource error', 'reason': 'No route or response was found for your request.'}
+
+    def test_not_authorised(self, fast_client, mocked_router):
+        result = fast_client.get('/users')
+
+        assert result.status_code == 401
+        assert result.json() == {'auth': 'unauthorized'}
+
+    def test_validation_error(self, fast_client, mocked_router):
+        mocked_router.add_route(Route(path='/items'))
+
+        result = fast_client.get('/items')
+
+        assert result.status_code == 400
+        assert result.json() == {'error': 'Validation error', 'reason': 'No suitable response found.'}
+        assert mocked_router.journal.get_entries() == []
+
+    def test_namespaces(self, fast_client, mocked_router, mocked_config):
+        router = get_namespaces(config=mocked_config).get('team-a')
+        router.add_route(Route(path='/users', responses=[Response(status_code=http.HTTPStatus.OK, body={'team': 'a'})]))
+
+        assert fast_client.get('/users', headers={'X-Trickster-Namespace': 'team-a'}).json() == {'team': 'a'}
+        assert fast_client.get('/users', headers={'X-Trickster-Namespace': 'team a'}).status_code == 400
+        assert len(router.journal) == 1
+
+    def test_passthrough(self, fast_client, mocked_router, mocked_config):
+        assert fast_client.get(f'{mocked_config.internal_prefix}/routes').json()[0]['id'] == str(mocked_router.routes[0].id)
+        assert fast_client.get('/openapi.json').status_code == 200
+        assert fast_client.request('FOO', '/users').status_code == 405
+        assert len(mocked_router.journal) == 0
+
+    def test_delay(self, fast_client, mocked_router, mocker):
+        sleep = mocker.patch('anyio.sleep')
+        response = Response(status_code=http.HTTPStatus.OK, body={}, delay=(0.1, 0.1))
+        mocked_router.add_route(Route(path='/items', responses=[response]))
+
+        fast_client.get('/items')
+
+        sleep.assert_called_once_with(0.1)
+
+    def test_shared_state(self, mocked_shared_state, fast_client, mocked_router, mocked_config):
+        namespaces = get_namespaces(config=mocked_config)
+        mocked_shared_state.initialize(namespaces)
+
+        fast_client.get('/users', headers=AUTH)
+
+        assert mocked_shared_state.get_hits()[mocked_router.routes[0].id] == 1
+
+    def test_snapshot(self, mocked_snapshotter, fast_client, mocked_router):
+        fast_client.get('/users', headers=AUTH)
+
+        assert mocked_snapshotter._changed
+
+    def test_request_validation(self, fast_client, mocked_router):
+        validator = RequestValidator(body_schema={'required': ['name']})
+        response = Response(status_code=http.HTTPStatus.OK, body={'created': True})
+        mocked_router.add_route(Route(path='/items', http_methods=['POST'], responses=[response], request_validator=validator))
+
+        assert fast_client.post('/items', json={'name': 'Twain'}).json() == {'created': True}
+        assert fast_client.post('/items', json={}).status_code == 400
+        assert [entry.body for entry in mocked_router.journal.get_entries()] == ['{"name": "Twain"}', '{}']
+
+    def test_body_predicates(self, fast_client, mocked_router):
+        response = Response(status_code=http.HTTPStatus.OK, body={'method': 'get'})
+        predicates = [BodyPredicate(path='/method', value='get')]
+        mocked_router.add_route(Route(path='/rpc', http_methods=['POST'], responses=[response], body_predicates=predicates))
+
+        assert fast_client.post('/rpc', json={'method': 'get'}).json() == {'method': 'get'}
+        assert fast_client.post('/rpc', json={'method': 'list'}).status_code == 404
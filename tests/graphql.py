@@ -0,0 +1,66 @@
+import pytest
+
+from trickster.graphql import GraphQLOperationType, GraphQLRequest, parse_document
+
+
+class TestParseDocument:
+    def test_parse_document(self):
+        document = '''
+            # Get user
+            query GetUser($id: ID! = "{", $filter: Filter = {active: true}) @cached(ttl: {seconds: 1}) {
+                user(id: $id, note: """ } """) { ...UserFields, name }
+            }
+            fragment UserFields on User @deprecated(reason: {}) { id }
+            mutation { deleteUser(id: 1.5e3) { id } }
+            { users { id } }
+        '''
+
+        operations = parse_document(document)
+
+        assert [(operation.operation_type, operation.name) for operation in operations] == [
+            (GraphQLOperationType.QUERY, 'GetUser'),
+            (GraphQLOperationType.MUTATION, None),
+            (GraphQLOperationType.QUERY, None),
+        ]
+
+    def test_parsed_documents_are_cached(self):
+        assert parse_document('query A { a }') is parse_document('query A { a }')
+
+    @pytest.mark.parametrize('document, message', [
+        ('', 'GraphQL document has no operations.'),
+        ('{ a', 'Selection set in GraphQL document is not closed.'),
+        ('query', 'Definition in GraphQL document has no selection set.'),
+        ('type User { id: ID }', 'Unexpected "type" in GraphQL document.'),
+        ('{ a(b: "c) }', 'Invalid GraphQL document at position 7.'),
+    ])
+    def test_parse_invalid_document(self, document, message):
+        with pytest.raises(ValueError, match=message):
+            parse_document(document)
+
+
+class TestGraphQLRequest:
+    def test_from_json(self):
+        request = GraphQLRequest.from_json({
+            'query': 'query A { a } mutation B { b }', 'operationName': 'B', 'variables': {'id': 1}
+        })
+
+        assert request.operation.operation_type == GraphQLOperationType.MUTATION
+        assert request.operation.name == 'B'
+        assert request.variables == {'id': 1}
+
+    def test_from_json_single_operation(self):
+        request = GraphQLRequest.from_json({'query': 'query A { a }', 'variables': None})
+
+        assert request.operation.name == 'A'
+        assert request.variables == {}
+
+    @pytest.mark.parametrize('body', [
+        [],
+        {'query': 1},
+        {'query': '{ a }', 'variables': ['id']},
+        {'query': '{ a'},
+        {'query': 'query A { a } query B { b }'},
+        {'query': 'query A { a }', 'operationName': 'B'},
+    ])
+    def test_from_json_invalid(self, body):
+        assert GraphQLRequest.from_json(body) is None
@@ -0,0 +1,213 @@
+import http
+import uuid
+
+import pytest
+import pydantic
+
+from trickster.journal import Journal, JournalEntry, JournalPredicate
+from trickster.jsonpath import JsonPath
+from trickster.model import Route, Response
+
+
+def make_entry(**kwargs) -> JournalEntry:
+    return JournalEntry(**{'method': http.HTTPMethod.GET, 'path': '/users', 'status_code': 200, **kwargs})
+
+
+class MockedURL:
+    path = '/users'
+    query = 'page=2'
+
+
+class MockedRequest:
+    method = 'POST'
+    url = MockedURL()
+    headers = {'content-type': 'application/json'}
+
+
+class TestJournalEntry:
+    def test_from_request(self):
+        route = Route(path='/users')
+        response = Response(status_code=http.HTTPStatus.CREATED, body={})
+
+        entry = JournalEntry.from_request(MockedRequest(), b'{"id": 1}', route, response, 0.5)
+
+        assert entry.method == http.HTTPMethod.POST
+        assert entry.path == '/users'
+        assert entry.query_string == 'page=2'
+        assert entry.headers == {'content-type': 'application/json'}
+        assert entry.body == '{"id": 1}'
+        assert entry.route_id == route.id
+        assert entry.response_id == response.id
+        assert entry.status_code == http.HTTPStatus.CREATED
+        assert entry.duration == 0.5
+
+    def test_from_request_not_matched(self):
+        entry = JournalEntry.from_request(MockedRequest(), b'', None, None, 0.0)
+
+        assert entry.route_id is None
+        assert entry.response_id is None
+        assert entry.status_code == http.HTTPStatus.NOT_FOUND
+
+    def test_get_json_body(self):
+        entry = make_entry(body='{"id": 1}')
+
+        assert entry.get_json_body() == {'id': 1}
+        assert entry.get_json_body() is entry.get_json_body()
+        assert make_entry(body='null').get_json_body() is None
+        assert make_entry(body='not json').get_json_body() is JsonPath.MISSING
+
+
+class TestJournal:
+    def test_record(self):
+        journal = Journal()
+        entries = [make_entry(), make_entry()]
+
+        for entry in entries:
+            journal.record(entry)
+
+        assert journal.get_entries() == entries
+        assert len(journal) == 2
+
+    def test_record_disabled(self):
+        journal = Journal(max_entries=0)
+
+        journal.record(make_entry())
+
+        assert not journal.enabled
+        assert journal.get_entries() == []
+
+    def test_record_evicts_oldest(self):
+        journal = Journal(max_entries=2)
+        route_id = uuid.uuid4()
+        entries = [
+            make_entry(route_id=route_id),
+            make_entry(method=http.HTTPMethod.POST),
+            make_entry(route_id=route_id),
+        ]
+
+        for entry in entries:
+            journal.record(entry)
+
+        assert journal.get_entries() == entries[1:]
+        assert journal.get_candidates(route_id=route_id) == entries[2:]
+        assert journal.get_candidates(method=http.HTTPMethod.GET) == entries[2:]
+
+        journal.record(make_entry())
+
+        assert journal.get_candidates(method=http.HTTPMethod.POST) == []
+
+    def test_get_candidates(self):
+        journal = Journal()
+        route_id = uuid.uuid4()
+        entries = [
+            make_entry(route_id=route_id),
+            make_entry(),
+            make_entry(method=http.HTTPMethod.POST, route_id=route_id),
+        ]
+        for entry in entries:
+            journal.record(entry)
+
+        assert journal.get_candidates() == entries
+        assert journal.get_candidates(method=http.HTTPMethod.GET) == entries[:2]
+        assert journal.get_candidates(route_id=route_id) == [entries[0], entries[2]]
+        assert journal.get_candidates(method=http.HTTPMethod.POST, route_id=route_id) == [entries[2]]
+        assert journal.get_candidates(method=http.HTTPMethod.GET, route_id=uuid.uuid4()) == []
+
+    def test_clear(self):
+        journal = Journal()
+        journal.record(make_entry(route_id=uuid.uuid4()))
+
+        journal.clear()
+
+        assert journal.get_entries() == []
+        assert journal.get_candidates(method=http.HTTPMethod.GET) == []
+
+
+class TestJournalPredicate:
+    def test_invalid_body_path(self):
+        with pytest.raises(pydantic.ValidationError):
+            JournalPredicate(body={'user': 1})
+
+    def test_count_with_range(self):
+        with pytest.raises(pydantic.ValidationError):
+            JournalPredicate(count=1, min_count=1)
+
+    @pytest.mark.parametrize('constraints, count_range', [
+        ({}, (1, None)),
+        ({'count': 0}, (0, 0)),
+        ({'min_count': 2}, (2, None)),
+        ({'max_count': 2}, (0, 2)),
+        ({'min_count': 1, 'max_count': 3}, (1, 3)),
+    ])
+    def test_count_range(self, constraints, count_range):
+        compiled = JournalPredicate(**constraints).compile()
+
+        assert (compiled.min_count, compiled.max_count) == count_range
+
+    def test_matches(self):
+        route_id = uuid.uuid4()
+        predicate = JournalPredicate(
+            http_method=http.HTTPMethod.POST,
+            path='/users/{user_id:integer}',
+            route_id=route_id,
+            headers={'X-Tenant': 'a'},
+            body={'$.user.name': 'Mark Twain'}
+        ).compile()
+        entry = make_entry(
+            method=http.HTTPMethod.POST,
+            path='/users/12',
+            route_id=route_id,
+            headers={'x-tenant': 'a'},
+            body='{"user": {"name": "Mark Twain"}}'
+        )
+
+        assert predicate.matches(entry)
+        assert predicate.get_mismatches(entry) == []
+        assert not predicate.matches(make_entry())
+        assert predicate.get_mismatches(make_entry()) == [
+            'http_method', 'route_id', 'path', 'headers.X-Tenant', 'body.user.name'
+        ]
+
+
+class TestCompiledJournalPredicate:
+    def test_verify(self):
+        journal = Journal()
+        for path in ['/users', '/users', '/books']:
+            journal.record(make_entry(path=path))
+
+        result = JournalPredicate(path='/users', count=2).compile().verify(journal)
+
+        assert result.passed
+        assert result.count == 2
+        assert result.near_misses == []
+
+    def test_verify_failed(self):
+        journal = Journal()
+        entries = [
+            make_entry(path='/books'),
+            make_entry(path='/users', method=http.HTTPMethod.POST),
+            make_entry(path='/users', method=http.HTTPMethod.PUT, headers={'x-tenant': 'a'}),
+        ]
+        for entry in entries:
+            journal.record(entry)
+        predicate = JournalPredicate(
+            http_method=http.HTTPMethod.PUT, path='/users', headers={'x-tenant': 'b'}, near_misses=2
+        )
+
+        result = predicate.compile().verify(journal)
+
+        assert not result.passed
+        assert result.count == 0
+        assert [miss.entry for miss in result.near_misses] == [entries[2], entries[1]]
+        assert result.near_misses[0].mismatches == ['headers.x-tenant']
+
+    def test_verify_too_many(self):
+        journal = Journal()
+        journal.record(make_entry())
+        journal.record(make_entry())
+
+        result = JournalPredicate(max_count=1).compile().verify(journal)
+
+        assert not result.passed
+        assert result.count == 2
+        assert result.near_misses == []
@@ -0,0 +1,70 @@
+import pytest
+
+from trickster.jsonpath import JsonPath, JsonPointer, compile_path
+
+
+class TestJsonPath:
+    @pytest.mark.parametrize('expression, steps', [
+        ('$', ()),
+        ('$.user', ('user',)),
+        ('$.users[1].name', ('users', 1, 'name')),
+        ("$['user name'][-1]", ('user name', -1)),
+    ])
+    def test_parse(self, expression, steps):
+        assert JsonPath(expression).steps == steps
+
+    @pytest.mark.parametrize('expression', ['user', '$.', '$[abc]', '$..user'])
+    def test_parse_invalid(self, expression):
+        with pytest.raises(ValueError):
+            JsonPath(expression)
+
+    def test_resolve(self):
+        document = {'users': [{'name': 'Mark Twain'}, {'name': 'Charles Dickens'}]}
+
+        assert JsonPath('$').resolve(document) == document
+        assert JsonPath('$.users[1].name').resolve(document) == 'Charles Dickens'
+        assert JsonPath('$.users[-1].name').resolve(document) == 'Charles Dickens'
+
+    @pytest.mark.parametrize('expression', ['$.books', '$.users[2]', '$.users.name', '$.users[0][0]'])
+    def test_resolve_missing(self, expression):
+        document = {'users': [{'name': 'Mark Twain'}]}
+
+        assert JsonPath(expression).resolve(document) is JsonPath.MISSING
+
+    def test_str(self):
+        assert str(JsonPath('$.users[0]')) == '$.users[0]'
+
+
+class TestJsonPointer:
+    @pytest.mark.parametrize('expression, steps', [
+        ('', ()),
+        ('/user', ('user',)),
+        ('/users/1/name', ('users', '1', 'name')),
+        ('/a~1b/m~0n', ('a/b', 'm~n')),
+    ])
+    def test_parse(self, expression, steps):
+        assert JsonPointer(expression).steps == steps
+
+    def test_parse_invalid(self):
+        with pytest.raises(ValueError, match='JSON pointer "user" must start with "/".'):
+            JsonPointer('user')
+
+    def test_resolve(self):
+        document = {'users': [{'name': 'Mark Twain'}, {'name': 'Charles Dickens'}], '1': 'one'}
+
+        assert JsonPointer('').resolve(document) == document
+        assert JsonPointer('/users/1/name').resolve(document) == 'Charles Dickens'
+        assert JsonPointer('/1').resolve(document) == 'one'
+
+    @pytest.mark.parametrize('expression', ['/books', '/users/2', '/users/-1', '/users/01', '/users/name', '/users/0/name/0'])
+    def test_resolve_missing(self, expression):
+        document = {'users': [{'name': 'Mark Twain'}]}
+
+        assert JsonPointer(expression).resolve(document) is JsonPath.MISSING
+
+
+class TestCompilePath:
+    def test_compile_path(self):
+        assert type(compile_path('$.users')) is JsonPath
+        assert type(compile_path('/users')) is JsonPointer
+        assert type(compile_path('')) is JsonPointer
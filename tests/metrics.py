@@ -0,0 +1,20 @@
+from trickster.metrics import Metrics, get_metrics
+
+
+class TestMetrics:
+    def test_counter(self):
+        metrics = Metrics()
+        counter = metrics.counter('requests_total', 'Number of requests')
+
+        counter.increment()
+        metrics.counter('requests_total', 'Number of requests').increment(2)
+
+        assert counter.value == 3
+        assert metrics.render() == (
+            '# HELP requests_total Number of requests\n'
+            '# TYPE requests_total counter\n'
+            'requests_total 3\n'
+        )
+
+    def test_get_metrics(self):
+        assert get_metrics() is get_metrics()
@@ -1,16 +1,23 @@
+import datetime
 import http
+import pickle
+import re
 import copy
 import random
 import uuid
 
+import jsonschema
 import pytest
 from fastapi import Request
+from starlette.datastructures import Headers
 
 from trickster.model import (
-    ParametrizedPath, Response, Route, ResponseDelay, ResponseValidator, ResponseSelector,
-    RouteMatch, InputResponseValidator, InputResponse, InputRoute, HealthcheckStatus, TokenAuth
+    BodyPredicate, GraphQLPredicate, ParametrizedPath, PredicateOperator, RequestBody, PredicateSource, RequestPredicate, RequestValidator, Response, Route, ResponseDelay, ResponseValidator, ResponseSelector,
+    RouteMatch, InputResponseValidator, get_request_hosts, InputResponse, InputRoute, HealthcheckStatus, TokenAuth
 )
 from trickster.exceptions import AuthenticationError
+from trickster.graphql import GraphQLOperation, GraphQLOperationType, GraphQLRequest
+from trickster.jsonpath import JsonPath
 from tests.conftest import AUTH_TOKEN
 
 from typing import cast
@@ -77,6 +84,19 @@ class TestParametrizedPath:
 
         assert path.match_path(from_request) == result
 
+    @pytest.mark.parametrize('raw, has_variables', [
+        ('/users', False),
+        ('/users/{user_id}', False),
+        ('/users/{user_id:integer}', True),
+    ])
+    def test_has_variables(self, raw, has_variables):
+        assert ParametrizedPath.model_validate(raw).has_variables is has_variables
+
+    def test_path_is_interned(self):
+        path = ''.join(['/users/', 'books'])
+
+        assert ParametrizedPath.model_validate(path).path is ParametrizedPath.model_validate('/users/books').path
+
 
 class TestResponseValidator:
     def test_validate_response_valid(self):
@@ -91,6 +111,28 @@ class TestResponseValidator:
 
         assert response_validator.validate_response(response) is None
 
+    def test_schema_is_compiled_once(self):
+        response_validator = ResponseValidator(status_code=http.HTTPStatus.OK, json_schema={'type': 'object'})
+        assert response_validator._compiled is None
+
+        response_validator.validate_response(Response(status_code=http.HTTPStatus.OK, body={}))
+        compiled = response_validator._compiled
+        response_validator.validate_response(Response(status_code=http.HTTPStatus.OK, body={'id': 1}))
+
+        assert isinstance(compiled, jsonschema.Draft202012Validator)
+        assert response_validator.get_compiled() is compiled
+        assert copy.deepcopy(response_validator).get_compiled() is compiled
+
+    def test_pickle_without_compiled_schema(self):
+        response_validator = ResponseValidator(status_code=http.HTTPStatus.OK, json_schema={'type': 'object'})
+        response_validator.get_compiled()
+
+        restored = pickle.loads(pickle.dumps(response_validator))
+
+        assert restored.model_dump() == response_validator.model_dump()
+        assert restored._compiled is None
+        assert response_validator._compiled is not None
+
     @pytest.mark.parametrize(
         'data, expectation',
         [
@@ -132,6 +174,250 @@ class TestResponseValidator:
         assert e.exconly(tryshort=True) == expectation
 
 
+class TestRequestValidator:
+    query_schema = {
+        'type': 'object',
+        'required': ['limit'],
+        'properties': {
+            'limit': {'type': 'integer', 'maximum': 10},
+            'price': {'type': 'number'},
+            'stock': {'type': 'boolean'},
+            'tag': {'type': 'array', 'items': {'type': 'integer'}},
+        }
+    }
+    body_schema = {'type': 'object', 'required': ['name'], 'properties': {'name': {'type': 'string'}}}
+
+    def test_validate_request(self):
+        request_validator = RequestValidator(query_schema=self.query_schema, body_schema=self.body_schema)
+        query = [('limit', '5'), ('price', '1.5'), ('stock', 'true'), ('tag', '1'), ('tag', '2'), ('other', 'x')]
+
+        request_validator.validate_request(query, b'{"name": "Twain"}')
+        request_validator.validate_request([('limit', '5')], b'')
+
+    @pytest.mark.parametrize('query, body, message', [
+        ([], b'{"name": "Twain"}', "Invalid query parameters at \\$: 'limit' is a required property"),
+        ([('limit', '11')], b'{"name": "Twain"}', 'Invalid query parameters at \\$.limit: 11 is greater than'),
+        ([('limit', 'many')], b'{"name": "Twain"}', "Invalid query parameters at \\$.limit: 'many' is not of type"),
+        ([('limit', '1'), ('stock', 'yes')], b'{}', "Invalid query parameters at \\$.stock: 'yes' is not of"),
+        ([('limit', '1'), ('tag', 'a')], b'{}', "Invalid query parameters at \\$.tag\\[0\\]: 'a' is not of"),
+        ([('limit', '1')], b'{"name": 1}', "Invalid request body at \\$.name: 1 is not of type 'string'"),
+        ([('limit', '1')], b'{"name": ', 'Request body is not a valid json: Expecting value'),
+    ])
+    def test_validate_request_invalid(self, query, body, message):
+        request_validator = RequestValidator(query_schema=self.query_schema, body_schema=self.body_schema)
+
+        with pytest.raises(ValueError, match=message):
+            request_validator.validate_request(query, body)
+
+    def test_validate_required_body(self):
+        request_validator = RequestValidator(body_required=True)
+
+        request_validator.validate_request([], b'anything')
+        with pytest.raises(ValueError, match='Request body is missing.'):
+            request_validator.validate_request([], b'')
+
+    @pytest.mark.parametrize('field', ['query_schema', 'body_schema'])
+    def test_invalid_schema(self, field):
+        name = field.removesuffix('_schema')
+
+        with pytest.raises(ValueError, match=f"JsonSchema of {name} of the request validator is invalid: 'nonsense'"):
+            RequestValidator(**{field: {'type': 'nonsense'}})
+
+    def test_trusted_schema_is_not_checked(self, mocker):
+        check_schema = mocker.spy(jsonschema.Draft202012Validator, 'check_schema')
+
+        request_validator = RequestValidator.model_validate(
+            {'query_schema': self.query_schema}, context={'trusted': True}
+        )
+        request_validator.validate_request([('limit', '1')], b'')
+
+        check_schema.assert_not_called()
+
+    def test_needs_body(self):
+        assert not RequestValidator(query_schema=self.query_schema).needs_body
+        assert RequestValidator(body_schema=self.body_schema).needs_body
+        assert RequestValidator(body_required=True).needs_body
+
+    def test_status_code_is_client_error(self):
+        assert RequestValidator(status_code=422).status_code == http.HTTPStatus.UNPROCESSABLE_ENTITY
+        with pytest.raises(ValueError, match='Status code of responses to invalid requests must be 4xx.'):
+            RequestValidator(status_code=500)
+
+    def test_schemas_are_compiled_once(self):
+        request_validator = RequestValidator(query_schema=self.query_schema, body_schema=self.body_schema)
+
+        request_validator.validate_request([('limit', '1')], b'{"name": "Twain"}')
+        compiled = request_validator._compiled_query, request_validator._compiled_body
+        request_validator.validate_request([('limit', '2')], b'{"name": "Dickens"}')
+        copied = copy.deepcopy(request_validator)
+        restored = pickle.loads(pickle.dumps(request_validator))
+
+        assert (request_validator._compiled_query, request_validator._compiled_body) == compiled
+        assert (copied._compiled_query, copied._compiled_body) == compiled
+        assert (restored._compiled_query, restored._compiled_body) == (None, None)
+
+
+def create_request(query: str = '', headers: dict[str, str] | None = None) -> Request:
+    raw_headers = Headers(headers or {}).raw
+    return Request({
+        'type': 'http', 'method': 'GET', 'query_string': query.encode(), 'headers': raw_headers,
+        'path_params': {'path': 'test'}
+    })
+
+
+class TestGetRequestHosts:
+    @pytest.mark.parametrize('host, expectation', [
+        ('Billing.Example.com', ('billing.example.com',)),
+        ('billing.example.com:8080', ('billing.example.com:8080', 'billing.example.com')),
+        ('[::1]:8080', ('[::1]:8080', '[::1]')),
+        ('[::1]', ('[::1]',)),
+    ])
+    def test_get_request_hosts(self, host, expectation):
+        assert get_request_hosts(create_request(headers={'Host': host})) == expectation
+
+    def test_get_request_hosts_without_header(self):
+        assert get_request_hosts(create_request()) == ('',)
+
+
+class TestRequestPredicate:
+    @pytest.mark.parametrize('predicate, matching, not_matching', [
+        (
+            RequestPredicate(source=PredicateSource.QUERY, name='page', value='2'),
+            create_request('page=1&page=2'),
+            create_request('page=2&page=1'),
+        ),
+        (
+            RequestPredicate(source=PredicateSource.HEADER, name='X-Tenant', operator=PredicateOperator.REGEX, value='a.'),
+            create_request(headers={'x-tenant': 'ab'}),
+            create_request(headers={'x-tenant': 'abc'}),
+        ),
+        (
+            RequestPredicate(source=PredicateSource.COOKIE, name='session', operator=PredicateOperator.PRESENT),
+            create_request(headers={'cookie': 'session=1'}),
+            create_request(headers={'cookie': 'other=1'}),
+        ),
+        (
+            RequestPredicate(source=PredicateSource.QUERY, name='debug', operator=PredicateOperator.ABSENT),
+            create_request('page=1'),
+            create_request('debug='),
+        ),
+    ])
+    def test_match(self, predicate, matching, not_matching):
+        assert predicate.match(matching)
+        assert not predicate.match(not_matching)
+
+    def test_match_regex_without_value(self):
+        predicate = RequestPredicate(source=PredicateSource.QUERY, name='page', operator=PredicateOperator.REGEX, value='.*')
+
+        assert not predicate.match(create_request())
+
+    def test_header_name_is_normalized(self):
+        assert RequestPredicate(source=PredicateSource.HEADER, name='X-Tenant', value='a').name == 'x-tenant'
+        assert RequestPredicate(source=PredicateSource.QUERY, name='Page', value='1').name == 'Page'
+
+    @pytest.mark.parametrize('data, message', [
+        ({'operator': 'equals'}, 'Predicate with operator "equals" requires a value.'),
+        ({'operator': 'regex', 'value': '('}, 'Invalid regular expression "(": missing ), unterminated subpattern'),
+        ({'operator': 'schema', 'value': '{}'}, 'Only body predicates can use operator "schema".'),
+    ])
+    def test_validate_value(self, data, message):
+        with pytest.raises(ValueError, match=re.escape(message)):
+            RequestPredicate(source=PredicateSource.QUERY, name='page', **data)
+
+
+class TestBodyPredicate:
+    document = {'method': 'users.get', 'params': {'id': 7, 'tags': ['a'], 'active': True}, 'version': None}
+
+    @pytest.mark.parametrize('data, matches', [
+        ({'path': '$.method', 'value': 'users.get'}, True),
+        ({'path': '/method', 'value': 'users.list'}, False),
+        ({'path': '$.version', 'value': None}, True),
+        ({'path': '$.missing', 'value': None}, False),
+        ({'path': '$.params.id', 'value': 7.0}, True),
+        ({'path': '$.params.active', 'value': True}, True),
+        ({'path': '$.params.active', 'value': 1}, False),
+        ({'path': '$.params', 'value': {'id': 7, 'tags': ['a'], 'active': 1}}, False),
+        ({'path': '/params/tags/0', 'operator': 'regex', 'value': '[a-z]'}, True),
+        ({'path': '$.params.id', 'operator': 'regex', 'value': '7'}, False),
+        ({'path': '$.params', 'operator': 'present'}, True),
+        ({'path': '$.params.name', 'operator': 'absent'}, True),
+        ({'path': '$.params', 'operator': 'schema', 'value': {'required': ['id']}}, True),
+        ({'path': '$.params', 'operator': 'schema', 'value': {'required': ['name']}}, False),
+        ({'path': '$.missing', 'operator': 'schema', 'value': {}}, False),
+    ])
+    def test_match(self, data, matches):
+        assert BodyPredicate.model_validate(data).match(self.document) == matches
+
+    def test_match_invalid_body(self):
+        assert not BodyPredicate(operator=PredicateOperator.PRESENT).match(JsonPath.MISSING)
+        assert BodyPredicate(path='$.method', operator=PredicateOperator.ABSENT).match(JsonPath.MISSING)
+
+    @pytest.mark.parametrize('data, message', [
+        ({'path': 'method', 'value': 1}, 'JSONPath "method" must start with "$".'),
+        ({'operator': 'equals'}, 'Predicate with operator "equals" requires a value.'),
+        ({'operator': 'regex', 'value': 1}, 'Value of predicate with operator "regex" must be a string.'),
+        ({'operator': 'regex', 'value': '['}, 'Invalid regular expression "["'),
+        ({'operator': 'schema', 'value': []}, 'Value of predicate with operator "schema" must be a json schema.'),
+        ({'operator': 'schema', 'value': {'type': 1}}, 'JsonSchema of the predicate is invalid'),
+    ])
+    def test_validate_value(self, data, message):
+        with pytest.raises(ValueError, match=re.escape(message)):
+            BodyPredicate.model_validate(data)
+
+    def test_compiled_schema_is_not_copied(self):
+        predicate = BodyPredicate(operator=PredicateOperator.SCHEMA, value={'type': 'object'})
+        predicate.match({})
+
+        copied = copy.deepcopy(predicate)
+        restored = pickle.loads(pickle.dumps(predicate))
+
+        assert copied._compiled_schema is predicate._compiled_schema
+        assert restored._compiled_schema is None
+        assert restored.match({})
+
+
+class TestGraphQLPredicate:
+    request = GraphQLRequest(GraphQLOperation(GraphQLOperationType.QUERY, 'GetUser'), {'id': 1, 'full': True})
+
+    @pytest.mark.parametrize('data, matches', [
+        ({}, True),
+        ({'operation_name': 'GetUser', 'operation_type': 'query', 'variables': {'id': 1}}, True),
+        ({'operation_name': 'GetUsers'}, False),
+        ({'operation_type': 'mutation'}, False),
+        ({'variables': {'id': 2}}, False),
+        ({'variables': {'name': None}}, False),
+        ({'variables': {'id': True}}, False),
+        ({'variables': {'full': 1}}, False),
+        ({'variables': {'id': 1.0, 'full': True}}, True),
+    ])
+    def test_match(self, data, matches):
+        assert GraphQLPredicate.model_validate(data).match(self.request) == matches
+
+    def test_match_not_graphql_request(self):
+        assert not GraphQLPredicate().match(None)
+
+
+class TestRequestBody:
+    def test_read_once(self, mocker):
+        read = mocker.Mock(return_value=b'{"id": 1}')
+        body = RequestBody(read)
+
+        assert body.read() == b'{"id": 1}'
+        assert body.get_json() == {'id': 1}
+        assert body.get_json() is body.get_json()
+        read.assert_called_once_with()
+
+    def test_get_graphql(self):
+        body = RequestBody(lambda: b'{"query": "query GetUser { user { id } }"}')
+
+        assert body.get_graphql().operation.name == 'GetUser'
+        assert body.get_graphql() is body.get_graphql()
+        assert RequestBody(lambda: b'{"id": 1}').get_graphql() is None
+
+    def test_get_json_invalid(self):
+        assert RequestBody(lambda: b'{').get_json() is JsonPath.MISSING
+
+
 class TestRouteMatch:
     @pytest.mark.parametrize(
         'data, expectation',
@@ -151,9 +437,17 @@ class TestRouteMatch:
                         'http_methods': [http.HTTPMethod.GET],
                         'id': uuid.UUID('70850e6c-7755-4edc-8fc2-12caf5c3d8ca'),
                         'path': '/test',
+                        'request_validator': None,
+                        'predicates': [],
+                        'body_predicates': [],
+                        'graphql': None,
+                        'host': None,
                         'response_selector': ResponseSelector.RANDOM,
                         'response_validators': [],
-                        'responses': []
+                        'responses': [],
+                        'tags': [],
+                        'expires_at': None,
+                        'version': 1
                     },
                 }
             ),
@@ -172,9 +466,17 @@ class TestRouteMatch:
                         'http_methods': [http.HTTPMethod.GET],
                         'id': uuid.UUID('44450e6c-7755-4edc-8fc2-12caf5c3d8ca'),
                         'path': '/test',
+                        'request_validator': None,
+                        'predicates': [],
+                        'body_predicates': [],
+                        'graphql': None,
+                        'host': None,
                         'response_selector': ResponseSelector.RANDOM,
                         'response_validators': [],
-                        'responses': []
+                        'responses': [],
+                        'tags': [],
+                        'expires_at': None,
+                        'version': 1
                     },
                 }
             ),
@@ -258,6 +560,43 @@ class TestResponse:
         response.delay_response()
         mocked_sleep.assert_called_once_with(1)
 
+    def test_default_delay_is_shared(self):
+        first = Response(status_code=http.HTTPStatus.OK, body={})
+        second = Response(status_code=http.HTTPStatus.OK, body={})
+
+        assert first.delay is second.delay
+        with pytest.raises(ValueError):
+            first.delay.max_delay = 1
+
+    def test_patch(self):
+        response = Response(status_code=http.HTTPStatus.OK, body={'foo': 'bar', 'baz': 1}, hits=3)
+        response_id = response.id
+
+        response.patch({'body': {'baz': None, 'new': True}, 'headers': {'header': 'value'}})
+
+        assert response.id == response_id
+        assert response.hits == 3
+        assert response.body == {'foo': 'bar', 'new': True}
+        assert response.headers == {'header': 'value'}
+
+    def test_patch_validated(self, mocker):
+        response = Response(status_code=http.HTTPStatus.OK, body={'foo': 'bar'})
+        validate = mocker.Mock(side_effect=ValueError('Invalid response.'))
+
+        response.patch({'weight': 2}, validate)
+        with pytest.raises(ValueError, match='Invalid response.'):
+            response.patch({'body': {'foo': 1}}, validate)
+
+        validate.assert_called_once()
+        assert response.body == {'foo': 'bar'}
+        assert response.weight == 2
+
+    def test_patch_unknown_fields(self):
+        response = Response(status_code=http.HTTPStatus.OK, body={})
+
+        with pytest.raises(ValueError, match='Unknown fields hits, id.'):
+            response.patch({'id': str(uuid.uuid4()), 'hits': 1})
+
 
 class TestResponseSelector:
     responses = [
@@ -433,6 +772,39 @@ class TestRoute:
         assert route.match(mocked_request_match) == (http.HTTPMethod.GET, {})
         assert route.match(mocked_request_no_match) is None
 
+    def test_match_predicates(self):
+        route = Route(path='test', predicates=[RequestPredicate(source=PredicateSource.QUERY, name='page', value='1')])
+
+        assert route.match(create_request('page=1')) == (http.HTTPMethod.GET, {})
+        assert route.match(create_request('page=2')) is None
+
+    def test_match_body_predicates(self):
+        route = Route(path='test', body_predicates=[BodyPredicate(path='$.method', value='users.get')])
+
+        assert route.match(create_request(), RequestBody(lambda: b'{"method": "users.get"}')) == (http.HTTPMethod.GET, {})
+        assert route.match(create_request(), RequestBody(lambda: b'{"method": "users.list"}')) is None
+        assert route.match(create_request()) is None
+
+    def test_match_host(self):
+        route = Route(path='test', host='Billing.Example.com')
+
+        assert route.host == 'billing.example.com'
+        assert route.match(create_request(headers={'Host': 'billing.example.com:8080'})) == (http.HTTPMethod.GET, {})
+        assert route.match(create_request(headers={'Host': 'users.example.com'})) is None
+        assert Route(path='test', host='billing:8080').match(create_request(headers={'Host': 'billing'})) is None
+
+    @pytest.mark.parametrize('host', ['', 'https://billing', 'billing/api', 'user@billing'])
+    def test_invalid_host(self, host):
+        with pytest.raises(ValueError, match='Invalid host'):
+            Route(path='test', host=host)
+
+    def test_match_graphql(self):
+        route = Route(path='test', graphql=GraphQLPredicate(operation_name='GetUser'))
+
+        assert route.match(create_request(), RequestBody(lambda: b'{"query": "query GetUser { a }"}'))
+        assert route.match(create_request(), RequestBody(lambda: b'{"query": "query GetUsers { a }"}')) is None
+        assert route.match(create_request()) is None
+
     def test_match_method(self):
         route = Route(
             path='test', responses=[],
@@ -540,6 +912,54 @@ class TestRoute:
 
         assert e.exconly(tryshort=True) == expectation
 
+    def test_patch(self):
+        route = Route(path='/users', responses=self.responses, hits=2)
+        path = route.path
+        responses = route.responses
+
+        route.patch({'http_methods': ['POST'], 'tags': ['users']})
+
+        assert route.hits == 2
+        assert route.http_methods == [http.HTTPMethod.POST]
+        assert route.tags == ['users']
+        assert route.path is path
+        assert route.responses is responses
+
+    def test_patch_responses(self):
+        validator = ResponseValidator(status_code=http.HTTPStatus.OK, json_schema={'required': ['id']})
+        route = Route(path='/users', response_validators=[validator])
+
+        route.patch({'responses': [{'status_code': 200, 'body': {'id': 1}}]})
+        with pytest.raises(ValueError, match='doesn\'t match ony of the configured validators'):
+            route.patch({'responses': [{'status_code': 200, 'body': {}}]})
+
+        assert [response.body for response in route.responses] == [{'id': 1}]
+
+    def test_patch_validators(self):
+        route = Route(path='/users', responses=[Response(status_code=http.HTTPStatus.OK, body={})])
+
+        with pytest.raises(ValueError, match='doesn\'t match ony of the configured validators'):
+            route.patch({'response_validators': [{'status_code': 200, 'json_schema': {'required': ['id']}}]})
+
+        assert route.response_validators == []
+
+    def test_patch_ttl(self):
+        route = Route(path='/users', ttl=60)
+        expires_at = route.expires_at
+
+        route.patch({'ttl': 120})
+
+        assert route.expires_at > expires_at
+
+    def test_ttl(self):
+        before = datetime.datetime.now(datetime.UTC)
+        route = Route(path='/users', ttl=60)
+
+        assert route.expires_at >= before + datetime.timedelta(seconds=60)
+        assert not route.is_expired(before)
+        assert route.is_expired(before + datetime.timedelta(seconds=120))
+        assert not Route(path='/users').is_expired(before)
+
 
 class TestHealthcheckStatus:
     @pytest.mark.parametrize(
@@ -631,9 +1051,17 @@ class TestInputRoute:
                     'auth': None,
                     'http_methods': [http.HTTPMethod.GET],
                     'path': '/test',
+                    'request_validator': None,
+                    'predicates': [],
+                    'body_predicates': [],
+                    'graphql': None,
+                    'host': None,
                     'response_selector': ResponseSelector.RANDOM,
                     'response_validators': [],
-                    'responses': []
+                    'responses': [],
+                    'tags': [],
+                    'ttl': None,
+                    'expires_at': None
                 }
             ),
             (
@@ -645,9 +1073,17 @@ class TestInputRoute:
                     'auth': None,
                     'http_methods': [http.HTTPMethod.GET],
                     'path': '/test',
+                    'request_validator': None,
+                    'predicates': [],
+                    'body_predicates': [],
+                    'graphql': None,
+                    'host': None,
                     'response_selector': ResponseSelector.RANDOM,
                     'response_validators': [],
-                    'responses': []
+                    'responses': [],
+                    'tags': [],
+                    'ttl': None,
+                    'expires_at': None
                 }
             ),
             (
@@ -659,6 +1095,11 @@ class TestInputRoute:
                     'auth': None,
                     'http_methods': [http.HTTPMethod.GET],
                     'path': '/test',
+                    'request_validator': None,
+                    'predicates': [],
+                    'body_predicates': [],
+                    'graphql': None,
+                    'host': None,
                     'response_selector': ResponseSelector.RANDOM,
                     'response_validators': [],
                     'responses': [
@@ -670,6 +1111,9 @@ class TestInputRoute:
                             'weight': 1
                         }
                     ],
+                    'tags': [],
+                    'ttl': None,
+                    'expires_at': None
                 }
             ),
             (
@@ -695,12 +1139,22 @@ class TestInputRoute:
                             },
                         )
                     ],
+                    'request_validator': None,
+                    'predicates': [],
+                    'body_predicates': [],
+                    'graphql': None,
+                    'host': None,
                     'response_selector': ResponseSelector.FIRST,
                 },
                 {
                     'auth': None,
                     'http_methods': [http.HTTPMethod.POST],
                     'path': '/test',
+                    'request_validator': None,
+                    'predicates': [],
+                    'body_predicates': [],
+                    'graphql': None,
+                    'host': None,
                     'response_selector': ResponseSelector.FIRST,
                     'response_validators': [
                         {
@@ -729,6 +1183,9 @@ class TestInputRoute:
                             'weight': 1
                         }
                     ],
+                    'tags': [],
+                    'ttl': None,
+                    'expires_at': None
                 }
             ),
         ]
@@ -736,3 +1193,7 @@ class TestInputRoute:
     def test_input_route(self, data, expectation):
         assert InputRoute(**data).model_dump() == expectation
 
+    def test_input_route_expiration(self):
+        with pytest.raises(ValueError, match='Only one of "ttl" and "expires_at" can be set.'):
+            InputRoute(path='/test', ttl=60, expires_at=datetime.datetime.now(datetime.UTC))
+
@@ -0,0 +1,254 @@
+import datetime
+import http
+
+import pytest
+from fastapi.testclient import TestClient
+
+from trickster.model import Route, Response
+from trickster.namespaces import Namespaces, get_namespaces
+from trickster.router import Router
+from trickster.shared_state import SharedState
+from trickster.trickster_app import create_app
+
+
+class TestNamespaces:
+    def test_get(self, mocked_config, mocked_router):
+        namespaces = Namespaces(mocked_config)
+
+        router = namespaces.get('shard-1')
+
+        assert namespaces.default is mocked_router
+        assert namespaces.get('shard-1') is router
+        assert router is not mocked_router
+        assert router.routes == []
+        assert [response.status_code for response in router.error_responses] == [http.HTTPStatus.NOT_FOUND]
+        assert router.journal is not mocked_router.journal
+
+    def test_lookup(self, mocked_config, mocked_router):
+        namespaces = Namespaces(mocked_config)
+        router = namespaces.get('shard-1')
+
+        unknown = namespaces.lookup('shard-2')
+
+        assert namespaces.lookup('shard-1') is router
+        assert unknown.routes == []
+        assert [response.status_code for response in unknown.error_responses] == [http.HTTPStatus.NOT_FOUND]
+        assert namespaces.lookup('shard-2') is not unknown
+        assert list(namespaces.routers) == ['shard-1']
+        with pytest.raises(ValueError, match='must be 1-64 letters'):
+            namespaces.lookup('shard/1')
+
+    @pytest.mark.parametrize('name', ['', 'shard/1', 'x' * 65])
+    def test_get_invalid(self, mocked_config, name):
+        with pytest.raises(ValueError, match='must be 1-64 letters'):
+            Namespaces(mocked_config).get(name)
+
+    def test_delete(self, mocked_config):
+        namespaces = Namespaces(mocked_config)
+        namespaces.get('shard-1')
+
+        assert namespaces.delete('shard-1')
+        assert not namespaces.delete('shard-1')
+        assert namespaces.routers == {}
+
+    def test_remove_expired(self, mocked_config, mocked_router):
+        now = datetime.datetime.now(datetime.UTC)
+        namespaces = Namespaces(mocked_config)
+        namespaces.set_expiration('expired', now)
+        namespaces.set_expiration('prolonged', now)
+        namespaces.set_expiration('prolonged', now + datetime.timedelta(seconds=60))
+        namespaces.set_expiration('deleted', now)
+        namespaces.delete('deleted')
+        namespaces.get('shard-1').add_route(Route(path='/items', expires_at=now))
+        mocked_router.add_route(Route(path='/items', expires_at=now + datetime.timedelta(seconds=60)))
+
+        assert namespaces.has_expired(now)
+        assert namespaces.remove_expired(now) == (1, 1)
+        assert not namespaces.has_expired(now)
+        assert list(namespaces.routers) == ['prolonged', 'shard-1']
+        assert namespaces.get('shard-1').routes == []
+        assert namespaces.has_expired(now + datetime.timedelta(seconds=60))
+        assert namespaces.remove_expired(now + datetime.timedelta(seconds=60)) == (1, 1)
+
+    def test_remove_expired_checks_only_due_routers(self, mocked_config, mocked_router, mocker):
+        now = datetime.datetime.now(datetime.UTC)
+        namespaces = Namespaces(mocked_config)
+        namespaces.get('later').add_route(Route(path='/items', expires_at=now + datetime.timedelta(seconds=60)))
+        namespaces.get('due').add_route(Route(path='/items', expires_at=now))
+        namespaces.get('permanent').add_route(Route(path='/items'))
+        remove_expired_routes = mocker.spy(Router, 'remove_expired_routes')
+
+        assert namespaces.remove_expired(now) == (0, 1)
+        assert [call.args[0] for call in remove_expired_routes.call_args_list] == [namespaces.get('due')]
+
+    def test_restore_state_schedules_expirations(self, mocked_config, mocked_router):
+        now = datetime.datetime.now(datetime.UTC)
+        namespaces = Namespaces(mocked_config)
+        namespaces.set_expiration('shard-1', now)
+        namespaces.get('shard-2')
+        state = namespaces.dump_state()
+        restored_namespaces = Namespaces(mocked_config)
+
+        restored_namespaces.restore_state(state)
+
+        assert restored_namespaces.get('shard-1').expires_at == now
+        assert restored_namespaces.remove_expired(now) == (1, 0)
+        assert list(restored_namespaces.routers) == ['shard-2']
+
+    def test_hits(self, mocked_config, mocked_router):
+        namespaces = Namespaces(mocked_config)
+        namespaces.track_hits()
+        route = Route(path='/users')
+        namespaces.get('shard-1').add_route(route)
+
+        namespaces.get('shard-1').count_hit(route)
+        mocked_router.count_hit(mocked_router.routes[0])
+        pending_hits = namespaces.pop_pending_hits()
+        namespaces.set_hits({route.id: 5})
+
+        assert pending_hits == {route.id: 1, mocked_router.routes[0].id: 1}
+        assert route.hits == 5
+        assert mocked_router.routes[0].hits == 0
+
+    def test_dump_and_restore_state(self, mocked_config, mocked_router):
+        namespaces = Namespaces(mocked_config)
+        namespaces.get('shard-1').add_route(Route(path='/items'))
+        namespaces.get('shard-2')
+        state = namespaces.dump_state()
+        kept_router = namespaces.get('shard-1')
+        namespaces.get('shard-3')
+        namespaces.delete('shard-2')
+        mocked_router.delete_routes()
+
+        namespaces.restore_state(state)
+
+        assert list(namespaces.routers) == ['shard-1', 'shard-2']
+        assert namespaces.get('shard-1') is kept_router
+        assert [str(route.path) for route in kept_router.routes] == ['/items']
+        assert [str(route.path) for route in mocked_router.routes] == ['/users']
+
+    def test_restore_router_state(self, mocked_config, mocked_router):
+        namespaces = Namespaces(mocked_config)
+        namespaces.get('shard-1')
+
+        namespaces.restore_state(Router(routes=[Route(path='/items')]).dump_state())
+
+        assert namespaces.routers == {}
+        assert [str(route.path) for route in mocked_router.routes] == ['/items']
+
+    def test_shared_state(self, mocked_config, mocked_router, tmp_path):
+        first_namespaces, second_namespaces = Namespaces(mocked_config), Namespaces(mocked_config)
+        first_state, second_state = SharedState(tmp_path / 'state.db'), SharedState(tmp_path / 'state.db')
+        first_state.initialize(first_namespaces)
+        second_state.initialize(second_namespaces)
+
+        with first_state.transaction(first_namespaces):
+            first_namespaces.get('shard-1').add_route(Route(path='/items'))
+        second_state.refresh(second_namespaces)
+
+        assert [str(route.path) for route in second_namespaces.get('shard-1').routes] == ['/items']
+
+
+class TestNamespaceEndpoints:
+    def test_namespaces_are_isolated(self, mocked_config, mocked_router, client):
+        headers = {'X-Trickster-Namespace': 'shard-1'}
+
+        created = client.post(f'{mocked_config.internal_prefix}/routes', json={'path': '/users'}, headers=headers)
+        client.post(
+            f'{mocked_config.internal_prefix}/settings/error_responses',
+            json={'status_code': 404, 'body': {'namespace': 'shard-1'}},
+            headers=headers
+        )
+        client.delete(f'{mocked_config.internal_prefix}/settings/error_responses', params={'status_code': 404},
+                      headers={'X-Trickster-Namespace': 'shard-2'})
+        namespaced_routes = client.get(f'{mocked_config.internal_prefix}/routes', headers=headers)
+        default_routes = client.get(f'{mocked_config.internal_prefix}/routes')
+        missing = client.get('/items', headers={'X-Trickster-Namespace': 'shard-2'})
+
+        assert created.status_code == 200
+        assert [route['path'] for route in namespaced_routes.json()] == ['/users']
+        assert [route['path'] for route in default_routes.json()] == ['/users']
+        assert namespaced_routes.json()[0]['id'] != default_routes.json()[0]['id']
+        assert missing.status_code == 404
+        assert missing.json() == {'error': 'Resource error', 'reason': 'No route or response was found for your request.'}
+        assert len(get_namespaces(config=mocked_config).get('shard-1').error_responses) == 2
+
+    def test_mocked_request_journal(self, mocked_config, mocked_router, client):
+        namespaced_router = get_namespaces(config=mocked_config).get('shard-1')
+        namespaced_router.add_route(
+            Route(path='/items', responses=[Response(status_code=http.HTTPStatus.OK, body={'shard': 1})])
+        )
+
+        result = client.get('/items', headers={'X-Trickster-Namespace': 'shard-1'})
+
+        assert result.json() == {'shard': 1}
+        assert len(namespaced_router.journal) == 1
+        assert len(mocked_router.journal) == 0
+
+    def test_unknown_namespace_is_not_created(self, mocked_config, mocked_router, client):
+        mocked = [client.get('/users', headers={'X-Trickster-Namespace': f'typo-{index}'}) for index in range(3)]
+        routes = client.get(f'{mocked_config.internal_prefix}/routes', headers={'X-Trickster-Namespace': 'typo-3'})
+        journal = client.delete(f'{mocked_config.internal_prefix}/journal', headers={'X-Trickster-Namespace': 'typo-4'})
+
+        assert [result.json() for result in mocked] == [{'error': 'Page not found'}] * 3
+        assert routes.json() == []
+        assert journal.json() == []
+        assert client.get(f'{mocked_config.internal_prefix}/namespaces').json() == []
+        assert len(mocked_router.journal) == 0
+
+    def test_invalid_namespace(self, mocked_config, client):
+        result = client.get(f'{mocked_config.internal_prefix}/routes', headers={'X-Trickster-Namespace': 'a b'})
+
+        assert result.status_code == 400
+
+    def test_get_namespaces(self, mocked_config, client):
+        get_namespaces(config=mocked_config).get('shard-1')
+
+        result = client.get(f'{mocked_config.internal_prefix}/namespaces')
+
+        assert result.json() == ['shard-1']
+
+    def test_delete_namespace(self, mocked_config, client):
+        get_namespaces(config=mocked_config).get('shard-1')
+
+        deleted = client.delete(f'{mocked_config.internal_prefix}/namespaces/shard-1')
+        missing = client.delete(f'{mocked_config.internal_prefix}/namespaces/shard-1')
+
+        assert deleted.status_code == 200
+        assert deleted.json() == []
+        assert missing.status_code == 404
+        assert missing.json() == {'error': 'Resource error', 'reason': 'Namespace "shard-1" was not found.'}
+
+    def test_update_namespace(self, mocked_config, client):
+        get_namespaces(config=mocked_config).get('shard-1').add_route(Route(path='/items'))
+        expires_at = datetime.datetime(2030, 1, 1, tzinfo=datetime.UTC)
+
+        updated = client.put(
+            f'{mocked_config.internal_prefix}/namespaces/shard-1', json={'expires_at': expires_at.isoformat()}
+        )
+        created = client.put(f'{mocked_config.internal_prefix}/namespaces/shard-2', json={'ttl': 60})
+        naive = client.put(f'{mocked_config.internal_prefix}/namespaces/shard-4', json={'expires_at': '2030-01-01T00:00:00'})
+        invalid = client.put(f'{mocked_config.internal_prefix}/namespaces/shard-3', json={'ttl': 60, 'expires_at': 0})
+
+        assert updated.json() == {'name': 'shard-1', 'expires_at': '2030-01-01T00:00:00Z', 'routes': 1}
+        assert created.json()['expires_at'] is not None
+        assert naive.json()['expires_at'] == '2030-01-01T00:00:00Z'
+        assert invalid.status_code == 400
+        assert list(get_namespaces(config=mocked_config).routers) == ['shard-1', 'shard-2', 'shard-4']
+
+    def test_namespace_prefix(self, mocked_config, mocked_router):
+        mocked_config.namespace_prefix = '/ns'
+        client = TestClient(create_app())
+        namespaced_router = get_namespaces(config=mocked_config).get('shard-1')
+        namespaced_router.add_route(
+            Route(path='/items', responses=[Response(status_code=http.HTTPStatus.OK, body={'shard': 1})])
+        )
+
+        mocked = client.get('/ns/shard-1/items', headers={'X-Trickster-Namespace': 'shard-2'})
+        internal = client.get(f'/ns/shard-1{mocked_config.internal_prefix}/routes')
+        root = client.get('/ns/shard-1')
+
+        assert mocked.json() == {'shard': 1}
+        assert [route['path'] for route in internal.json()] == ['/items']
+        assert root.status_code == 404
+        assert list(get_namespaces(config=mocked_config).routers) == ['shard-1']
@@ -1,8 +1,12 @@
+import http
+import json
 import pathlib
 
+import pytest
 from openapi_parser import parse
 
-from trickster.openapi import OpenApiSpec
+from trickster.model import Response
+from trickster.openapi import OpenApiCache, OpenApiSpec, get_openapi_cache, load_specs_routes
 from tests.conftest import mocked_files_path
 
 
@@ -26,3 +30,247 @@ class TestOpenApiSpec:
         paths = [route.path.path for route in loaded_spec.get_routes()]
 
         assert sorted(paths) == sorted(expected_paths_in_spec)
+
+    def test_get_routes_shares_components(self):
+        routes = OpenApiSpec.load(mocked_files_path / 'openapi.yaml').get_routes()
+        validators = {(route.path.path, validator.status_code): validator.json_schema
+                      for route in routes for validator in route.response_validators}
+        search = validators[('/search', 200)]
+
+        assert search['items'] == {'$ref': '#/$defs/SearchResult'}
+        assert sorted(search['$defs']) == ['Item', 'SearchResult']
+        assert search['$defs']['SearchResult']['properties']['items']['items'] == {'$ref': '#/$defs/Item'}
+        assert validators[('/items', 422)] == {'$schema': OpenApiSpec.JSON_SCHEMA_VERSION,
+                                               '$ref': '#/$defs/HTTPValidationError',
+                                               '$defs': validators[('/search', 422)]['$defs']}
+        assert validators[('/items', 422)]['$defs']['ValidationError'] is \
+            validators[('/search', 422)]['$defs']['ValidationError']
+
+    @pytest.mark.parametrize('raw', [True, False])
+    def test_validate_response_through_references(self, raw):
+        open_api_path = mocked_files_path / 'openapi.yaml'
+        spec = OpenApiSpec.load(open_api_path) if raw else OpenApiSpec(parse(str(open_api_path)))
+        route = next(route for route in spec.get_routes() if route.path.path == '/search')
+        validator = next(validator for validator in route.response_validators if validator.status_code == 200)
+        item = {'item_id': 'item_1', 'description': 'Item', 'salary': 1, 'valid_from': '2023-11-21T18:33:11'}
+        result = {'hits': 1, 'items': [item], 'search_id': 'a09d566a-9167-4204-800e-8de653490414'}
+
+        validator.validate_response(Response(status_code=http.HTTPStatus.OK, body=[result]))
+        with pytest.raises(ValueError, match="'salary' is a required property"):
+            item.pop('salary')
+            validator.validate_response(Response(status_code=http.HTTPStatus.OK, body=[result]))
+        assert ('$defs' in validator.json_schema) is raw
+
+    def test_get_routes_with_examples(self):
+        spec = OpenApiSpec.load(mocked_files_path / 'openapi.yaml')
+
+        items, search = spec.get_routes(examples=True)
+
+        assert [(response.status_code, response.body) for response in items.responses] == [(200, {'status': 'OK'})]
+        assert [response.status_code for response in search.responses] == [200]
+        assert search.responses[0].body[0]['search_id'] == 'a09d566a-9167-4204-800e-8de653490414'
+        assert [route.responses for route in spec.get_routes()] == [[], []]
+
+    def test_get_routes_with_unquoted_status_codes(self, tmp_path):
+        spec_path = tmp_path / 'spec.yaml'
+        spec_path.write_text("""
+            openapi: 3.1.0
+            info: {title: Test, version: '1'}
+            paths:
+              /items:
+                get:
+                  responses:
+                    200:
+                      description: OK
+                      content:
+                        application/json:
+                          schema: {$ref: '#/components/schemas/Item'}
+                          example: {id: 2}
+            components:
+              schemas:
+                Item: {type: object, properties: {id: {type: integer}}}
+        """)
+
+        route, = OpenApiSpec.load(spec_path).get_routes(examples=True)
+
+        assert route.response_validators[0].json_schema['$ref'] == '#/$defs/Item'
+        assert [response.body for response in route.responses] == [{'id': 2}]
+
+    def test_get_routes_with_generated_examples(self, tmp_path):
+        schema = {'type': 'object', 'required': ['id'], 'properties': {'id': {'type': 'integer', 'minimum': 1}}}
+        responses = {
+            '200': {'description': 'OK', 'content': {'application/json': {
+                'schema': schema, 'examples': {'invalid': {'value': {'id': 0}}, 'valid': {'value': {'id': 2}}}
+            }}},
+            '201': {'description': 'Created', 'content': {'application/json': {'schema': schema}}},
+            '202': {'description': 'Accepted', 'content': {'application/json': {'schema': {'type': 'string'}}}},
+            '204': {'description': 'No content'},
+            '206': {'description': 'Partial', 'content': {'application/json': {
+                'schema': {'type': 'object', 'properties': {'id': {'type': 'string', 'pattern': '['}}}
+            }}},
+            '400': {'description': 'Error', 'content': {'application/json': {'schema': schema, 'example': {'id': 3}}}},
+        }
+        spec_path = tmp_path / 'spec.json'
+        spec_path.write_text(json.dumps({
+            'openapi': '3.1.0', 'info': {'title': 'Test', 'version': '1'},
+            'paths': {'/items': {'get': {'responses': responses}}},
+        }))
+
+        route, = OpenApiSpec.load(spec_path).get_routes(examples=True)
+        generated, = OpenApiSpec.load(spec_path).get_routes(examples=True)
+
+        assert [(response.status_code, response.body) for response in route.responses][0] == (200, {'id': 2})
+        assert [response.status_code for response in route.responses] == [200, 201]
+        assert route.responses[1].body['id'] >= 1
+        assert generated.responses[1].body == route.responses[1].body
+
+    def test_get_routes_with_request_validators(self):
+        items, search = OpenApiSpec.load(mocked_files_path / 'openapi.yaml').get_routes()
+
+        assert items.request_validator.query_schema == {
+            '$schema': OpenApiSpec.JSON_SCHEMA_VERSION,
+            'type': 'object',
+            'properties': {'stub': {'type': 'boolean'}},
+            'required': [],
+        }
+        assert items.request_validator.body_schema['$ref'] == '#/$defs/Item'
+        assert items.request_validator.body_required
+        assert search.request_validator.query_schema is None
+        assert search.request_validator.body_schema['$ref'] == '#/$defs/SearchQuery'
+        with pytest.raises(ValueError, match="Invalid request body at \\$: 'salary' is a required property"):
+            items.request_validator.validate_request([('stub', 'true')], b'{"item_id": "1", "description": "Item"}')
+
+    def test_get_routes_with_invalid_request_schema(self, tmp_path):
+        spec_path = tmp_path / 'spec.json'
+        spec_path.write_text(json.dumps({
+            'openapi': '3.1.0', 'info': {'title': 'Test', 'version': '1'},
+            'paths': {'/items': {'post': {
+                'requestBody': {'content': {'application/json': {'schema': {
+                    'type': 'object', 'properties': {'id': {'type': 'string', 'pattern': '['}}
+                }}}},
+                'responses': {'200': {'description': 'OK'}},
+            }}},
+        }))
+
+        route, = OpenApiSpec.load(spec_path).get_routes()
+
+        assert route.request_validator is None
+
+    def test_load_routes_with_request_validation(self, tmp_path):
+        open_api_path = mocked_files_path / 'openapi.yaml'
+        cache = OpenApiCache(tmp_path, '1.0.0')
+
+        without_validation = OpenApiSpec.load_routes(open_api_path, cache)
+        with_validation = OpenApiSpec.load_routes(open_api_path, cache, request_validation=True)
+
+        assert [route.request_validator for route in without_validation] == [None, None]
+        assert with_validation[0].request_validator.body_required
+
+    def test_load_routes(self, tmp_path, mocker):
+        open_api_path = mocked_files_path / 'openapi.yaml'
+        cache = OpenApiCache(tmp_path / 'cache', '1.0.0')
+        load = mocker.spy(OpenApiSpec, 'load')
+
+        converted = OpenApiSpec.load_routes(open_api_path, cache)
+        cached = OpenApiSpec.load_routes(open_api_path, cache)
+
+        assert load.call_count == 1
+        assert [route.model_dump(exclude={'id', 'response_validators'}) for route in cached] == \
+            [route.model_dump(exclude={'id', 'response_validators'}) for route in converted]
+        assert [[v.json_schema for v in route.response_validators] for route in cached] == \
+            [[v.json_schema for v in route.response_validators] for route in converted]
+        assert {route.id for route in cached}.isdisjoint(route.id for route in converted)
+        assert cached[0].response_validators[1].json_schema['$defs']['ValidationError'] is \
+            cached[1].response_validators[1].json_schema['$defs']['ValidationError']
+
+    def test_load_routes_with_examples(self, tmp_path):
+        open_api_path = mocked_files_path / 'openapi.yaml'
+        cache = OpenApiCache(tmp_path, '1.0.0')
+
+        OpenApiSpec.load_routes(open_api_path, cache)
+        converted = OpenApiSpec.load_routes(open_api_path, cache, examples=True)
+        cached = OpenApiSpec.load_routes(open_api_path, cache, examples=True)
+
+        assert [response.body for response in cached[0].responses] == [{'status': 'OK'}]
+        assert cached[0].responses[0].id != converted[0].responses[0].id
+        assert OpenApiSpec.load_routes(open_api_path, cache)[0].responses == []
+
+    def test_load_routes_without_cache(self):
+        routes = OpenApiSpec.load_routes(mocked_files_path / 'openapi.yaml')
+
+        assert [route.path.path for route in routes] == ['/items', '/search']
+
+    def test_load_routes_cache_not_writable(self, tmp_path, mocker):
+        (tmp_path / 'file').write_bytes(b'')
+        open_api_path = mocked_files_path / 'openapi.yaml'
+
+        not_a_directory = OpenApiSpec.load_routes(open_api_path, OpenApiCache(tmp_path / 'file' / 'cache', '1.0.0'))
+        mocker.patch.object(OpenApiCache, 'store', side_effect=FileNotFoundError('No such file or directory'))
+        missing_directory = load_specs_routes([open_api_path], [''], OpenApiCache(tmp_path / 'cache', '1.0.0'))
+
+        assert [route.path.path for route in not_a_directory] == ['/items', '/search']
+        assert [route.path.path for route in missing_directory[0]] == ['/items', '/search']
+
+    def test_load_routes_non_existent(self, tmp_path):
+        with pytest.raises(FileNotFoundError, match='OpenApi specification file'):
+            OpenApiSpec.load_routes(tmp_path / 'nonexistent.yaml', OpenApiCache(tmp_path, '1.0.0'))
+
+
+class TestOpenApiCache:
+    def test_cache_key(self, tmp_path):
+        cache = OpenApiCache(tmp_path, '1.0.0')
+
+        assert cache.get_path(b'spec') == cache.get_path(b'spec')
+        assert cache.get_path(b'spec') != cache.get_path(b'changed spec')
+        assert cache.get_path(b'spec') != OpenApiCache(tmp_path, '1.0.1').get_path(b'spec')
+        assert cache.get_path(b'spec') != cache.get_path(b'spec', examples=True)
+
+    def test_load_missing(self, tmp_path):
+        assert OpenApiCache(tmp_path, '1.0.0').load(b'spec') is None
+
+    def test_load_damaged(self, tmp_path):
+        cache = OpenApiCache(tmp_path, '1.0.0')
+        cache.get_path(b'spec').write_bytes(b'[{"path": ')
+
+        assert cache.load(b'spec') is None
+
+    def test_get_openapi_cache(self, mocked_config, tmp_path):
+        assert get_openapi_cache(mocked_config) is None
+
+        get_openapi_cache.cache_clear()
+        mocked_config.openapi_cache = tmp_path
+        cache = get_openapi_cache(mocked_config)
+        get_openapi_cache.cache_clear()
+
+        assert cache.directory == tmp_path
+
+
+class TestLoadSpecsRoutes:
+    def test_load_specs_routes(self, tmp_path):
+        open_api_path = mocked_files_path / 'openapi.yaml'
+
+        loaded = load_specs_routes([open_api_path, tmp_path / 'nonexistent.yaml', open_api_path], ['', '', '/v2'])
+
+        assert [route.path.path for route in loaded[0]] == ['/items', '/search']
+        assert loaded[1] is None
+        assert [route.path.path for route in loaded[2]] == ['/v2/items', '/v2/search']
+
+    def test_load_single_spec_routes(self, tmp_path):
+        loaded = load_specs_routes([mocked_files_path / 'openapi.yaml'], ['/v1'], OpenApiCache(tmp_path, '1.0.0'))
+
+        assert [route.path.path for route in loaded[0]] == ['/v1/items', '/v1/search']
+        assert load_specs_routes([tmp_path / 'nonexistent.yaml'], ['']) == [None]
+
+    def test_load_specs_routes_with_examples(self):
+        open_api_path = mocked_files_path / 'openapi.yaml'
+
+        loaded = load_specs_routes([open_api_path, open_api_path], ['', '/v2'], examples=True)
+
+        assert [[response.body for response in routes[0].responses] for routes in loaded] == [[{'status': 'OK'}]] * 2
+
+    def test_load_specs_routes_with_request_validation(self):
+        open_api_path = mocked_files_path / 'openapi.yaml'
+
+        loaded = load_specs_routes([open_api_path, open_api_path], ['', '/v2'], request_validation=True)
+
+        assert all(routes[1].request_validator.body_schema for routes in loaded)
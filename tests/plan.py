@@ -0,0 +1,403 @@
+import http
+import itertools
+
+import anyio
+import pytest
+from fastapi import Request
+from starlette.datastructures import Headers
+
+from trickster.model import (
+    BodyPredicate, GraphQLPredicate, PredicateOperator, PredicateSource, RequestBody, RequestPredicate, RequestValidator, Response, ResponseSelector, Route, TokenAuth
+)
+from trickster.plan import METHOD_BITS, CompiledResponse, CompiledRoute, PredicateTree, RoutePlan, get_method_mask
+from trickster.router import Router
+from trickster.utils import get_json_key
+
+
+class MockedRequest:
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.headers = headers
+
+
+def create_request(query: str = '', headers: dict[str, str] | None = None) -> Request:
+    return Request({'type': 'http', 'method': 'GET', 'query_string': query.encode(), 'headers': Headers(headers).raw})
+
+
+def query_equals(name: str, value: str) -> RequestPredicate:
+    return RequestPredicate(source=PredicateSource.QUERY, name=name, value=value)
+
+
+class TestCompiledResponse:
+    def test_render(self):
+        response = Response(
+            status_code=http.HTTPStatus.CREATED, body={'name': 'Čapek', 'tags': [1, 2]}, headers={'X-Header': 'value'}
+        )
+
+        rendered = CompiledResponse(response).render()
+
+        assert rendered.body == response.as_fastapi_response().body
+        assert rendered.status_code == 201
+        assert rendered.headers['X-Header'] == 'value'
+        assert rendered.headers['Content-Type'] == 'application/json'
+
+    def test_delay_response(self, mocker):
+        sleep = mocker.patch('time.sleep')
+
+        CompiledResponse(Response(status_code=http.HTTPStatus.OK, body={})).delay_response()
+        CompiledResponse(Response(status_code=http.HTTPStatus.OK, body={}, delay=(0.1, 0.1))).delay_response()
+
+        sleep.assert_called_once_with(0.1)
+
+    def test_send(self):
+        compiled = CompiledResponse(Response(status_code=http.HTTPStatus.OK, body={'id': 1}, headers={'X-Id': '1'}))
+        messages = []
+
+        async def send(message):
+            messages.append(message)
+
+        anyio.run(compiled.send, send)
+
+        assert messages == [
+            {'type': 'http.response.start', 'status': 200, 'headers': compiled.render().raw_headers},
+            {'type': 'http.response.body', 'body': b'{"id":1}'},
+        ]
+
+
+class TestCompiledRoute:
+    responses = [
+        Response(status_code=http.HTTPStatus.OK, body={'body': 1}, hits=3, weight=0),
+        Response(status_code=http.HTTPStatus.OK, body={'body': 2}, hits=1, weight=1),
+    ]
+
+    def test_match(self):
+        compiled = CompiledRoute(Route(path='/users/{user_id:integer}', http_methods=['GET', 'PUT']))
+
+        assert compiled.match('PUT', '/users/1')
+        assert not compiled.match('POST', '/users/1')
+        assert not compiled.match('GET', '/users/abc')
+
+    def test_match_path_without_variables(self):
+        compiled = CompiledRoute(Route(path='/users/{user_id}', http_methods=['GET']))
+
+        assert compiled.path_regex is None
+        assert compiled.match('GET', '/users/{user_id}')
+        assert not compiled.match('GET', '/users/1')
+        assert not compiled.match('FOO', '/users/{user_id}')
+
+    def test_responses_are_compiled_on_first_use(self):
+        compiled = CompiledRoute(Route(path='/users', responses=self.responses))
+
+        assert compiled._responses is None
+        assert compiled.responses is compiled.responses
+        assert [response.response for response in compiled.responses] == self.responses
+
+    @pytest.mark.parametrize('selector, expectation', [
+        (ResponseSelector.FIRST, {'body': 1}),
+        (ResponseSelector.RANDOM, {'body': 2}),
+        (ResponseSelector.BALANCED, {'body': 2}),
+    ])
+    def test_select_response(self, selector, expectation):
+        compiled = CompiledRoute(Route(path='/users', responses=self.responses, response_selector=selector))
+
+        assert compiled.select_response().response.body == expectation
+
+    def test_select_response_without_responses(self):
+        with pytest.raises(ValueError, match='No suitable response found.'):
+            CompiledRoute(Route(path='/users')).select_response()
+
+    def test_needs_body(self):
+        assert not CompiledRoute(Route(path='/users')).needs_body()
+        assert not CompiledRoute(Route(path='/users', request_validator=RequestValidator())).needs_body()
+        assert CompiledRoute(Route(path='/users', request_validator=RequestValidator(body_required=True))).needs_body()
+
+    def test_match_request(self):
+        compiled = CompiledRoute(Route(path='/users', predicates=[
+            query_equals('page', '1'), RequestPredicate(source=PredicateSource.HEADER, name='X-Tenant', value='a')
+        ]))
+
+        assert compiled.match_request(create_request('page=1', {'X-Tenant': 'a'}))
+        assert not compiled.match_request(create_request('page=1'))
+        assert not compiled.match_request(None)
+        assert CompiledRoute(Route(path='/users')).match_request(None)
+
+    def test_match_request_body(self, mocker):
+        read = mocker.Mock(return_value=b'{"method": "users.get"}')
+        compiled = CompiledRoute(Route(path='/rpc', predicates=[query_equals('v', '1')], body_predicates=[
+            BodyPredicate(path='$.method', value='users.get'), BodyPredicate(path='/method', operator=PredicateOperator.PRESENT)
+        ]))
+
+        assert not compiled.match_request(create_request('v=2'), RequestBody(read))
+        read.assert_not_called()
+        assert compiled.match_request(create_request('v=1'), RequestBody(read))
+        assert not compiled.match_request(create_request('v=1'))
+        assert CompiledRoute(Route(path='/rpc')).match_request(None, RequestBody(read))
+        read.assert_called_once_with()
+
+    def test_equal_values(self):
+        compiled = CompiledRoute(Route(
+            path='/users',
+            predicates=[
+                RequestPredicate(source=PredicateSource.QUERY, name='page', operator=PredicateOperator.PRESENT),
+                query_equals('page', '1'),
+                query_equals('page', '2'),
+            ],
+            body_predicates=[
+                BodyPredicate(path='$.id', value=None),
+                BodyPredicate(path='$.tags', value=['a']),
+                BodyPredicate(path='$.name', operator=PredicateOperator.REGEX, value='a'),
+            ]
+        ))
+
+        assert compiled.equal_values == {(PredicateSource.QUERY, 'page'): '1', ('body', '$.id'): get_json_key(None)}
+
+    def test_authenticate(self):
+        compiled = CompiledRoute(Route(path='/users', auth=TokenAuth(token='secret', error_response=None)))
+
+        compiled.authenticate(MockedRequest({'Authorization': 'Bearer secret'}))
+        CompiledRoute(Route(path='/users')).authenticate(MockedRequest({}))
+
+
+class TestGetMethodMask:
+    def test_get_method_mask(self):
+        mask = get_method_mask(['GET', 'POST'])
+
+        assert mask == METHOD_BITS['GET'] | METHOD_BITS['POST']
+        assert get_method_mask(['POST', 'GET']) is mask
+        assert get_method_mask([]) == 0
+
+
+class TestPredicateTree:
+    def create_tree(self, routes: list[Route]) -> PredicateTree:
+        return PredicateTree([(index, CompiledRoute(route)) for index, route in enumerate(routes)])
+
+    def test_split_by_most_common_key(self):
+        routes = [
+            Route(path='/items', predicates=[query_equals('page', str(index)), query_equals('size', '10')])
+            for index in range(10)
+        ]
+
+        tree = self.create_tree(routes)
+
+        assert tree.key == (PredicateSource.QUERY, 'page')
+        assert tree.children['7'].key is None
+        assert tree.rest is None
+        assert tree.match('GET', '/items', create_request('size=10&page=7'))[1].route is routes[7]
+        assert tree.match('GET', '/items', create_request('size=10&page=10')) is None
+        assert tree.match('GET', '/items', None) is None
+
+    def test_small_trees_are_leaves(self):
+        tree = self.create_tree([Route(path='/items', predicates=[query_equals('page', '1')])] * 4)
+
+        assert tree.key is None
+        assert len(tree.routes) == 4
+        assert self.create_tree([Route(path='/items')] * 5).key is None
+
+    def test_match_first_route(self):
+        routes = [Route(path='/items', predicates=[query_equals('page', str(index % 3))]) for index in range(6)]
+        routes[4:4] = [Route(path='/items', http_methods=[http.HTTPMethod.POST]), Route(path='/items')]
+
+        tree = self.create_tree(routes)
+
+        assert tree.match('GET', '/items', create_request('page=1'))[1].route is routes[1]
+        assert tree.match('GET', '/items', create_request('page=2'))[1].route is routes[2]
+        assert tree.match('GET', '/items', create_request('page=3'))[1].route is routes[5]
+        assert tree.match('GET', '/items', None)[1].route is routes[5]
+        assert tree.match('POST', '/items', create_request('page=1'))[1].route is routes[4]
+
+    def test_match_same_as_linear_scan(self):
+        values = ['a', 'b', 'c']
+        routes = [
+            Route(path='/items', predicates=[
+                query_equals(name, value) for name, value in zip(['x', 'y', 'z'], variant) if value is not None
+            ])
+            for variant in itertools.product(values + [None], repeat=3)
+        ]
+        tree = self.create_tree(routes)
+
+        for query in itertools.product(values + ['d'], repeat=3):
+            request = create_request('&'.join(f'{name}={value}' for name, value in zip(['x', 'y', 'z'], query)))
+            expected = next(route for route in routes if all(p.match(request) for p in route.predicates))
+            assert tree.match('GET', '/items', request)[1].route is expected
+
+
+    def test_match_body(self):
+        routes = [
+            Route(path='/rpc', body_predicates=[BodyPredicate(path='$.method', value=method)])
+            for method in ['get', 'list', 'create', 'update', 'delete', 1, None, True, 0, False]
+        ]
+        routes.append(Route(path='/rpc', body_predicates=[BodyPredicate(path='$.method', value=['get'])]))
+        tree = self.create_tree(routes)
+
+        def match(body: bytes) -> Route | None:
+            found = tree.match('GET', '/rpc', create_request(), RequestBody(lambda: body))
+            return found[1].route if found else None
+
+        assert tree.key == ('body', '$.method')
+        assert len(tree.children) == 10
+        assert match(b'{"method": "update"}') is routes[3]
+        assert match(b'{"method": 1}') is routes[5]
+        assert match(b'{"method": null}') is routes[6]
+        assert match(b'{"method": 1.0}') is routes[5]
+        assert match(b'{"method": true}') is routes[7]
+        assert match(b'{"method": 0}') is routes[8]
+        assert match(b'{"method": false}') is routes[9]
+        assert match(b'{"method": ["get"]}') is routes[10]
+        assert match(b'{"method": "patch"}') is None
+        assert match(b'[]') is None
+        assert tree.match('GET', '/rpc', None) is None
+
+    def test_match_graphql(self):
+        routes = [
+            Route(path='/graphql', graphql=GraphQLPredicate(operation_name=name, variables={'id': 1}))
+            for name in ['GetUser', 'GetUsers', 'CreateUser', 'DeleteUser', 'GetUser']
+        ]
+        routes.append(Route(path='/graphql', graphql=GraphQLPredicate()))
+        tree = self.create_tree(routes)
+
+        def match(query: str, variables: str = '{"id": 1}') -> Route | None:
+            body = RequestBody(lambda: f'{{"query": "{query}", "variables": {variables}}}'.encode())
+            found = tree.match('GET', '/graphql', create_request(), body)
+            return found[1].route if found else None
+
+        assert tree.key == ('graphql', 'operation_name')
+        assert match('query GetUsers { users }') is routes[1]
+        assert match('mutation DeleteUser { delete }') is routes[3]
+        assert match('query GetUser { user }', '{}') is routes[5]
+        assert match('{ users }') is routes[5]
+        assert match('{ users') is None
+
+
+class TestRoutePlan:
+    def test_match(self):
+        routes = [
+            Route(path='/users/{user_id:integer}', predicates=[query_equals('page', '1')]),
+            Route(path='/users/1'),
+            Route(path='/users/{user_id:integer}'),
+        ]
+        plan = RoutePlan(routes, 1)
+
+        assert plan.match('GET', '/users/1', create_request('page=1')).route is routes[0]
+        assert plan.match('GET', '/users/1', create_request('page=2')).route is routes[1]
+        assert plan.match('GET', '/users/2', create_request('page=2')).route is routes[2]
+        assert plan.match('GET', '/users', create_request()) is None
+
+    def test_needs_body(self):
+        predicates = [BodyPredicate(path='$.method', value='users.get')]
+        plan = RoutePlan([
+            Route(path='/rpc', http_methods=[http.HTTPMethod.POST], body_predicates=predicates),
+            Route(path='/rpc/{version:integer}', body_predicates=predicates),
+            Route(path='/users'),
+            Route(path='/graphql', graphql=GraphQLPredicate()),
+        ], 1)
+
+        assert plan.needs_body('POST', '/rpc')
+        assert plan.needs_body('GET', '/rpc/1')
+        assert not plan.needs_body('GET', '/rpc')
+        assert not plan.needs_body('GET', '/users')
+        assert plan.needs_body('GET', '/graphql')
+
+    def test_match_hosts(self):
+        routes = [
+            Route(path='/health', host='billing'),
+            Route(path='/health'),
+            Route(path='/health', host='users:8080'),
+            Route(path='/{name:string}', host='users'),
+        ]
+        plan = RoutePlan(routes, 1)
+
+        assert plan.match('GET', '/health', create_request(headers={'Host': 'billing:8080'})).route is routes[0]
+        assert plan.match('GET', '/health', create_request(headers={'Host': 'users:8080'})).route is routes[1]
+        assert plan.match('GET', '/status', create_request(headers={'Host': 'users:8080'})).route is routes[3]
+        assert plan.match('GET', '/status', create_request(headers={'Host': 'billing'})) is None
+        assert plan.match('GET', '/health').route is routes[1]
+        assert plan.match('GET', '/status') is None
+
+    def test_needs_body_by_host(self):
+        plan = RoutePlan([Route(path='/rpc', host='billing', body_predicates=[BodyPredicate(operator='present')])], 1)
+
+        assert plan.needs_body('GET', '/rpc', create_request(headers={'Host': 'billing'}))
+        assert not plan.needs_body('GET', '/rpc', create_request(headers={'Host': 'users'}))
+
+    def test_reuse_current_compiled_routes(self):
+        routes = [Route(path='/users'), Route(path='/items')]
+        plan = RoutePlan(routes, 1)
+        routes[1].version += 1
+
+        rebuilt = RoutePlan(routes, 2, plan)
+
+        assert rebuilt.compiled_routes[0] is plan.compiled_routes[0]
+        assert rebuilt.compiled_routes[1] is not plan.compiled_routes[1]
+
+    def test_is_current(self):
+        routes = [Route(path='/users')]
+        plan = RoutePlan(routes, 1)
+
+        assert plan.is_current(routes, 1)
+        assert not plan.is_current(routes, 2)
+        assert not plan.is_current(list(routes), 1)
+        routes.append(Route(path='/items'))
+        assert not plan.is_current(routes, 1)
+
+
+class TestRouterMatchCompiled:
+    def test_match_compiled(self):
+        routes = [Route(path='/users'), Route(path='/users/{user_id:integer}')]
+        router = Router(routes=routes)
+
+        assert router.match_compiled('GET', 'users/1').route is routes[1]
+        assert router.match_compiled('GET', '/users').route is routes[0]
+        assert router.match_compiled('POST', '/users') is None
+
+    def test_match_compiled_with_request(self):
+        routes = [Route(path='/users', predicates=[query_equals('page', '1')]), Route(path='/users')]
+        router = Router(routes=routes)
+
+        assert router.match_compiled('GET', '/users', create_request('page=1')).route is routes[0]
+        assert router.match_compiled('GET', '/users').route is routes[1]
+
+    def test_match_compiled_with_body(self):
+        routes = [
+            Route(path='/rpc', body_predicates=[BodyPredicate(path='$.method', value=method)])
+            for method in ['users.get', 'users.list']
+        ]
+        router = Router(routes=routes)
+
+        assert router.match_compiled('GET', 'rpc', body=RequestBody(lambda: b'{"method": "users.list"}')).route is routes[1]
+        assert router.match_compiled('GET', '/rpc') is None
+        assert router.needs_body('GET', 'rpc')
+
+    def test_compiled_routes_are_cached(self):
+        router = Router(routes=[Route(path='/users')])
+
+        compiled = router.match_compiled('GET', '/users')
+
+        assert router.match_compiled('GET', '/users') is compiled
+
+    def test_changed_routes_are_compiled_again(self):
+        route = Route(path='/users')
+        router = Router(routes=[route])
+        compiled = router.match_compiled('GET', '/users')
+
+        with router.modify(route=route):
+            route.http_methods = [http.HTTPMethod.POST]
+        router.add_route(Route(path='/users'))
+
+        assert router.match_compiled('POST', '/users') is not compiled
+        assert router.match_compiled('GET', '/users').route is router.routes[1]
+
+    def test_replaced_routes_are_compiled_again(self):
+        router = Router(routes=[Route(path='/users')])
+        router.match_compiled('GET', '/users')
+
+        router.routes = [Route(path='/items')]
+
+        assert router.match_compiled('GET', '/items').route is router.routes[0]
+
+    def test_compile_routes(self):
+        router = Router(routes=[Route(path='/users', responses=[Response(status_code=http.HTTPStatus.OK, body={})])])
+
+        router.compile_routes()
+
+        compiled = router.get_plan().compiled_routes[0]
+        assert compiled._responses is not None
+        assert router.match_compiled('GET', '/users') is compiled
@@ -0,0 +1,70 @@
+import datetime
+import time
+
+from trickster.model import Route
+from trickster.namespaces import get_namespaces
+from trickster.reaper import Reaper
+
+
+def make_reaper(config, interval: float = 1.0) -> Reaper:
+    return Reaper(config, get_namespaces(config=config), interval)
+
+
+class TestReaper:
+    def test_reap(self, mocked_config, mocked_router):
+        now = datetime.datetime.now(datetime.UTC)
+        reaper = make_reaper(mocked_config)
+        reaped_routes, reaped_namespaces = reaper.reaped_routes.value, reaper.reaped_namespaces.value
+        mocked_router.add_route(Route(path='/expired', expires_at=now))
+        reaper.namespaces.set_expiration('shard-1', now)
+
+        reaper.reap()
+
+        assert [str(route.path) for route in mocked_router.routes] == ['/users']
+        assert reaper.namespaces.routers == {}
+        assert reaper.reaped_routes.value == reaped_routes + 1
+        assert reaper.reaped_namespaces.value == reaped_namespaces + 1
+
+    def test_reap_nothing_expired(self, mocked_config, mocked_router, mocker):
+        reaper = make_reaper(mocked_config)
+        remove_expired = mocker.spy(reaper.namespaces, 'remove_expired')
+
+        reaper.reap()
+
+        remove_expired.assert_not_called()
+        assert [str(route.path) for route in mocked_router.routes] == ['/users']
+
+    def test_reap_shared_state(self, mocked_config, mocked_router, mocked_shared_state, mocked_snapshotter):
+        mocked_shared_state.initialize(get_namespaces(config=mocked_config))
+        reaper = make_reaper(mocked_config)
+        mocked_router.add_route(Route(path='/expired', expires_at=datetime.datetime.now(datetime.UTC)))
+
+        reaper.reap()
+
+        assert mocked_shared_state.get_version() == 2
+        assert mocked_snapshotter._changed
+
+    def test_start_and_stop(self, mocked_config, mocked_router):
+        reaper = make_reaper(mocked_config, interval=0.01)
+        mocked_router.add_route(Route(path='/expired', expires_at=datetime.datetime.now(datetime.UTC)))
+
+        reaper.start()
+        while len(mocked_router.routes) > 1:
+            time.sleep(0.01)
+        reaper.stop()
+        reaper.stop()
+
+        assert reaper._thread is None
+        assert [str(route.path) for route in mocked_router.routes] == ['/users']
+
+    def test_failed_reap(self, mocked_config, mocker):
+        reaper = make_reaper(mocked_config, interval=0.01)
+        mocker.patch.object(reaper, 'reap', side_effect=RuntimeError('Database is locked.'))
+        warning = mocker.patch('trickster.reaper.get_logger').return_value.warning
+
+        reaper.start()
+        while not warning.called:
+            time.sleep(0.01)
+        reaper.stop()
+
+        warning.assert_called_with('Expired routes were not removed: Database is locked.')
@@ -0,0 +1,250 @@
+import http
+import json
+import os
+import shutil
+import time
+
+import pytest
+
+from trickster.config import get_config
+from trickster.model import InputResponse, RequestValidator, Response, ResponseValidator, Route
+from trickster.openapi import OpenApiSpec
+from trickster.reload import Reloader, apply_error_responses_diff, apply_routes_diff, get_loaded_routes, get_route_key
+from trickster.router import Router
+from tests.conftest import mocked_files_path
+
+
+validator = ResponseValidator(status_code=http.HTTPStatus.OK, json_schema={'type': 'object'})
+other_validator = ResponseValidator(status_code=http.HTTPStatus.OK, json_schema={'type': 'array'})
+
+
+def write_file(path, content: str) -> None:
+    path.write_text(content)
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+@pytest.fixture
+def config_file(tmp_path, mocker, mocked_config):
+    config_file = tmp_path / 'config.json'
+    config_file.write_text(json.dumps({'settings': {'error_responses': [{'status_code': 404, 'body': {}}]}}))
+    mocker.patch.dict(os.environ, {'TRICKSTER_CONF_PATH': str(config_file)})
+    get_config.cache_clear()
+    yield config_file
+    get_config.cache_clear()
+
+
+class TestApplyRoutesDiff:
+    def test_get_route_key(self):
+        route = Route(path='/users', http_methods=[http.HTTPMethod.POST, http.HTTPMethod.GET])
+
+        assert get_route_key(route) == ('/users', ('GET', 'POST'))
+
+    def test_apply_routes_diff(self):
+        old_routes = [
+            Route(path='/removed'),
+            Route(path='/kept', response_validators=[validator]),
+            Route(path='/changed', response_validators=[validator]),
+        ]
+        new_routes = [
+            Route(path='/kept', response_validators=[validator]),
+            Route(path='/changed', response_validators=[other_validator]),
+            Route(path='/added'),
+        ]
+        user_route = Route(path='/user')
+        routes = [*old_routes, user_route]
+
+        result = apply_routes_diff(routes, old_routes, new_routes)
+
+        assert [str(route.path) for route in result] == ['/kept', '/changed', '/user', '/added']
+        assert result[0] is old_routes[1]
+        assert result[1].id == old_routes[2].id
+        assert result[1].response_validators == [other_validator]
+        assert result[1].version == 2
+        assert old_routes[2].response_validators == [validator]
+        assert result[3] is new_routes[2]
+
+    def test_apply_routes_diff_user_route_with_same_key(self):
+        old_routes = [Route(path='/removed'), Route(path='/changed', response_validators=[validator])]
+        new_routes = [Route(path='/changed', response_validators=[other_validator])]
+        user_routes = [
+            Route(path='/changed', response_validators=[validator], responses=[Response(status_code=200, body={})]),
+            Route(path='/removed', responses=[Response(status_code=200, body={})]),
+        ]
+
+        result = apply_routes_diff([*user_routes, *old_routes], old_routes, new_routes)
+
+        assert result[:2] == user_routes
+        assert result[2].id == old_routes[1].id
+        assert result[2].response_validators == [other_validator]
+        assert len(result) == 3
+
+    def test_apply_routes_diff_request_validator(self):
+        old_routes = [Route(path='/kept'), Route(path='/changed', request_validator=RequestValidator(body_required=True))]
+        new_routes = [Route(path='/kept'), Route(path='/changed', request_validator=RequestValidator(status_code=422))]
+
+        result = apply_routes_diff(old_routes, old_routes, new_routes)
+
+        assert result[0] is old_routes[0]
+        assert result[1].request_validator is new_routes[1].request_validator
+        assert result[1].version == 2
+
+    def test_apply_routes_diff_idempotent(self):
+        old_routes = [Route(path='/removed'), Route(path='/changed', response_validators=[validator])]
+        new_routes = [Route(path='/changed', response_validators=[other_validator]), Route(path='/added')]
+
+        once = apply_routes_diff(old_routes, old_routes, new_routes)
+        twice = apply_routes_diff(once, old_routes, new_routes)
+
+        assert twice == once
+
+    def test_apply_routes_diff_deleted_route(self):
+        old_routes = [Route(path='/changed', response_validators=[validator])]
+        new_routes = [Route(path='/changed', response_validators=[other_validator])]
+
+        assert apply_routes_diff([], old_routes, new_routes) == []
+
+
+    def test_get_loaded_routes(self):
+        old_routes = [Route(path='/kept'), Route(path='/removed')]
+        new_routes = [Route(path='/kept'), Route(path='/added')]
+        routes = apply_routes_diff(old_routes, old_routes, new_routes)
+
+        loaded_routes = get_loaded_routes(routes, old_routes, new_routes)
+
+        assert loaded_routes == [old_routes[0], new_routes[1]]
+        assert apply_routes_diff(routes, loaded_routes, []) == []
+
+
+class TestApplyErrorResponsesDiff:
+    def test_apply_error_responses_diff(self):
+        old_responses = [
+            InputResponse(status_code=http.HTTPStatus.NOT_FOUND, body={'error': 'removed'}),
+            InputResponse(status_code=http.HTTPStatus.NOT_FOUND, body={'error': 'kept'}),
+            InputResponse(status_code=http.HTTPStatus.NOT_FOUND, body={'error': 'deleted by user'}),
+        ]
+        new_responses = [
+            *old_responses[1:],
+            InputResponse(status_code=http.HTTPStatus.UNAUTHORIZED, body={'error': 'added'}),
+        ]
+        error_responses = [Response(**old_responses[0].model_dump()), Response(**old_responses[1].model_dump())]
+
+        result = apply_error_responses_diff(error_responses, old_responses, new_responses)
+
+        assert [response.body for response in result] == [{'error': 'kept'}, {'error': 'added'}]
+        assert result[0] is error_responses[1]
+
+    def test_apply_error_responses_diff_idempotent(self):
+        new_responses = [InputResponse(status_code=http.HTTPStatus.NOT_FOUND, body={'error': 'added'})]
+
+        once = apply_error_responses_diff([], [], new_responses)
+
+        assert apply_error_responses_diff(once, [], new_responses) == once
+
+
+class TestReloader:
+    def test_reload_config(self, config_file):
+        config = get_config()
+        router = Router(error_responses=[Response(**config.settings.error_responses[0].model_dump())])
+        reloader = Reloader(config, router, [])
+
+        reloader.check()
+
+        assert len(router.error_responses) == 1
+
+        write_file(config_file, json.dumps({'settings': {'error_responses': [{'status_code': 401, 'body': {}}]}}))
+        reloader.check()
+
+        assert [response.status_code for response in router.error_responses] == [http.HTTPStatus.UNAUTHORIZED]
+        assert [response.status_code for response in reloader.error_responses] == [http.HTTPStatus.UNAUTHORIZED]
+
+    def test_reload_invalid_config(self, config_file):
+        router = Router()
+        reloader = Reloader(get_config(), router, [])
+
+        write_file(config_file, '{"settings": ')
+        reloader.check()
+
+        assert router.error_responses == []
+
+    def test_reload_spec(self, config_file, tmp_path, mocker):
+        spec_file = tmp_path / 'openapi.yaml'
+        shutil.copy(mocked_files_path / 'openapi.yaml', spec_file)
+        write_file(config_file, json.dumps({'openapi_boostrap': str(spec_file)}))
+        get_config.cache_clear()
+        old_routes = OpenApiSpec.load(spec_file).get_routes()
+        router = Router(routes=list(old_routes))
+        reloader = Reloader(get_config(), router, old_routes)
+        new_routes = [old_routes[0], Route(path='/added')]
+        mocker.patch.object(OpenApiSpec, 'get_routes', return_value=new_routes)
+
+        write_file(spec_file, spec_file.read_text() + '\n')
+        reloader.check()
+        reloader.check()
+
+        assert [str(route.path) for route in router.routes] == ['/items', '/added']
+        assert reloader.spec_routes == new_routes
+        assert OpenApiSpec.get_routes.call_count == 1
+
+    def test_reload_invalid_spec(self, config_file, tmp_path):
+        spec_file = tmp_path / 'openapi.yaml'
+        spec_file.write_text('openapi: 3.0.0')
+        write_file(config_file, json.dumps({'openapi_boostrap': str(spec_file)}))
+        get_config.cache_clear()
+        router = Router(routes=[Route(path='/items')])
+        reloader = Reloader(get_config(), router, list(router.routes))
+
+        write_file(spec_file, 'invalid: spec')
+        reloader.check()
+
+        assert [str(route.path) for route in router.routes] == ['/items']
+
+    def test_reload_changed_spec_path(self, config_file, tmp_path, mocker):
+        route = Route(path='/items')
+        router = Router(routes=[route])
+        reloader = Reloader(get_config(), router, [route])
+        mocker.patch.object(OpenApiSpec, 'load')
+        OpenApiSpec.load.return_value.get_routes.return_value = [Route(path='/books')]
+
+        write_file(config_file, json.dumps({'openapi_boostrap': str(tmp_path / 'openapi.yaml')}))
+        reloader.check()
+
+        assert [str(route.path) for route in router.routes] == ['/books']
+        assert reloader.spec_path == tmp_path / 'openapi.yaml'
+
+    def test_reload_removed_spec_path(self, config_file, tmp_path):
+        route = Route(path='/items')
+        router = Router(routes=[route, Route(path='/user')])
+        write_file(config_file, json.dumps({'openapi_boostrap': str(tmp_path / 'openapi.yaml')}))
+        get_config.cache_clear()
+        reloader = Reloader(get_config(), router, [route])
+
+        write_file(config_file, json.dumps({}))
+        reloader.check()
+
+        assert [str(route.path) for route in router.routes] == ['/user']
+
+    def test_reload_shared_and_persisted(self, config_file, mocked_config, mocked_shared_state, mocked_snapshotter):
+        router = Router()
+        mocked_shared_state.initialize(router)
+        reloader = Reloader(mocked_config, router, [])
+        settings = {'error_responses': [{'status_code': 401, 'body': {}}]}
+        spec_path = str(mocked_config.openapi_boostrap)
+
+        write_file(config_file, json.dumps({'openapi_boostrap': spec_path, 'settings': settings}))
+        reloader.check()
+
+        assert mocked_shared_state.version == 2
+        assert mocked_snapshotter._changed
+
+    def test_start_and_stop(self, config_file, mocker):
+        reloader = Reloader(get_config(), Router(), [], interval=0.01)
+        check = mocker.patch.object(reloader, 'check')
+
+        reloader.start()
+        while not check.called:
+            time.sleep(0.01)
+        reloader.stop()
+        reloader.stop()
+
+        assert reloader._thread is None
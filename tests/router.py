@@ -1,10 +1,13 @@
+import datetime
 import http
 import uuid
 
+import pytest
 from fastapi import Request
 
 from trickster.model import Route, Response, ResponseSelector
-from trickster.router import Router
+from trickster.exceptions import PreconditionFailedError
+from trickster.router import Router, matches_etag, paginate
 
 from typing import cast
 
@@ -59,6 +62,32 @@ class TestRouter:
 
         assert router.routes[0] == route
 
+    def test_add_multiple_routes(self):
+        routes = [Route(path='/first'), Route(path='/second')]
+        router = Router(routes=[])
+        previous_routes = router.routes
+
+        router.add_routes(routes)
+
+        assert router.routes == routes
+        assert previous_routes == []
+
+    def test_find_routes(self):
+        routes = [
+            Route(path='/users', http_methods=[http.HTTPMethod.GET, http.HTTPMethod.POST], tags=['users'], hits=1),
+            Route(path='/users/{user_id}', tags=['users', 'detail']),
+            Route(path='/items', http_methods=[http.HTTPMethod.POST]),
+        ]
+        router = Router(routes=routes)
+
+        assert router.find_routes() == routes
+        assert router.find_routes(path_prefix='/users') == routes[:2]
+        assert router.find_routes(http_method=http.HTTPMethod.POST) == [routes[0], routes[2]]
+        assert router.find_routes(tag='detail') == [routes[1]]
+        assert router.find_routes(has_hits=True) == [routes[0]]
+        assert router.find_routes(has_hits=False) == routes[1:]
+        assert router.find_routes(path_prefix='/users', http_method=http.HTTPMethod.POST) == [routes[0]]
+
     def test_delete_route(self):
         router = Router(routes=self.routes)
 
@@ -128,3 +157,204 @@ class TestRouter:
         router.delete_error_response(self.error_responses[0])
 
         assert router.error_responses == self.error_responses[1:]
+
+    def test_count_hit(self):
+        route = Route(path='/test', responses=[], http_methods=[http.HTTPMethod.GET])
+        router = Router(routes=[route])
+
+        router.count_hit(route)
+
+        assert route.hits == 1
+        assert router.pop_pending_hits() == {}
+
+        router.track_hits()
+        router.count_hit(route)
+        router.count_hit(route)
+
+        assert route.hits == 3
+        assert router.pop_pending_hits() == {route.id: 2}
+        assert router.pop_pending_hits() == {}
+
+    def test_iter_hit_counted(self):
+        error_response = Response(status_code=http.HTTPStatus.UNAUTHORIZED, body={})
+        route = Route(
+            path='/test', responses=self.responses[:1],
+            auth={'method': 'token', 'token': 'token', 'error_response': error_response.model_dump()}
+        )
+        route_without_error_response = Route(
+            path='/mest', auth={'method': 'token', 'token': 'token', 'error_response': None}
+        )
+        router = Router(routes=[route, route_without_error_response], error_responses=self.error_responses[:1])
+
+        assert list(router.iter_hit_counted()) == [
+            route, self.responses[0], route.auth.error_response, route_without_error_response, self.error_responses[0]
+        ]
+
+    def test_set_hits(self):
+        route = Route(path='/test', responses=[Response(status_code=http.HTTPStatus.OK, body={}, hits=5)])
+        router = Router(routes=[route])
+
+        router.set_hits({route.id: 3})
+
+        assert route.hits == 3
+        assert route.responses[0].hits == 0
+
+    def test_dump_and_restore_state(self):
+        router = Router(routes=self.routes, error_responses=self.error_responses)
+        restored_router = Router()
+
+        router.version = 5
+        restored_router.restore_state(router.dump_state())
+
+        assert restored_router.version == 5
+        assert restored_router.routes == router.routes
+        assert restored_router.error_responses == router.error_responses
+        assert restored_router.error_response_selector == router.error_response_selector
+
+    def test_modify(self):
+        route = Route(path='/users')
+        router = Router(routes=[route])
+
+        with router.modify('"1"', route):
+            route.tags = ['users']
+        with router.modify('*'):
+            router.delete_routes()
+
+        assert route.version == 2
+        assert router.version == 3
+
+    @pytest.mark.parametrize('with_route, message', [
+        (True, 'Route ".*" was changed, current ETag is "2".'),
+        (False, 'Routes and error responses were changed, current ETag is "2".'),
+    ])
+    def test_modify_precondition_failed(self, with_route, message):
+        route = Route(path='/users', version=2)
+        router = Router(routes=[route], version=2)
+
+        with pytest.raises(PreconditionFailedError, match=message), router.modify('"1"', route if with_route else None):
+            router.delete_routes()
+
+        assert router.routes == [route]
+        assert route.version == 2
+        assert router.version == 2
+
+    def test_remove_expired_routes(self):
+        now = datetime.datetime.now(datetime.UTC)
+        expired = Route(path='/expired', expires_at=now - datetime.timedelta(seconds=1))
+        prolonged = Route(path='/prolonged', expires_at=now - datetime.timedelta(seconds=1))
+        later = Route(path='/later', expires_at=now + datetime.timedelta(seconds=60))
+        permanent = Route(path='/permanent')
+        router = Router(routes=[expired, prolonged])
+        router.add_routes([later, permanent])
+        prolonged.expires_at = now + datetime.timedelta(seconds=30)
+        router.schedule_expiration(prolonged)
+
+        assert router.next_expiration == expired.expires_at
+        assert router.remove_expired_routes(now) == 1
+        assert router.routes == [prolonged, later, permanent]
+        assert router.version == 2
+        assert router.next_expiration == prolonged.expires_at
+        assert router.remove_expired_routes(now + datetime.timedelta(seconds=90)) == 2
+        assert router.routes == [permanent]
+        assert router.next_expiration is None
+
+    def test_remove_expired_routes_without_scheduled_routes(self, mocker):
+        now = datetime.datetime.now(datetime.UTC)
+        router = Router()
+        router.add_route(Route(path='/later', expires_at=now + datetime.timedelta(seconds=60)))
+        router.__dict__['routes'] = routes = mocker.MagicMock()
+
+        assert router.remove_expired_routes(now) == 0
+        routes.__iter__.assert_not_called()
+
+    def test_remove_expired_routes_naive_expiration(self):
+        now = datetime.datetime.now(datetime.UTC)
+        naive = Route(path='/naive', expires_at=now.replace(tzinfo=None) - datetime.timedelta(seconds=1))
+        aware = Route(path='/aware', expires_at=now + datetime.timedelta(seconds=60))
+        router = Router()
+        router.add_routes([naive, aware])
+
+        assert naive.expires_at.tzinfo == datetime.UTC
+        assert router.remove_expired_routes(now) == 1
+        assert router.routes == [aware]
+
+    def test_remove_deleted_expired_route(self):
+        now = datetime.datetime.now(datetime.UTC)
+        route = Route(path='/expired', expires_at=now)
+        router = Router()
+        router.add_route(route)
+        router.delete_route(route)
+
+        assert router.remove_expired_routes(now) == 0
+
+    def test_restore_state_schedules_expirations(self):
+        expires_at = datetime.datetime.now(datetime.UTC)
+        router = Router(routes=[Route(path='/expired', expires_at=expires_at)], expires_at=expires_at)
+        restored_router = Router()
+
+        restored_router.restore_state(router.dump_state())
+
+        assert restored_router.expires_at == expires_at
+        assert restored_router.next_expiration == expires_at
+
+
+class TestPaginate:
+    routes = [Route(path=f'/items/{index}') for index in range(5)]
+
+    def test_paginate(self):
+        first_page, cursor = paginate(self.routes, self.routes, None, 2)
+        second_page, second_cursor = paginate(self.routes, self.routes, cursor, 2)
+        last_page, last_cursor = paginate(self.routes, self.routes, second_cursor, 2)
+
+        assert first_page == self.routes[:2]
+        assert cursor == f'1:{self.routes[1].id}'
+        assert second_page == self.routes[2:4]
+        assert last_page == self.routes[4:]
+        assert last_cursor is None
+
+    def test_paginate_without_limit(self):
+        assert paginate(self.routes, self.routes, f'0:{self.routes[0].id}', None) == (self.routes[1:], None)
+
+    def test_paginate_exact_page(self):
+        assert paginate(self.routes, self.routes, None, 5) == (self.routes, None)
+
+    def test_paginate_filtered(self):
+        filtered = self.routes[::2]
+
+        first_page, cursor = paginate(filtered, self.routes, None, 2)
+        last_page, last_cursor = paginate(filtered, self.routes, cursor, 2)
+
+        assert first_page == [self.routes[0], self.routes[2]]
+        assert cursor == f'2:{self.routes[2].id}'
+        assert last_page == [self.routes[4]]
+        assert last_cursor is None
+
+    def test_paginate_after_deleted_route(self):
+        _, cursor = paginate(self.routes, self.routes, None, 2)
+        routes = [route for route in self.routes if route is not self.routes[1]]
+
+        assert paginate(routes, routes, cursor, 2) == (self.routes[2:4], f'2:{self.routes[3].id}')
+
+    def test_paginate_after_filtered_out_route(self):
+        _, cursor = paginate(self.routes, self.routes, None, 2)
+        filtered = self.routes[:1] + self.routes[3:]
+
+        assert paginate(filtered, self.routes, cursor, 2) == (self.routes[3:], None)
+
+    @pytest.mark.parametrize('cursor', ['x', f'x:{uuid.uuid4()}', '1:x'])
+    def test_paginate_invalid_cursor(self, cursor):
+        with pytest.raises(ValueError, match=f'Cursor "{cursor}" is invalid.'):
+            paginate(self.routes, self.routes, cursor, 2)
+
+
+class TestMatchesEtag:
+    @pytest.mark.parametrize('if_match, expectation', [
+        ('"3"', True),
+        ('"1", "3"', True),
+        ('*', True),
+        ('"1"', False),
+        ('W/"3"', False),
+        ('3', False),
+    ])
+    def test_matches_etag(self, if_match, expectation):
+        assert matches_etag(if_match, 3) is expectation
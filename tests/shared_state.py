@@ -0,0 +1,210 @@
+import http
+
+import pytest
+
+from trickster.model import Route, Response
+from trickster.namespaces import get_namespaces
+from trickster.router import Router
+from trickster.shared_state import SharedState
+from tests.conftest import AUTH_TOKEN
+
+
+@pytest.fixture
+def database(tmp_path):
+    return tmp_path / 'state.db'
+
+
+def make_worker(database) -> tuple[SharedState, Router]:
+    shared_state = SharedState(database, hits_interval=0.0)
+    router = Router(error_responses=[Response(status_code=http.HTTPStatus.NOT_FOUND, body={})])
+    shared_state.initialize(router)
+    return shared_state, router
+
+
+class TestSharedState:
+    def test_initialize(self, database):
+        first_state, first_router = make_worker(database)
+        second_state, second_router = make_worker(database)
+
+        assert first_state.version == 1
+        assert second_state.version == 1
+        assert second_router.error_responses == first_router.error_responses
+
+    def test_refresh(self, database):
+        first_state, first_router = make_worker(database)
+        second_state, second_router = make_worker(database)
+
+        first_state.begin(first_router)
+        first_router.add_route(Route(path='/users'))
+        first_state.commit(first_router)
+        second_state.refresh(second_router)
+
+        assert first_state.get_version() == 2
+        assert second_state.version == 2
+        assert [route.id for route in second_router.routes] == [first_router.routes[0].id]
+
+    def test_refresh_unchanged(self, database, mocker):
+        shared_state, router = make_worker(database)
+        restore_state = mocker.spy(Router, 'restore_state')
+
+        shared_state.refresh(router)
+
+        restore_state.assert_not_called()
+
+    def test_begin_loads_latest_state(self, database):
+        first_state, first_router = make_worker(database)
+        second_state, second_router = make_worker(database)
+        first_state.begin(first_router)
+        first_router.add_route(Route(path='/users'))
+        first_state.commit(first_router)
+
+        second_state.begin(second_router)
+        second_router.add_route(Route(path='/books'))
+        second_state.commit(second_router)
+        first_state.refresh(first_router)
+
+        assert [str(route.path) for route in first_router.routes] == ['/users', '/books']
+
+    def test_begin_failed(self, database, mocker):
+        shared_state, router = make_worker(database)
+        mocker.patch.object(shared_state, 'refresh', side_effect=RuntimeError)
+
+        with pytest.raises(RuntimeError):
+            shared_state.begin(router)
+
+        assert not shared_state._write_lock.locked()
+
+    def test_rollback(self, database):
+        first_state, first_router = make_worker(database)
+        second_state, second_router = make_worker(database)
+
+        first_state.begin(first_router)
+        first_router.add_route(Route(path='/users'))
+        first_state.rollback()
+        first_state.refresh(first_router)
+        second_state.refresh(second_router)
+
+        assert first_router.routes == []
+        assert second_router.routes == []
+        assert not first_state._write_lock.locked()
+
+    def test_transaction(self, database):
+        first_state, first_router = make_worker(database)
+        second_state, second_router = make_worker(database)
+
+        with first_state.transaction(first_router):
+            first_router.add_route(Route(path='/users'))
+        second_state.refresh(second_router)
+
+        assert [str(route.path) for route in second_router.routes] == ['/users']
+        assert not first_state._write_lock.locked()
+
+    def test_transaction_failed(self, database):
+        first_state, first_router = make_worker(database)
+
+        with pytest.raises(ValueError), first_state.transaction(first_router):
+            first_router.add_route(Route(path='/users'))
+            raise ValueError
+        first_state.refresh(first_router)
+
+        assert first_router.routes == []
+        assert not first_state._write_lock.locked()
+
+    def test_hits(self, database):
+        first_state, first_router = make_worker(database)
+        second_state, second_router = make_worker(database)
+        error_response_id = first_router.error_responses[0].id
+
+        first_router.count_hit(first_router.error_responses[0])
+        first_state.flush_hits(first_router)
+        second_router.count_hit(second_router.error_responses[0])
+        second_router.count_hit(second_router.error_responses[0])
+        second_state.sync_hits(second_router)
+
+        assert second_state.get_hits() == {error_response_id: 3}
+        assert second_router.error_responses[0].hits == 3
+
+    def test_flush_hits_locked(self, database):
+        shared_state, router = make_worker(database)
+        router.count_hit(router.error_responses[0])
+
+        shared_state._write_lock.acquire()
+        shared_state.flush_hits(router)
+        shared_state._write_lock.release()
+
+        assert shared_state.get_hits() == {}
+
+    def test_hits_flush_due(self, database):
+        shared_state = SharedState(database, hits_interval=3600)
+
+        assert not shared_state.hits_flush_due
+
+        shared_state.hits_interval = 0
+
+        assert shared_state.hits_flush_due
+
+
+class TestSharedStateRoutes:
+    def test_create_route(self, mocked_shared_state, mocked_router, mocked_config, client, database):
+        mocked_shared_state.initialize(mocked_router)
+        other_state, other_router = make_worker(mocked_config.shared_state)
+
+        result = client.post(f'{mocked_config.internal_prefix}/routes', json={'path': '/books'})
+        other_state.refresh(other_router)
+
+        assert result.status_code == 200
+        assert [str(route.path) for route in other_router.routes] == ['/users', '/books']
+
+    def test_unchanged_state_is_not_stored(
+        self, mocked_shared_state, mocked_snapshotter, mocked_router, mocked_config, client
+    ):
+        mocked_shared_state.initialize(get_namespaces(config=mocked_config))
+
+        deleted = client.delete(f'{mocked_config.internal_prefix}/journal')
+        saved = client.post(f'{mocked_config.internal_prefix}/snapshot')
+
+        assert [deleted.status_code, saved.status_code] == [200, 200]
+        assert mocked_shared_state.get_version() == 1
+        assert not mocked_shared_state._write_lock.locked()
+
+    def test_restored_state_is_stored(
+        self, mocked_shared_state, mocked_snapshotter, mocked_router, mocked_config, client
+    ):
+        namespaces = get_namespaces(config=mocked_config)
+        mocked_shared_state.initialize(namespaces)
+        mocked_snapshotter.save(namespaces)
+
+        restored = client.post(f'{mocked_config.internal_prefix}/snapshot/restore')
+        updated = client.put(f'{mocked_config.internal_prefix}/namespaces/shard-1', json={})
+
+        assert [restored.status_code, updated.status_code] == [200, 200]
+        assert mocked_shared_state.get_version() == 3
+
+    def test_failed_request_is_rolled_back(self, mocked_shared_state, mocked_router, mocked_config, client):
+        mocked_shared_state.initialize(mocked_router)
+
+        result = client.delete(f'{mocked_config.internal_prefix}/settings/error_responses/invalid')
+
+        assert result.status_code == 400
+        assert mocked_shared_state.version is None
+        assert not mocked_shared_state._write_lock.locked()
+
+    def test_mocked_hits(self, mocked_shared_state, mocked_router, mocked_config, client):
+        mocked_shared_state.initialize(mocked_router)
+        other_state, other_router = make_worker(mocked_config.shared_state)
+        route_id = mocked_router.routes[0].id
+
+        client.get('/users', headers={'Authorization': f'Bearer {AUTH_TOKEN}'})
+        other_router.count_hit(other_router.routes[0])
+        other_state.flush_hits(other_router)
+        result = client.get(f'{mocked_config.internal_prefix}/routes/{route_id}')
+
+        assert result.json()['hits'] == 2
+
+    def test_mocked_hits_not_flushed(self, mocked_shared_state, mocked_router, mocked_config, client):
+        mocked_shared_state.initialize(mocked_router)
+        mocked_shared_state.hits_interval = 3600
+
+        client.get('/users', headers={'Authorization': f'Bearer {AUTH_TOKEN}'})
+
+        assert mocked_shared_state.get_hits() == {}
@@ -0,0 +1,88 @@
+import http
+import time
+
+import pytest
+
+from trickster.model import Route, Response
+from trickster.router import Router
+from trickster.snapshot import Snapshotter, SnapshotError
+
+
+def make_router() -> Router:
+    route = Route(path='/users', responses=[Response(status_code=http.HTTPStatus.OK, body={'id': 1}, hits=2)], hits=3)
+    return Router(routes=[route], error_responses=[Response(status_code=http.HTTPStatus.NOT_FOUND, body={})])
+
+
+class TestSnapshotter:
+    def test_save_and_load(self, tmp_path):
+        router = make_router()
+        snapshotter = Snapshotter(tmp_path / 'snapshot.bin')
+        restored_router = Router()
+
+        info = snapshotter.save(router)
+        loaded = snapshotter.load(restored_router)
+
+        assert loaded
+        assert info.path == tmp_path / 'snapshot.bin'
+        assert info.size == (tmp_path / 'snapshot.bin').stat().st_size
+        assert restored_router.routes == router.routes
+        assert restored_router.routes[0].hits == 3
+        assert restored_router.error_responses == router.error_responses
+
+    def test_load_non_existent(self, tmp_path):
+        assert not Snapshotter(tmp_path / 'snapshot.bin').load(Router())
+
+    def test_decode_invalid(self):
+        with pytest.raises(SnapshotError):
+            Snapshotter.decode(b'{"routes": []}')
+
+        with pytest.raises(SnapshotError):
+            Snapshotter.decode(Snapshotter.MAGIC + b'corrupted')
+
+    def test_save_if_changed(self, tmp_path):
+        snapshotter = Snapshotter(tmp_path / 'snapshot.bin')
+
+        snapshotter.save_if_changed(make_router())
+
+        assert not snapshotter.path.exists()
+
+        snapshotter.mark_changed()
+        snapshotter.save_if_changed(make_router())
+
+        assert snapshotter.path.exists()
+
+    def test_periodic_snapshots(self, tmp_path):
+        router = make_router()
+        snapshotter = Snapshotter(tmp_path / 'snapshot.bin', interval=0.01)
+
+        snapshotter.start(router)
+        snapshotter.mark_changed()
+        time.sleep(0.1)
+        snapshotter.stop(router)
+
+        assert snapshotter.path.exists()
+        assert snapshotter._thread is None
+
+    def test_stop_saves_last_changes(self, tmp_path):
+        snapshotter = Snapshotter(tmp_path / 'snapshot.bin', interval=3600)
+        snapshotter.mark_changed()
+
+        snapshotter.stop(make_router())
+
+        assert snapshotter.path.exists()
+
+
+class TestTrackChanges:
+    def test_mocked_request(self, mocked_snapshotter, mocked_router, client):
+        client.get('/users')
+
+        assert mocked_snapshotter._changed
+
+    def test_internal_request(self, mocked_snapshotter, mocked_router, mocked_config, client):
+        client.get(f'{mocked_config.internal_prefix}/routes')
+
+        assert not mocked_snapshotter._changed
+
+        client.delete(f'{mocked_config.internal_prefix}/routes')
+
+        assert mocked_snapshotter._changed
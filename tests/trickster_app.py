@@ -1,9 +1,14 @@
+import zlib
+
 import pytest
 from fastapi import FastAPI
 
 from trickster.trickster_app import create_app, load_openapi_routes
 from trickster.router import get_router
-from trickster.config import get_config
+from trickster.config import OpenApiSource, get_config
+from trickster.namespaces import get_namespaces
+from trickster.snapshot import Snapshotter
+from tests.conftest import mocked_files_path
 
 
 class TestCreateApp:
@@ -25,8 +30,99 @@ class TestLoadOpenapiRoutes:
         assert get_router(config=get_config()).routes[1].auth is None
         assert get_router(config=get_config()).routes[1].response_selector.name == 'RANDOM'
 
+    def test_load_openapi_routes_with_examples(self, mocked_openapi, mocked_config):
+        mocked_config.openapi_examples = True
+
+        load_openapi_routes()
+
+        router = get_router(config=mocked_config)
+        assert [[response.status_code for response in route.responses] for route in router.routes] == [[200], [200]]
+        assert router.match_compiled('POST', '/items').responses[0].body == b'{"status":"OK"}'
+
     @pytest.mark.parametrize('mocked_openapi', ['nonexistent.yaml'], indirect=True)
     def test_load_openapi_routes_non_existent(self, mocked_openapi):
         load_openapi_routes()
 
         assert get_router(config=get_config()).routes == []
+
+
+    def test_load_multiple_specs(self, mocked_openapi, mocked_config):
+        mocked_config.openapi_specs = [
+            OpenApiSource(path=mocked_files_path / 'openapi.yaml', prefix='/billing'),
+            OpenApiSource(path=mocked_files_path / 'openapi.yaml', namespace='team-a'),
+            OpenApiSource(path=mocked_files_path / 'nonexistent.yaml', namespace='team-b'),
+        ]
+
+        spec_routes = load_openapi_routes()
+
+        router = get_router(config=mocked_config)
+        assert [route.path.path for route in spec_routes] == ['/items', '/search']
+        assert [route.path.path for route in router.routes] == ['/items', '/search', '/billing/items', '/billing/search']
+        assert [route.path.path for route in get_namespaces(config=mocked_config).get('team-a').routes] == [
+            '/items', '/search'
+        ]
+        assert 'team-b' not in get_namespaces(config=mocked_config).routers
+
+    def test_load_specs_without_bootstrap(self, mocked_config):
+        mocked_config.openapi_boostrap = None
+        mocked_config.openapi_specs = [OpenApiSource(path=mocked_files_path / 'openapi.yaml', prefix='/billing')]
+
+        assert load_openapi_routes() == []
+        assert len(get_router(config=mocked_config).routes) == 2
+
+
+class TestCreateAppSharedState:
+    def test_create_app_initializes_shared_state(self, mocked_shared_state, mocked_router):
+        create_app()
+
+        assert mocked_shared_state.version == 1
+        assert mocked_router._pending_hits is not None
+
+
+class TestCreateAppSnapshot:
+    def test_create_app_restores_snapshot(self, mocked_snapshotter, mocked_router):
+        route_id = mocked_router.routes[0].id
+        mocked_snapshotter.save(mocked_router)
+        mocked_router.delete_routes()
+
+        app = create_app()
+
+        assert [route.id for route in get_router(config=get_config()).routes] == [route_id]
+        assert len(app.router.on_startup) == 2
+        assert len(app.router.on_shutdown) == 2
+
+    def test_create_app_without_snapshot(self, mocked_snapshotter, mocked_router):
+        mocked_router.delete_routes()
+
+        create_app()
+
+        assert get_router(config=get_config()).routes == []
+
+    @pytest.mark.parametrize('snapshot', [b'invalid', Snapshotter.MAGIC + zlib.compress(b'{"routes": 1}')])
+    def test_create_app_invalid_snapshot(self, mocked_snapshotter, mocked_router, snapshot):
+        route_id = mocked_router.routes[0].id
+        mocked_snapshotter.path.write_bytes(snapshot)
+
+        app = create_app()
+
+        assert [route.id for route in get_router(config=get_config()).routes] == [route_id]
+        assert len(app.router.on_startup) == 2
+
+    def test_create_app_snapshot_load_disabled(self, mocked_snapshotter, mocked_router, mocked_config):
+        mocked_snapshotter.save(mocked_router)
+        mocked_router.delete_routes()
+        mocked_config.snapshot_load = False
+
+        create_app()
+
+        assert get_router(config=get_config()).routes == []
+
+
+class TestCreateAppReload:
+    def test_create_app_with_reload(self, mocked_config):
+        mocked_config.reload_interval = 1.0
+
+        app = create_app()
+
+        assert len(app.router.on_startup) == 2
+        assert len(app.router.on_shutdown) == 2
@@ -0,0 +1,64 @@
+import pytest
+
+from trickster.utils import get_json_key, json_equals, merge_patch
+
+
+class TestMergePatch:
+    @pytest.mark.parametrize(
+        'target, patch, expectation',
+        [
+            ({'a': 'b'}, {'a': 'c'}, {'a': 'c'}),
+            ({'a': 'b'}, {'b': 'c'}, {'a': 'b', 'b': 'c'}),
+            ({'a': 'b'}, {'a': None}, {}),
+            ({'a': 'b', 'b': 'c'}, {'a': None}, {'b': 'c'}),
+            ({'a': ['b']}, {'a': 'c'}, {'a': 'c'}),
+            ({'a': 'c'}, {'a': ['b']}, {'a': ['b']}),
+            ({'a': {'b': 'c'}}, {'a': {'b': 'd', 'c': None}}, {'a': {'b': 'd'}}),
+            ({'a': [{'b': 'c'}]}, {'a': [1]}, {'a': [1]}),
+            (['a', 'b'], ['c', 'd'], ['c', 'd']),
+            ({'a': 'b'}, ['c'], ['c']),
+            ({'a': 'foo'}, 'bar', 'bar'),
+            ({'e': None}, {'a': 1}, {'e': None, 'a': 1}),
+            ([1, 2], {'a': 'b', 'c': None}, {'a': 'b'}),
+            ({}, {'a': {'bb': {'ccc': None}}}, {'a': {'bb': {}}}),
+        ]
+    )
+    def test_merge_patch(self, target, patch, expectation):
+        assert merge_patch(target, patch) == expectation
+
+    def test_merge_patch_keeps_target(self):
+        target = {'a': {'b': 'c'}}
+
+        merge_patch(target, {'a': {'b': None}})
+
+        assert target == {'a': {'b': 'c'}}
+
+
+class TestJsonEquals:
+    @pytest.mark.parametrize(
+        'first, second, expectation',
+        [
+            (1, 1.0, True),
+            (True, True, True),
+            (True, 1, False),
+            (0, False, False),
+            ('a', 'a', True),
+            (None, None, True),
+            ([1, [True]], [1, [True]], True),
+            ([1, [True]], [1, [1]], False),
+            ([1], [1, 2], False),
+            ({'a': {'b': False}}, {'a': {'b': False}}, True),
+            ({'a': {'b': False}}, {'a': {'b': 0}}, False),
+            ({'a': 1}, {'b': 1}, False),
+            ([1], {'a': 1}, False),
+        ]
+    )
+    def test_json_equals(self, first, second, expectation):
+        assert json_equals(first, second) is expectation
+        assert json_equals(second, first) is expectation
+
+    def test_get_json_key(self):
+        assert {get_json_key(value) for value in [1, 1.0, True, 0, False, None, 'a']} == {
+            get_json_key(1), get_json_key(True), get_json_key(0), get_json_key(False), get_json_key(None),
+            get_json_key('a'),
+        }
@@ -0,0 +1,332 @@
+"""Batches of internal operations applied to a router as one atomic update."""
+
+from __future__ import annotations
+
+import abc
+import uuid
+
+from pydantic import BaseModel, Field
+from typing_extensions import Annotated
+
+from trickster.exceptions import ResourceNotFoundError, ValidationError
+from trickster.model import InputResponse, InputResponseValidator, InputRoute, Response, ResponseValidator, Route
+from trickster.router import Router
+
+from typing import Any, Literal, Union
+
+
+BatchResult = Route | Response | list[uuid.UUID]
+RouteReference = Annotated[
+    uuid.UUID | int,
+    Field(description='ID of a route or index of an earlier operation of the batch that returned the route')
+]
+
+
+class Batch:
+    """Working copy of a router changed by operations of a batch.
+
+    The router itself isn't changed until all operations succeed and all changed routes are valid. Only the lists
+    of routes and error responses are copied upfront, routes and error responses are copied when they are changed
+    for the first time.
+    """
+
+    def __init__(self, router: Router) -> None:
+        self.router = router
+        self.routes = list(router.routes)
+        self.error_responses = list(router.error_responses)
+        self.results: list[BatchResult] = []
+        self._changed_routes: dict[uuid.UUID, Route | None] = {}  # Original routes of changed routes, None if new
+        self._changed_error_responses: dict[uuid.UUID, Response] = {}  # Original error responses of changed ones
+
+    def apply(self, operations: list[BatchOperation]) -> list[BatchResult]:
+        """Apply all operations in order, validate changed routes and replace state of the router.
+
+        If any operation fails, the router is left unchanged.
+        """
+        for index, operation in enumerate(operations):
+            try:
+                self.results.append(operation.apply(self))
+            except ResourceNotFoundError as e:
+                raise ResourceNotFoundError(f'Operation {index} failed: {e}') from e
+            except (ValidationError, ValueError) as e:
+                raise ValidationError(f'Operation {index} failed: {e}') from e
+        self._validate()
+        self._commit()
+        return self.results
+
+    def _validate(self) -> None:
+        """Validate combinations of responses and validators of all new and changed routes."""
+        for route in self.routes:
+            if route.id in self._changed_routes:
+                try:
+                    route.validate_existing_response_validator_combinations()
+                except ValueError as e:
+                    raise ValidationError(f'Route "{route.id}" is not valid: {e}') from e
+
+    def _commit(self) -> None:
+        """Replace state of the router with the working copy.
+
+        Hits counted on the original routes and responses while the batch was applied are kept.
+        """
+        for route_id, original in self._changed_routes.items():
+            if original is not None and (route := self._find(self.routes, route_id)):
+                route.version = original.version + 1
+                route.hits = original.hits
+                hits = {response.id: response.hits for response in original.responses}
+                for response in route.responses:
+                    response.hits = hits.get(response.id, response.hits)
+        for response_id, original_response in self._changed_error_responses.items():
+            if error_response := self._find(self.error_responses, response_id):
+                error_response.hits = original_response.hits
+        self.router.replace_state(Router(
+            error_response_selector=self.router.error_response_selector,
+            error_responses=self.error_responses,
+            routes=self.routes,
+            expires_at=self.router.expires_at,
+            version=self.router.version
+        ))
+
+    @staticmethod
+    def _find(items: list[Any], item_id: uuid.UUID) -> Any:
+        """Find route or response by its ID."""
+        for item in items:
+            if item.id == item_id:
+                return item
+        return None
+
+    def resolve_route_id(self, reference: uuid.UUID | int) -> uuid.UUID:
+        """Get ID of a route, `reference` is either the ID or index of an earlier operation that returned a route."""
+        if isinstance(reference, uuid.UUID):
+            return reference
+        if 0 <= reference < len(self.results) and isinstance(route := self.results[reference], Route):
+            return route.id
+        raise ValidationError(f'Operation {reference} is not an earlier operation that returned a route.')
+
+    def add_route(self, route: Route) -> None:
+        """Add new route."""
+        self.routes.append(route)
+        self._changed_routes[route.id] = None
+
+    def get_route(self, reference: uuid.UUID | int) -> Route:
+        """Get route of the working copy."""
+        route_id = self.resolve_route_id(reference)
+        if route := self._find(self.routes, route_id):
+            return route
+        raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+
+    def edit_route(self, reference: uuid.UUID | int) -> Route:
+        """Get route that can be changed by the batch, the route is copied when it's changed for the first time."""
+        route = self.get_route(reference)
+        if route.id not in self._changed_routes:
+            self._changed_routes[route.id] = route
+            index = self.routes.index(route)
+            route = self.routes[index] = route.model_copy(deep=True)
+        return route
+
+    def edit_error_response(self, response_id: uuid.UUID) -> Response:
+        """Get error response that can be changed by the batch, it's copied when it's changed for the first time."""
+        error_response = self._find(self.error_responses, response_id)
+        if error_response is None:
+            raise ResourceNotFoundError(f'Error response "{response_id}" was not found.')
+        if response_id not in self._changed_error_responses:
+            self._changed_error_responses[response_id] = error_response
+            index = self.error_responses.index(error_response)
+            error_response = self.error_responses[index] = error_response.model_copy(deep=True)
+        return error_response
+
+
+class Operation(BaseModel, abc.ABC):
+    """Base class for operations of a batch."""
+
+    op: str
+
+    @abc.abstractmethod
+    def apply(self, batch: Batch) -> BatchResult:
+        """Apply the operation to the working copy of the router and return its result."""
+
+
+class CreateRouteOperation(Operation):
+    """Create new route, returns the route."""
+
+    op: Literal['create_route']
+    route: InputRoute
+
+    def apply(self, batch: Batch) -> Route:
+        """Create the route."""
+        route = Route(**self.route.model_dump())
+        batch.add_route(route)
+        return route
+
+
+class PatchRouteOperation(Operation):
+    """Change route using JSON merge patch, returns the route."""
+
+    op: Literal['patch_route']
+    route_id: RouteReference
+    patch: dict[str, Any]
+
+    def apply(self, batch: Batch) -> Route:
+        """Patch the route."""
+        route = batch.edit_route(self.route_id)
+        route.patch(self.patch, validate=False)
+        return route
+
+
+class DeleteRouteOperation(Operation):
+    """Remove route, returns ID of the route."""
+
+    op: Literal['delete_route']
+    route_id: RouteReference
+
+    def apply(self, batch: Batch) -> list[uuid.UUID]:
+        """Delete the route."""
+        route = batch.get_route(self.route_id)
+        batch.routes.remove(route)
+        return [route.id]
+
+
+class DeleteRoutesOperation(Operation):
+    """Remove all routes, returns IDs of the routes."""
+
+    op: Literal['delete_routes']
+
+    def apply(self, batch: Batch) -> list[uuid.UUID]:
+        """Delete all routes."""
+        deleted = [route.id for route in batch.routes]
+        batch.routes.clear()
+        return deleted
+
+
+class CreateResponseOperation(Operation):
+    """Create new response of a route, returns the route."""
+
+    op: Literal['create_response']
+    route_id: RouteReference
+    response: InputResponse
+
+    def apply(self, batch: Batch) -> Route:
+        """Add the response to the route."""
+        route = batch.edit_route(self.route_id)
+        route.responses.append(Response(**self.response.model_dump()))
+        return route
+
+
+class PatchResponseOperation(Operation):
+    """Change response of a route using JSON merge patch, returns the route."""
+
+    op: Literal['patch_response']
+    route_id: RouteReference
+    response_id: uuid.UUID
+    patch: dict[str, Any]
+
+    def apply(self, batch: Batch) -> Route:
+        """Patch the response."""
+        route = batch.edit_route(self.route_id)
+        if response := route.get_response_by_id(self.response_id):
+            response.patch(self.patch)
+            return route
+        raise ResourceNotFoundError(f'Response "{self.response_id}" was not found in route "{route.id}".')
+
+
+class DeleteResponseOperation(Operation):
+    """Remove response of a route, returns the route."""
+
+    op: Literal['delete_response']
+    route_id: RouteReference
+    response_id: uuid.UUID
+
+    def apply(self, batch: Batch) -> Route:
+        """Delete the response."""
+        route = batch.edit_route(self.route_id)
+        if response := route.get_response_by_id(self.response_id):
+            route.responses.remove(response)
+            return route
+        raise ResourceNotFoundError(f'Response "{self.response_id}" was not found in route "{route.id}".')
+
+
+class CreateResponseValidatorOperation(Operation):
+    """Create new validator of route responses, returns the route."""
+
+    op: Literal['create_response_validator']
+    route_id: RouteReference
+    validator: InputResponseValidator
+
+    def apply(self, batch: Batch) -> Route:
+        """Add the validator to the route."""
+        route = batch.edit_route(self.route_id)
+        route.response_validators.append(ResponseValidator(**self.validator.model_dump()))
+        return route
+
+
+class DeleteResponseValidatorOperation(Operation):
+    """Remove validator of route responses, returns the route."""
+
+    op: Literal['delete_response_validator']
+    route_id: RouteReference
+    validator_id: uuid.UUID
+
+    def apply(self, batch: Batch) -> Route:
+        """Delete the validator."""
+        route = batch.edit_route(self.route_id)
+        if validator := route.get_response_validator_by_id(self.validator_id):
+            route.response_validators.remove(validator)
+            return route
+        raise ResourceNotFoundError(f'Response_validator "{self.validator_id}" was not found in route "{route.id}".')
+
+
+class CreateErrorResponseOperation(Operation):
+    """Create new error response, returns the error response."""
+
+    op: Literal['create_error_response']
+    response: InputResponse
+
+    def apply(self, batch: Batch) -> Response:
+        """Add the error response."""
+        error_response = Response(**self.response.model_dump())
+        batch.error_responses.append(error_response)
+        return error_response
+
+
+class PatchErrorResponseOperation(Operation):
+    """Change error response using JSON merge patch, returns the error response."""
+
+    op: Literal['patch_error_response']
+    response_id: uuid.UUID
+    patch: dict[str, Any]
+
+    def apply(self, batch: Batch) -> Response:
+        """Patch the error response."""
+        error_response = batch.edit_error_response(self.response_id)
+        error_response.patch(self.patch)
+        return error_response
+
+
+class DeleteErrorResponseOperation(Operation):
+    """Remove error response, returns ID of the error response."""
+
+    op: Literal['delete_error_response']
+    response_id: uuid.UUID
+
+    def apply(self, batch: Batch) -> list[uuid.UUID]:
+        """Delete the error response."""
+        batch.error_responses.remove(batch.edit_error_response(self.response_id))
+        return [self.response_id]
+
+
+BatchOperation = Annotated[
+    Union[
+        CreateRouteOperation,
+        PatchRouteOperation,
+        DeleteRouteOperation,
+        DeleteRoutesOperation,
+        CreateResponseOperation,
+        PatchResponseOperation,
+        DeleteResponseOperation,
+        CreateResponseValidatorOperation,
+        DeleteResponseValidatorOperation,
+        CreateErrorResponseOperation,
+        PatchErrorResponseOperation,
+        DeleteErrorResponseOperation,
+    ],
+    Field(discriminator='op')
+]
@@ -0,0 +1,235 @@
+"""Bulk import of routes from large JSON arrays and NDJSON streams."""
+
+from __future__ import annotations
+
+import codecs
+import json
+import string
+
+import anyio
+import pydantic
+from pydantic import BaseModel, Field
+from starlette.requests import Request
+
+from trickster.model import InputRoute, Route
+
+from typing import Any, Iterable, Iterator
+
+
+class ImportItemError(BaseModel):
+    """Error of a single imported item."""
+
+    index: int = Field(description='Position of the item in the imported document, starting from 0')
+    message: str = Field(description='Reason why the item was rejected')
+
+
+class ImportResult(BaseModel):
+    """Result of a bulk import."""
+
+    imported: int = Field(description='Number of imported items, 0 if any item was rejected')
+    errors: list[ImportItemError] = Field(default_factory=list, description='Errors of rejected items')
+
+
+class ItemsParser:
+    """Incremental parser of items of a JSON array or NDJSON document.
+
+    The format is detected from the first character, a document starting with `[` is parsed as a JSON array and any
+    other document as NDJSON. Data can be fed in chunks of any size and only the unfinished item is kept in memory.
+
+    A malformed line of NDJSON is returned as `ImportItemError` and the parsing continues with the next line.
+    A malformed JSON array can't be parsed any further, so `ValueError` is raised as soon as the malformed item is
+    received. Items longer than `MAX_ITEM_SIZE` characters are rejected the same way, so they can't fill the memory.
+    """
+
+    MAX_ITEM_SIZE = 16 * 1024 * 1024
+    _INCOMPLETE = object()
+    _LITERALS = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+    def __init__(self) -> None:
+        self.count = 0  # Number of items parsed so far
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._scanner = json.JSONDecoder()
+        self._buffer = ''
+        self._array: bool | None = None
+        self._closed = False
+        self._expect_separator = False
+        self._retry_size = 0  # Size of the buffer needed to parse an incomplete item again
+
+    def feed(self, data: bytes, final: bool = False) -> list[Any]:
+        """Parse next chunk of data and return all items completed by it."""
+        self._buffer += self._decoder.decode(data, final)
+        if self._array is None:
+            self._buffer = self._buffer.lstrip()
+            if not self._buffer:
+                return []
+            self._array = self._buffer.startswith('[')
+            if self._array:
+                self._buffer = self._buffer[1:]
+        return self._parse_array(final) if self._array else self._parse_lines(final)
+
+    def _parse_lines(self, final: bool) -> list[Any]:
+        """Parse all complete lines of NDJSON."""
+        lines = self._buffer.split('\n')
+        self._buffer = '' if final else lines.pop()
+        if len(self._buffer) > self.MAX_ITEM_SIZE:
+            raise ValueError(f'Line {self.count} is longer than {self.MAX_ITEM_SIZE} characters.')
+        items = []
+        for line in lines:
+            if line.strip():
+                try:
+                    items.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    items.append(ImportItemError(index=self.count, message=f'Invalid json: {e}'))
+                self.count += 1
+        return items
+
+    def _parse_array(self, final: bool) -> list[Any]:
+        """Parse all complete items of JSON array."""
+        items = []
+        while (position := len(self._buffer) - len(self._buffer.lstrip())) < len(self._buffer):
+            if self._closed:
+                raise ValueError('Invalid json: Extra data after the end of the array.')
+            char = self._buffer[position]
+            if self._expect_separator or (char == ']' and not self.count):
+                self._parse_separator(char, position)
+            elif (item := self._parse_item(position, final)) is not self._INCOMPLETE:
+                items.append(item)
+            else:
+                break
+
+        if final and not self._closed:
+            raise ValueError('Invalid json: Unterminated array.')
+        return items
+
+    def _parse_separator(self, char: str, position: int) -> None:
+        """Parse delimiter of items or the end of the array."""
+        if char not in ',]':
+            raise ValueError(f'Invalid json: Expecting "," delimiter at item {self.count}.')
+        self._closed = char == ']'
+        self._expect_separator = False
+        self._buffer = self._buffer[position + 1:]
+
+    def _parse_item(self, position: int, final: bool) -> Any:
+        """Parse single item of the array, return `_INCOMPLETE` if the rest of the item wasn't received yet.
+
+        An incomplete item is parsed again only once the buffer doubles, so an item split to many chunks isn't parsed
+        from its start after each of them.
+        """
+        if not final and len(self._buffer) < self._retry_size:
+            return self._INCOMPLETE
+        try:
+            item, end = self._scanner.raw_decode(self._buffer, position)
+        except json.JSONDecodeError as e:
+            if final or not self._is_truncated(e):
+                raise ValueError(f'Invalid json: {e.msg} at item {self.count}.') from e
+            return self._wait_for_item(position)
+        if not final and (end == len(self._buffer) or self._buffer[end] in '.eE+-'):
+            return self._wait_for_item(position)  # The item may continue in the next chunk, e.g. a number "1."
+        self._retry_size = 0
+        self.count += 1
+        self._buffer = self._buffer[end:]
+        self._expect_separator = True
+        return item
+
+    def _is_truncated(self, error: json.JSONDecodeError) -> bool:
+        """Check whether the item failed to parse only because the buffer ends in the middle of it."""
+        rest = self._buffer[error.pos:]
+        if error.msg.startswith('Unterminated string'):
+            return True
+        if error.msg.startswith('Invalid \\uXXXX escape'):
+            return len(rest) < 5 and all(char in string.hexdigits for char in rest[1:])
+        return not rest or any(literal.startswith(rest) for literal in self._LITERALS)
+
+    def _wait_for_item(self, position: int) -> Any:
+        """Keep incomplete item in the buffer until more data is received, reject it if it's too long."""
+        if len(self._buffer) - position > self.MAX_ITEM_SIZE:
+            raise ValueError(f'Invalid json: Item {self.count} is longer than {self.MAX_ITEM_SIZE} characters.')
+        self._retry_size = 2 * len(self._buffer)
+        return self._INCOMPLETE
+
+
+class RouteImporter:
+    """Validates imported routes in batches, so large imports are validated without per-item overhead."""
+
+    BATCH_SIZE = 500
+    _adapter = pydantic.TypeAdapter(list[InputRoute])
+
+    def __init__(self) -> None:
+        self.routes: list[Route] = []
+        self.errors: list[ImportItemError] = []
+        self._batch: list[tuple[int, Any]] = []
+
+    def add(self, index: int, item: Any) -> None:
+        """Add parsed item, it's validated together with other items of its batch."""
+        self._batch.append((index, item))
+        if len(self._batch) >= self.BATCH_SIZE:
+            self.flush()
+
+    def add_error(self, error: ImportItemError) -> None:
+        """Add error of an item that couldn't be parsed."""
+        self.errors.append(error)
+
+    def flush(self) -> None:
+        """Validate all items of the current batch."""
+        batch, self._batch = self._batch, []
+        try:
+            input_routes = self._adapter.validate_python([item for _, item in batch])
+        except pydantic.ValidationError as e:
+            failed: dict[int, list[str]] = {}
+            for error in e.errors():
+                position, *location = error['loc']
+                failed.setdefault(int(position), []).append(_format_error(location, error['msg']))
+            for position, messages in failed.items():
+                self.add_error(ImportItemError(index=batch[position][0], message='; '.join(messages)))
+            batch = [indexed_item for position, indexed_item in enumerate(batch) if position not in failed]
+            input_routes = self._adapter.validate_python([item for _, item in batch])
+
+        for (index, _), input_route in zip(batch, input_routes, strict=True):
+            try:
+                self.routes.append(Route(**input_route.model_dump()))
+            except pydantic.ValidationError as e:
+                messages = [_format_error(error['loc'], error['msg']) for error in e.errors()]
+                self.add_error(ImportItemError(index=index, message='; '.join(messages)))
+
+    def import_chunks(self, chunks: Iterable[bytes]) -> ImportResult:
+        """Parse and validate routes from chunks of JSON array or NDJSON document."""
+        parser = ItemsParser()
+        try:
+            for chunk in chunks:
+                self._add_items(parser, parser.feed(chunk))
+            self._add_items(parser, parser.feed(b'', final=True))
+        except ValueError as e:
+            self.add_error(ImportItemError(index=parser.count, message=str(e)))
+        self.flush()
+
+        self.errors.sort(key=lambda error: error.index)
+        if self.errors:
+            self.routes = []
+        return ImportResult(imported=len(self.routes), errors=self.errors)
+
+    def _add_items(self, parser: ItemsParser, items: list[Any]) -> None:
+        """Add items returned by the parser."""
+        first_index = parser.count - len(items)
+        for index, item in enumerate(items, start=first_index):
+            if isinstance(item, ImportItemError):
+                self.add_error(item)
+            else:
+                self.add(index, item)
+
+
+def _format_error(location: Iterable[int | str], message: str) -> str:
+    """Format validation error of an item."""
+    if path := '.'.join(str(part) for part in location):
+        return f'{path}: {message}'
+    return message
+
+
+def iter_request_chunks(request: Request) -> Iterator[bytes]:
+    """Iterate over chunks of the request body from a worker thread, without reading the whole body to memory."""
+    stream = request.stream()
+
+    async def read_chunk() -> bytes | None:
+        return await anext(stream, None)
+
+    while (chunk := anyio.from_thread.run(read_chunk)) is not None:
+        yield chunk
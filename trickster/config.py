@@ -33,6 +33,14 @@ class RuntimeSettings(pydantic.BaseModel):
     error_responses: list[InputResponse] = []
 
 
+class OpenApiSource(pydantic.BaseModel):
+    """OpenApi specification routes are created from on startup."""
+
+    path: pathlib.Path = pydantic.Field(description='Path to the specification')
+    prefix: str = pydantic.Field(default='', pattern='^(/.*)?$', description='Path prefix of all routes, e.g. "/users"')
+    namespace: str | None = pydantic.Field(default=None, description='Namespace of the routes, default if not set')
+
+
 class Config(pydantic_settings.BaseSettings):
     """A main app config."""
 
@@ -40,7 +48,30 @@ class Config(pydantic_settings.BaseSettings):
 
     internal_prefix: str = '/internal'
     openapi_boostrap: pathlib.Path | None = None  # Not FilePath because we don't require the file to exist
+    openapi_specs: list[OpenApiSource] = pydantic.Field(
+        default_factory=list, description='Additional OpenApi specifications, loaded together with `openapi_boostrap`')
+    openapi_cache: pathlib.Path | None = None  # Directory with routes converted from OpenApi specifications
+    openapi_examples: bool = pydantic.Field(
+        default=False, description='Create responses of OpenApi routes from examples or schemas of the specification')
+    openapi_request_validation: bool = pydantic.Field(
+        default=False, description='Validate requests of OpenApi routes by their parameters and request bodies')
     logging: dict[str, Any] = {'version': 1}
+    journal_size: int = pydantic.Field(default=1000, ge=0, description='Max recorded requests, 0 disables journal')
+    shared_state: pathlib.Path | None = None  # SQLite database used to share state between worker processes
+    shared_hits_interval: float = pydantic.Field(default=1.0, ge=0, description='Seconds between flushes of hits')
+    snapshot_path: pathlib.Path | None = None  # File used to store snapshots of the router state
+    snapshot_interval: float = pydantic.Field(default=10.0, gt=0, description='Seconds between snapshots')
+    snapshot_load: bool = pydantic.Field(default=True, description='Restore router state from snapshot on startup')
+    reload_interval: float | None = pydantic.Field(
+        default=None, gt=0, description='Seconds between checks of changes in config and OpenApi files')
+    reaper_interval: float = pydantic.Field(
+        default=1.0, gt=0, description='Seconds between checks of expired routes and namespaces')
+    namespace_header: str = pydantic.Field(
+        default='X-Trickster-Namespace', description='Header selecting namespace of a request')
+    namespace_prefix: str | None = pydantic.Field(
+        default=None, pattern='^/', description='Path prefix selecting namespace, e.g. "/ns" for "/ns/<name>/<path>"')
+    mocked_fast_path: bool = pydantic.Field(
+        default=False, description='Answer mocked requests before FastAPI routing and dependency injection')
     settings: RuntimeSettings = pydantic.Field(default_factory=RuntimeSettings)
 
     def __hash__(self):
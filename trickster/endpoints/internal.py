@@ -2,22 +2,68 @@
 import http
 import uuid
 
+import fastapi
 import pydantic
-from fastapi import APIRouter, Depends
-
+from fastapi import APIRouter, Body, Depends, Header, Query, Request
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from typing_extensions import Annotated
+
+from trickster.batch import Batch, BatchOperation, BatchResult
+from trickster.bulk import ImportResult, RouteImporter, iter_request_chunks
+from trickster.export import ExportFormat
+from trickster.journal import JournalEntry, JournalPredicate, VerificationResult
 from trickster.model import HealthcheckStatus, InputRoute, InputResponse, InputResponseValidator
 from trickster.model import Route, Response, ResponseValidator
-from trickster.router import Router, get_router
+from trickster.metrics import get_metrics
+from trickster.namespaces import InputNamespace, Namespace, Namespaces, get_namespaces
+from trickster.namespaces import get_or_create_request_router, get_request_router
+from trickster.router import Router, format_etag, paginate
+from trickster.shared_state import InternalSharedStateRoute
+from trickster.snapshot import Snapshotter, SnapshotInfo, get_required_snapshotter, track_internal_changes
 from trickster.exceptions import ValidationError, ResourceNotFoundError
 
+from typing import Any
+
 
 router = APIRouter(
     tags=['internal'],
     responses={
         404: {'description': 'Not found'}
-    }
+    },
+    route_class=InternalSharedStateRoute,
+    dependencies=[Depends(track_internal_changes)]
 )
 
+MergePatch = Annotated[dict[str, Any], Body(media_type='application/merge-patch+json', description='JSON merge patch')]
+IfMatch = Annotated[str | None, Header(
+    description='Apply the change only if it matches ETag of the changed route, or of all routes if no route is changed'
+)]
+ReturnIds = Annotated[bool, Query(description='Return only IDs of the deleted items instead of the remaining items')]
+
+routes_adapter = pydantic.TypeAdapter(list[Route])
+
+
+def get_route_or_404(mocked_router: Router, route_id: uuid.UUID) -> Route:
+    """Get route by its ID or raise error if it doesn't exist."""
+    if route := mocked_router.get_route_by_id(route_id):
+        return route
+    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+
+
+def set_etag(http_response: fastapi.Response, version: int) -> None:
+    """Set ETag header of a response to version of a route or a router."""
+    http_response.headers['ETag'] = format_etag(version)
+
+
+def dump_routes(routes: list[Route], fields: str | None) -> bytes:
+    """Serialize routes to json, only with given comma separated fields and ID if `fields` are provided."""
+    if fields is None:
+        return routes_adapter.dump_json(routes)
+    include = {'id', *(field.strip() for field in fields.split(','))}
+    if unknown := include - Route.model_fields.keys():
+        raise ValidationError(f'Unknown fields {", ".join(sorted(unknown))}.')
+    return routes_adapter.dump_json(routes, include={'__all__': include})  # type: ignore[dict-item]
+
 
 @router.get('/healthcheck')
 def healthcheck() -> HealthcheckStatus:
@@ -25,186 +71,498 @@ def healthcheck() -> HealthcheckStatus:
     return HealthcheckStatus()
 
 
-@router.get('/routes')
-def get_routes(mocked_router: Router = Depends(get_router)) -> list[Route]:
-    """Get list of all configured routes."""
-    return mocked_router.get_routes()
+@router.get('/metrics', response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Get metrics of this process in Prometheus text format."""
+    return PlainTextResponse(get_metrics().render(), media_type='text/plain; version=0.0.4')
+
+
+@router.get('/routes', response_model=list[Route])
+def get_routes(
+    cursor: str | None = Query(default=None, description='Cursor of the next page returned with the previous page'),
+    limit: int | None = Query(default=None, ge=1, description='Maximal number of returned routes'),
+    path_prefix: str | None = Query(default=None, description='Return only routes with path starting with prefix'),
+    method: http.HTTPMethod | None = Query(default=None, description='Return only routes matching the method'),
+    tag: str | None = Query(default=None, description='Return only routes with the tag'),
+    has_hits: bool | None = Query(default=None, description='Return only routes that were or weren\'t used'),
+    fields: str | None = Query(default=None, description='Comma separated fields of routes to return'),
+    mocked_router: Router = Depends(get_request_router)
+) -> fastapi.Response:
+    """Get list of configured routes.
+
+    Without parameters, all routes are returned. If `limit` is used and there are more routes, the response contains
+    header `X-Next-Cursor` with the `cursor` of the next page. With `fields`, only given fields and ID are returned.
+    """
+    routes = mocked_router.find_routes(path_prefix, method, tag, has_hits)
+    page, next_cursor = paginate(routes, mocked_router.routes, cursor, limit)
+    headers = {'ETag': format_etag(mocked_router.version)}
+    if next_cursor:
+        headers['X-Next-Cursor'] = next_cursor
+    return fastapi.Response(dump_routes(page, fields), media_type='application/json', headers=headers)
 
 
 @router.get('/routes/{route_id}')
-def get_route(route_id: uuid.UUID, mocked_router: Router = Depends(get_router)) -> Route:
+def get_route(
+    route_id: uuid.UUID, http_response: fastapi.Response, mocked_router: Router = Depends(get_request_router)
+) -> Route:
     """Get route by its ID."""
     if route := mocked_router.get_route_by_id(route_id):
+        set_etag(http_response, route.version)
         return route
     raise ResourceNotFoundError(f'Route ID "{route_id}" was not found.')
 
 
 @router.post('/routes')
-def create_route(route: InputRoute, mocked_router: Router = Depends(get_router)) -> Route:
+def create_route(
+    route: InputRoute,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> Route:
     """Create new route."""
     try:
         new_route = Route(**route.model_dump())
         new_route.validate_existing_response_validator_combinations()
-        mocked_router.add_route(new_route)
+        with mocked_router.modify(if_match):
+            mocked_router.add_route(new_route)
+        set_etag(http_response, new_route.version)
         return new_route
     except pydantic.ValidationError as e:
         raise ValidationError() from e
 
 
+@router.patch('/routes/{route_id}')
+def patch_route(
+    route_id: uuid.UUID,
+    patch: MergePatch,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> Route:
+    """Change route using JSON merge patch.
+
+    Hits of the route and its responses are kept. Only patched fields are validated, responses are validated again
+    only if responses or validators are patched.
+    """
+    route = get_route_or_404(mocked_router, route_id)
+    try:
+        with mocked_router.modify(if_match, route):
+            route.patch(patch)
+            mocked_router.schedule_expiration(route)
+    except pydantic.ValidationError as e:
+        raise ValidationError(f'Failed validation: {str(e)}') from e
+    set_etag(http_response, route.version)
+    return route
+
+
+@router.post(
+    '/routes/import',
+    response_model=ImportResult,
+    responses={400: {'model': ImportResult, 'description': 'Some routes were rejected, no route was imported'}},
+    openapi_extra={'requestBody': {'required': True, 'content': {
+        'application/json': {'schema': {'type': 'array', 'items': {'$ref': '#/components/schemas/InputRoute'}}},
+        'application/x-ndjson': {'schema': {'$ref': '#/components/schemas/InputRoute'}},
+    }}}
+)
+def import_routes(
+    request: Request, if_match: IfMatch = None, mocked_router: Router = Depends(get_or_create_request_router)
+) -> ImportResult | JSONResponse:
+    """Create many routes at once from a JSON array or NDJSON stream of routes.
+
+    The body is parsed while it's being received and routes are validated in batches. Routes are added only if
+    all of them are valid, otherwise errors of all rejected routes are returned.
+    """
+    importer = RouteImporter()
+    result = importer.import_chunks(iter_request_chunks(request))
+    if result.errors:
+        return JSONResponse(result.model_dump(mode='json'), status_code=http.HTTPStatus.BAD_REQUEST)
+    with mocked_router.modify(if_match):
+        mocked_router.add_routes(importer.routes)
+    return result
+
+
+@router.post('/batch')
+def apply_batch(
+    operations: list[BatchOperation],
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> list[BatchResult]:
+    """Apply multiple operations in one atomic update of routes and error responses and return their results.
+
+    Operations are applied in order and routes can be referenced by index of an earlier operation that returned
+    them. Combinations of responses and validators are validated once after all operations. If any operation or
+    validation fails, nothing is changed.
+    """
+    with mocked_router.modify(if_match):
+        results = Batch(mocked_router).apply(operations)
+    set_etag(http_response, mocked_router.version)
+    return results
+
+
 @router.delete('/routes')
-def delete_routes(mocked_router: Router = Depends(get_router)) -> list[Route]:
+def delete_routes(
+    http_response: fastapi.Response,
+    return_ids: ReturnIds = False,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> list[Route] | list[uuid.UUID]:
     """Remove all configured routes.
 
     Removes also routes created from an openapi specification on startup.
     """
-    mocked_router.delete_routes()
-    return mocked_router.get_routes()
+    with mocked_router.modify(if_match):
+        deleted = [route.id for route in mocked_router.get_routes()]
+        mocked_router.delete_routes()
+    set_etag(http_response, mocked_router.version)
+    return deleted if return_ids else mocked_router.get_routes()
 
 
 @router.delete('/routes/{route_id}')
-def delete_route(route_id: uuid.UUID, mocked_router: Router = Depends(get_router)) -> list[Route]:
-    """Remove route by ID."""
-    if route := mocked_router.get_route_by_id(route_id):
+def delete_route(
+    route_id: uuid.UUID,
+    http_response: fastapi.Response,
+    return_ids: ReturnIds = False,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> list[Route] | list[uuid.UUID]:
+    """Remove route by ID, `If-Match` is compared with ETag of the route."""
+    route = get_route_or_404(mocked_router, route_id)
+    with mocked_router.modify(if_match, route):
         mocked_router.delete_route(route)
-        return mocked_router.get_routes()
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+    set_etag(http_response, mocked_router.version)
+    return [route_id] if return_ids else mocked_router.get_routes()
 
 
 @router.get('/routes/{route_id}/responses')
-def get_route_responses(route_id: uuid.UUID, mocked_router: Router = Depends(get_router)) -> list[Response]:
+def get_route_responses(
+    route_id: uuid.UUID, http_response: fastapi.Response, mocked_router: Router = Depends(get_request_router)
+) -> list[Response]:
     """Get list of all responses configured for a route."""
-    if route := mocked_router.get_route_by_id(route_id):
-        return route.responses
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+    route = get_route_or_404(mocked_router, route_id)
+    set_etag(http_response, route.version)
+    return route.responses
 
 
 @router.delete('/routes/{route_id}/responses/{response_id}')
 def delete_route_response(
-    route_id: uuid.UUID, response_id: uuid.UUID, mocked_router: Router = Depends(get_router)
+    route_id: uuid.UUID,
+    response_id: uuid.UUID,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
 ) -> Route:
     """Delete a route response."""
-    if route := mocked_router.get_route_by_id(route_id):
-        if response := route.get_response_by_id(response_id):
+    route = get_route_or_404(mocked_router, route_id)
+    if response := route.get_response_by_id(response_id):
+        with mocked_router.modify(if_match, route):
             route.responses.remove(response)
-            return route
-        raise ResourceNotFoundError(f'Response "{response_id}" was not found in route "{route_id}".')
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+        set_etag(http_response, route.version)
+        return route
+    raise ResourceNotFoundError(f'Response "{response_id}" was not found in route "{route_id}".')
+
+
+@router.patch('/routes/{route_id}/responses/{response_id}')
+def patch_route_response(
+    route_id: uuid.UUID,
+    response_id: uuid.UUID,
+    patch: MergePatch,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> Route:
+    """Change a route response using JSON merge patch.
+
+    Hits of the response are kept. If status code or body is patched, only the patched response is validated.
+    """
+    route = get_route_or_404(mocked_router, route_id)
+    if response := route.get_response_by_id(response_id):
+        try:
+            with mocked_router.modify(if_match, route):
+                response.patch(patch, route.validate_new_response)
+        except pydantic.ValidationError as e:
+            raise ValidationError(f'Failed validation: {str(e)}') from e
+        set_etag(http_response, route.version)
+        return route
+    raise ResourceNotFoundError(f'Response "{response_id}" was not found in route "{route_id}".')
 
 
 @router.delete('/routes/{route_id}/responses')
-def delete_route_responses(route_id: uuid.UUID, mocked_router: Router = Depends(get_router)) -> Route:
+def delete_route_responses(
+    route_id: uuid.UUID,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> Route:
     """Delete all responses of a route."""
-    if route := mocked_router.get_route_by_id(route_id):
+    route = get_route_or_404(mocked_router, route_id)
+    with mocked_router.modify(if_match, route):
         route.responses = []
-        return route
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+    set_etag(http_response, route.version)
+    return route
 
 
 @router.post('/routes/{route_id}/responses')
 def create_route_response(
-    route_id: uuid.UUID, response: InputResponse, mocked_router: Router = Depends(get_router)
+    route_id: uuid.UUID,
+    response: InputResponse,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
 ) -> Route:
     """Create new response for a route."""
-    if route := mocked_router.get_route_by_id(route_id):
-        try:
-            new_response = Response(**response.model_dump())
+    route = get_route_or_404(mocked_router, route_id)
+    try:
+        new_response = Response(**response.model_dump())
+        with mocked_router.modify(if_match, route):
             route.validate_new_response(new_response)
             route.responses.append(new_response)
-            return route
-        except pydantic.ValidationError as e:  # pragma: no cover
-            raise ValidationError() from e
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+    except pydantic.ValidationError as e:  # pragma: no cover
+        raise ValidationError() from e
+    set_etag(http_response, route.version)
+    return route
 
 
 @router.get('/routes/{route_id}/response_validators')
 def get_route_response_validators(
-    route_id: uuid.UUID, mocked_router: Router = Depends(get_router)
+    route_id: uuid.UUID, http_response: fastapi.Response, mocked_router: Router = Depends(get_request_router)
 ) -> list[ResponseValidator]:
     """Get validators configured for a route responses."""
-    if route := mocked_router.get_route_by_id(route_id):
-        return route.response_validators
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+    route = get_route_or_404(mocked_router, route_id)
+    set_etag(http_response, route.version)
+    return route.response_validators
 
 
 @router.delete('/routes/{route_id}/response_validators/{validator_id}')
 def delete_route_response_validator(
-    route_id: uuid.UUID, validator_id: uuid.UUID, mocked_router: Router = Depends(get_router)
+    route_id: uuid.UUID,
+    validator_id: uuid.UUID,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
 ) -> Route:
     """Remove validator configured for a route responses."""
-    if route := mocked_router.get_route_by_id(route_id):
-        if validator := route.get_response_validator_by_id(validator_id):
+    route = get_route_or_404(mocked_router, route_id)
+    if validator := route.get_response_validator_by_id(validator_id):
+        with mocked_router.modify(if_match, route):
             route.response_validators.remove(validator)
             try:
                 route.validate_existing_response_validator_combinations()
             except pydantic.ValidationError as e:  # pragma: no cover
                 route.response_validators.append(validator)
                 raise ValidationError() from e
-            return route
-        raise ResourceNotFoundError(f'Response_validator "{validator_id}" was not found in route "{route_id}".')
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+        set_etag(http_response, route.version)
+        return route
+    raise ResourceNotFoundError(f'Response_validator "{validator_id}" was not found in route "{route_id}".')
 
 
 @router.delete('/routes/{route_id}/response_validators')
-def delete_route_response_validators(route_id: uuid.UUID, mocked_router: Router = Depends(get_router)) -> Route:
+def delete_route_response_validators(
+    route_id: uuid.UUID,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> Route:
     """Remove all validators configured for a route responses."""
-    if route := mocked_router.get_route_by_id(route_id):
+    route = get_route_or_404(mocked_router, route_id)
+    with mocked_router.modify(if_match, route):
         route.response_validators = []
-        return route
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+    set_etag(http_response, route.version)
+    return route
 
 
 @router.post('/routes/{route_id}/response_validators')
 def create_route_response_validator(
-    route_id: uuid.UUID, validator: InputResponseValidator, mocked_router: Router = Depends(get_router)
+    route_id: uuid.UUID,
+    validator: InputResponseValidator,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
 ) -> Route:
     """Create new validator for route responses."""
-    if route := mocked_router.get_route_by_id(route_id):
-        try:
-            new_validator = ResponseValidator(**validator.model_dump())
+    route = get_route_or_404(mocked_router, route_id)
+    try:
+        new_validator = ResponseValidator(**validator.model_dump())
+        with mocked_router.modify(if_match, route):
             route.validate_new_response_validator(new_validator)
             route.response_validators.append(new_validator)
-            return route
-        except pydantic.ValidationError as e:  # pragma: no cover
-            raise ValidationError(f'Failed validation: {str(e)}') from e
-    raise ResourceNotFoundError(f'Route "{route_id}" was not found.')
+    except pydantic.ValidationError as e:  # pragma: no cover
+        raise ValidationError(f'Failed validation: {str(e)}') from e
+    set_etag(http_response, route.version)
+    return route
 
 
 @router.get('/settings/error_responses')
 def get_error_responses(
-    status_code: http.HTTPStatus | None = None, mocked_router: Router = Depends(get_router)
+    http_response: fastapi.Response,
+    status_code: http.HTTPStatus | None = None,
+    mocked_router: Router = Depends(get_request_router)
 ) -> list[Response]:
     """Get list of all configured error response."""
+    set_etag(http_response, mocked_router.version)
     return mocked_router.get_error_responses(status_code)
 
 
 @router.post('/settings/error_responses')
-def create_error_response(response: InputResponse, mocked_router: Router = Depends(get_router)) -> Response:
+def create_error_response(
+    response: InputResponse,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> Response:
     """Create new error response."""
     try:
         new_response = Response(**response.model_dump())
-        mocked_router.add_error_response(new_response)
-        return new_response
+        with mocked_router.modify(if_match):
+            mocked_router.add_error_response(new_response)
     except pydantic.ValidationError as e:  # pragma: no cover
         raise ValidationError(f'Failed validation: {str(e)}') from e
+    set_etag(http_response, mocked_router.version)
+    return new_response
+
+
+@router.patch('/settings/error_responses/{response_id}')
+def patch_error_response(
+    response_id: uuid.UUID,
+    patch: MergePatch,
+    http_response: fastapi.Response,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> Response:
+    """Change error response using JSON merge patch, hits of the response are kept."""
+    if error_response := mocked_router.get_error_response_by_id(response_id):
+        try:
+            with mocked_router.modify(if_match):
+                error_response.patch(patch)
+        except pydantic.ValidationError as e:
+            raise ValidationError(f'Failed validation: {str(e)}') from e
+        set_etag(http_response, mocked_router.version)
+        return error_response
+    raise ResourceNotFoundError(f'Error response "{response_id}" was not found.')
 
 
 @router.delete('/settings/error_responses')
 def delete_error_responses(
-    status_code: http.HTTPStatus | None = None, mocked_router: Router = Depends(get_router)
-) -> list[Response]:
+    http_response: fastapi.Response,
+    status_code: http.HTTPStatus | None = None,
+    return_ids: ReturnIds = False,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> list[Response] | list[uuid.UUID]:
     """Remove all configured error responses or all error responses with given status_code if provided.
 
     Removes also error responses created from configuration file on startup.
     """
-    for error_response in mocked_router.get_error_responses(status_code):
-        mocked_router.delete_error_response(error_response)
-    return mocked_router.get_error_responses(status_code)
+    with mocked_router.modify(if_match):
+        deleted = mocked_router.get_error_responses(status_code)
+        for error_response in deleted:
+            mocked_router.delete_error_response(error_response)
+    set_etag(http_response, mocked_router.version)
+    return [response.id for response in deleted] if return_ids else mocked_router.get_error_responses(status_code)
 
 
 @router.delete('/settings/error_responses/{response_id}')
-def delete_error_response(response_id: uuid.UUID, mocked_router: Router = Depends(get_router)) -> list[Response]:
+def delete_error_response(
+    response_id: uuid.UUID,
+    http_response: fastapi.Response,
+    return_ids: ReturnIds = False,
+    if_match: IfMatch = None,
+    mocked_router: Router = Depends(get_or_create_request_router)
+) -> list[Response] | list[uuid.UUID]:
     """Remove error response by its ID."""
     if error_response := mocked_router.get_error_response_by_id(response_id):
-        mocked_router.delete_error_response(error_response)
-        return mocked_router.get_error_responses()
+        with mocked_router.modify(if_match):
+            mocked_router.delete_error_response(error_response)
+        set_etag(http_response, mocked_router.version)
+        return [response_id] if return_ids else mocked_router.get_error_responses()
     raise ResourceNotFoundError(f'Error response "{response_id}" was not found.')
+
+
+@router.get('/journal')
+def get_journal(mocked_router: Router = Depends(get_request_router)) -> list[JournalEntry]:
+    """Get list of all recorded mocked requests from the oldest."""
+    return mocked_router.journal.get_entries()
+
+
+@router.delete('/journal')
+def delete_journal(mocked_router: Router = Depends(get_request_router)) -> list[JournalEntry]:
+    """Remove all recorded mocked requests."""
+    mocked_router.journal.clear()
+    return mocked_router.journal.get_entries()
+
+
+@router.get('/journal/export', response_class=StreamingResponse)
+def export_journal(
+    export_format: ExportFormat = Query(default=ExportFormat.NDJSON, alias='format'),
+    mocked_router: Router = Depends(get_request_router)
+) -> StreamingResponse:
+    """Export recorded mocked requests and their responses as NDJSON or HAR 1.2.
+
+    The export is streamed entry by entry, so the serialized document is never held in memory as a whole.
+    """
+    return StreamingResponse(
+        export_format.export(mocked_router.journal.get_entries()),
+        media_type=export_format.media_type,
+        headers={'Content-Disposition': f'attachment; filename="journal.{export_format.value}"'}
+    )
+
+
+@router.post('/journal/verify')
+def verify_journal(
+    predicate: JournalPredicate, mocked_router: Router = Depends(get_request_router)
+) -> VerificationResult:
+    """Verify that mocked requests matching the predicate were recorded expected number of times.
+
+    If the verification fails, the result contains recorded requests that were the closest to the predicate.
+    """
+    return predicate.compile().verify(mocked_router.journal)
+
+
+@router.post('/snapshot')
+def create_snapshot(
+    namespaces: Namespaces = Depends(get_namespaces), snapshotter: Snapshotter = Depends(get_required_snapshotter)
+) -> SnapshotInfo:
+    """Store snapshot of routes, their responses, validators and counters and error responses of all namespaces."""
+    return snapshotter.save(namespaces)
+
+
+@router.post('/snapshot/restore')
+def restore_snapshot(
+    namespaces: Namespaces = Depends(get_namespaces),
+    snapshotter: Snapshotter = Depends(get_required_snapshotter),
+    mocked_router: Router = Depends(get_request_router)
+) -> list[Route]:
+    """Replace routes and error responses of all namespaces with the state from the stored snapshot.
+
+    Returns restored routes of the namespace of the request.
+    """
+    if snapshotter.load(namespaces):
+        return mocked_router.get_routes()
+    raise ResourceNotFoundError(f'Snapshot "{snapshotter.path}" was not found.')
+
+
+@router.get('/namespaces')
+def get_namespace_names(namespaces: Namespaces = Depends(get_namespaces)) -> list[str]:
+    """Get names of all namespaces except the default one."""
+    return list(namespaces.routers)
+
+
+@router.put('/namespaces/{name}')
+def update_namespace(
+    name: str, namespace: InputNamespace, namespaces: Namespaces = Depends(get_namespaces)
+) -> Namespace:
+    """Create namespace or change its settings.
+
+    Namespace with expiration is removed with all its routes when it expires, e.g. when a test session that
+    created it crashed before cleaning up.
+    """
+    namespace_router = namespaces.set_expiration(name, namespace.get_expiration())
+    return Namespace(name=name, expires_at=namespace_router.expires_at, routes=len(namespace_router.routes))
+
+
+@router.delete('/namespaces/{name}')
+def delete_namespace(name: str, namespaces: Namespaces = Depends(get_namespaces)) -> list[str]:
+    """Remove namespace with all its routes, error responses and journal."""
+    if namespaces.delete(name):
+        return list(namespaces.routers)
+    raise ResourceNotFoundError(f'Namespace "{name}" was not found.')
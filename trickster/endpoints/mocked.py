@@ -1,40 +1,110 @@
 """Endpoints mocking client service."""
 
 import http
+import time
 
+import anyio
+import fastapi
 from fastapi import APIRouter, Request, Depends
-from fastapi.responses import JSONResponse
 
-from trickster.router import Router, get_router
+from trickster.journal import JournalEntry
+from trickster.metrics import get_metrics
+from trickster.model import RequestBody, RequestValidator, Route, Response
+from trickster.namespaces import get_request_router
+from trickster.plan import CompiledResponse, CompiledRoute
+from trickster.router import Router
+from trickster.shared_state import SharedStateRoute
+from trickster.snapshot import track_changes
 from trickster.exceptions import ResourceNotFoundError, AuthenticationError
 
 
 router = APIRouter(
     tags=['mocked'],
-    include_in_schema=False
+    include_in_schema=False,
+    route_class=SharedStateRoute,
+    dependencies=[Depends(track_changes)]
 )
 
 
-@router.api_route('/{path:path}', methods=http.HTTPMethod)  # type: ignore
-def mocked_response(request: Request, mocked_router: Router = Depends(get_router)) -> JSONResponse:
-    """All-catching route that mocks client service."""
-    response = None
+def match_route(request: Request, mocked_router: Router, body: RequestBody | None = None) -> CompiledRoute | None:
+    """Find compiled route matching the request and count its hit.
+
+    Routes with body predicates can match only if `body` is given, it's read only if such route is a candidate.
+    """
+    if compiled_route := mocked_router.match_compiled(request.method, request.path_params['path'], request, body):
+        mocked_router.count_hit(compiled_route.route)
+    return compiled_route
+
+
+def find_response(
+    request: Request, mocked_router: Router, compiled_route: CompiledRoute | None, body: bytes = b''
+) -> tuple[Route | None, CompiledResponse | None]:
+    """Find response the matched route should return and count its hit.
 
-    if match := mocked_router.match(request):  # noqa: SIM102 - nested if statements
-        match.route.hits += 1
+    `body` is used only if the route validates requests, callers read it only if `compiled_route.needs_body()`.
+    Responses to invalid requests are created for each request, so their hits are not counted.
+    """
+    if compiled_route is None:
+        error_response = mocked_router.get_error_response(status_code=http.HTTPStatus.NOT_FOUND)
+        return None, count_response(mocked_router, compile_response(error_response))
+    try:
+        compiled_route.authenticate(request)
+    except AuthenticationError:
+        error_response = getattr(compiled_route.auth, 'error_response', None) or \
+            mocked_router.get_error_response(status_code=http.HTTPStatus.UNAUTHORIZED)
+        return compiled_route.route, count_response(mocked_router, compile_response(error_response))
+    if (validator := compiled_route.request_validator) is not None:
         try:
-            match.route.authenticate(request)
-            if matched_response := match.route.get_response(match):
-                response = matched_response
-        except AuthenticationError:
-            response = getattr(match.route.auth, 'error_response', None) or \
-                mocked_router.get_error_response(status_code=http.HTTPStatus.UNAUTHORIZED)
-    elif error_response := mocked_router.get_error_response(status_code=http.HTTPStatus.NOT_FOUND):
-        response = error_response
+            validator.validate_request(request.query_params.multi_items(), body)
+        except ValueError as e:
+            return compiled_route.route, get_invalid_request_response(validator, e)
+    return compiled_route.route, count_response(mocked_router, compiled_route.select_response())
 
+
+def count_response(mocked_router: Router, response: CompiledResponse | None) -> CompiledResponse | None:
+    """Count hit of a response that is going to be returned."""
     if response is not None:
-        response.hits += 1
+        mocked_router.count_hit(response.response)
+    return response
+
+
+def get_invalid_request_response(validator: RequestValidator, error: ValueError) -> CompiledResponse:
+    """Count invalid request and create response to it."""
+    get_metrics().counter(
+        'trickster_invalid_requests_total', 'Number of mocked requests rejected by request validators'
+    ).increment()
+    body = {'error': 'Request validation error', 'reason': str(error)}
+    return CompiledResponse(Response(status_code=validator.status_code, body=body))  # type: ignore[call-arg]
+
+
+def compile_response(response: Response | None) -> CompiledResponse | None:
+    """Compile error response, error responses are rare so they are not cached."""
+    return CompiledResponse(response) if response is not None else None
+
+
+def record_request(
+    request: Request, mocked_router: Router, route: Route | None, response: Response | None, started: float
+) -> None:
+    """Record the request and its outcome into the journal."""
+    if mocked_router.journal.enabled:
+        body = anyio.from_thread.run(request.body)
+        duration = time.perf_counter() - started
+        mocked_router.journal.record(JournalEntry.from_request(request, body, route, response, duration))
+
+
+@router.api_route('/{path:path}', methods=http.HTTPMethod)  # type: ignore
+def mocked_response(request: Request, mocked_router: Router = Depends(get_request_router)) -> fastapi.Response:
+    """All-catching route that mocks client service."""
+    started = time.perf_counter()
+    request_body = RequestBody(lambda: anyio.from_thread.run(request.body))
+    compiled_route = match_route(request, mocked_router, request_body)
+    body = request_body.read() if compiled_route and compiled_route.needs_body() else b''
+    route, response = find_response(request, mocked_router, compiled_route, body)
+
+    try:
+        if response is None:
+            raise ResourceNotFoundError('No route or response was found for your request.')
         response.delay_response()
-        return response.as_fastapi_response()
-    else:
-        raise ResourceNotFoundError('No route or response was found for your request.')
+        return response.render()
+    finally:
+        record_request(request, mocked_router, route, response.response if response else None, started)
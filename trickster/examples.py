@@ -0,0 +1,117 @@
+"""Example values of json schemas used as bodies of responses created from OpenApi specifications."""
+
+from __future__ import annotations
+
+import math
+import random
+import string
+import uuid
+
+from typing import Any, Callable, Mapping
+
+
+class ExampleGenerator:
+    """Generates example value of a json schema converted from OpenApi specification.
+
+    Values are pseudo-random but deterministic, the same schema and seed always give the same example. Components
+    referenced from `$defs` use their example from `component_examples` when there is one. Objects contain all
+    their properties, only required ones deeper than `MAX_DEPTH`, so recursive schemas have finite examples.
+    """
+
+    MAX_DEPTH = 8
+    DEFINITION_REF_PREFIX = '#/$defs/'
+    STRING_FORMATS = {
+        'date-time': '2024-01-01T00:00:00Z',
+        'date': '2024-01-01',
+        'time': '00:00:00Z',
+        'email': 'user@example.com',
+        'hostname': 'example.com',
+        'ipv4': '192.0.2.1',
+        'ipv6': '2001:db8::1',
+        'uri': 'https://example.com/',
+        'url': 'https://example.com/',
+    }
+
+    def __init__(self, json_schema: dict[str, Any], seed: int, component_examples: Mapping[str, Any] | None = None):
+        self.json_schema = json_schema
+        self.definitions: dict[str, Any] = json_schema.get('$defs') or {}
+        self.component_examples = component_examples or {}
+        self.random = random.Random(seed)
+        self._generators: dict[str, Callable[[dict[str, Any], int], Any]] = {
+            'object': self._generate_object,
+            'array': self._generate_array,
+            'string': self._generate_string,
+            'integer': self._generate_integer,
+            'number': self._generate_number,
+            'boolean': lambda schema, depth: self.random.random() < 0.5,
+        }
+
+    def generate(self) -> Any:
+        """Generate example value of the json schema."""
+        return self._generate(self.json_schema, 0)
+
+    def _get_definition_name(self, schema: dict[str, Any]) -> str | None:
+        """Get name of the definition the schema refers to, `None` if the schema isn't a reference."""
+        ref = schema.get('$ref')
+        if isinstance(ref, str) and ref.startswith(self.DEFINITION_REF_PREFIX):
+            return ref[len(self.DEFINITION_REF_PREFIX):]
+        return None
+
+    def _generate(self, schema: Any, depth: int) -> Any:
+        """Generate example value of a subschema."""
+        if not isinstance(schema, dict):
+            return None
+        if (name := self._get_definition_name(schema)) is not None:
+            return self._generate_definition(name, depth)
+        if 'default' in schema:
+            return schema['default']
+        if schema.get('enum'):
+            return self.random.choice(schema['enum'])
+        if schema.get('anyOf'):
+            return self._generate(schema['anyOf'][0], depth)
+        generator = self._generators.get(schema.get('type'))  # type: ignore[arg-type]
+        return generator(schema, depth) if generator else None
+
+    def _generate_definition(self, name: str, depth: int) -> Any:
+        """Get example of a referenced component, generate it if the component doesn't have one."""
+        if name in self.component_examples:
+            return self.component_examples[name]
+        return self._generate(self.definitions.get(name), depth)
+
+    def _generate_object(self, schema: dict[str, Any], depth: int) -> dict[str, Any]:
+        """Generate example object."""
+        required = schema.get('required') or ()
+        return {
+            name: self._generate(property_schema, depth + 1)
+            for name, property_schema in (schema.get('properties') or {}).items()
+            if depth < self.MAX_DEPTH or name in required
+        }
+
+    def _generate_array(self, schema: dict[str, Any], depth: int) -> list[Any]:
+        """Generate example array with one item."""
+        return [self._generate(schema.get('items'), depth + 1)] if depth < self.MAX_DEPTH else []
+
+    def _generate_string(self, schema: dict[str, Any], depth: int) -> str:
+        """Generate example string, strings with a known format get a valid value."""
+        if schema.get('format') == 'uuid':
+            return str(uuid.UUID(int=self.random.getrandbits(128), version=4))
+        if (value := self.STRING_FORMATS.get(schema.get('format'))) is not None:  # type: ignore[arg-type]
+            return value
+        return ''.join(self.random.choices(string.ascii_lowercase, k=8))
+
+    def _get_range(self, schema: dict[str, Any]) -> tuple[float, float]:
+        """Get range of numbers allowed by the schema."""
+        minimum, maximum = schema.get('minimum'), schema.get('maximum')
+        if minimum is None:
+            minimum = 0 if maximum is None else min(0, maximum - 1000)
+        return minimum, minimum + 1000 if maximum is None else maximum
+
+    def _generate_integer(self, schema: dict[str, Any], depth: int) -> int:
+        """Generate example integer."""
+        minimum, maximum = self._get_range(schema)
+        minimum, maximum = math.ceil(minimum), math.floor(maximum)
+        return self.random.randint(minimum, max(minimum, maximum))
+
+    def _generate_number(self, schema: dict[str, Any], depth: int) -> float:
+        """Generate example number."""
+        return round(self.random.uniform(*self._get_range(schema)), 2)
@@ -6,7 +6,7 @@ import jsonschema
 
 from typing import Any, Callable, Coroutine
 
-from trickster.exceptions import ValidationError, AuthenticationError, ResourceNotFoundError
+from trickster.exceptions import ValidationError, AuthenticationError, PreconditionFailedError, ResourceNotFoundError
 
 
 async def handle_general_json_error(
@@ -40,6 +40,11 @@ handle_resource_not_found_error = functools.partial(
     reason='Resource error',
     status_code=fastapi.status.HTTP_404_NOT_FOUND
 )
+handle_precondition_failed_error = functools.partial(
+    handle_general_json_error,
+    reason='Precondition error',
+    status_code=fastapi.status.HTTP_412_PRECONDITION_FAILED
+)
 
 request_error_handlers: dict[
     int | type[Exception],
@@ -51,6 +56,7 @@ request_error_handlers: dict[
     ValidationError: handle_validation_error,
     AuthenticationError: handle_authentication_error,
     ResourceNotFoundError: handle_resource_not_found_error,
+    PreconditionFailedError: handle_precondition_failed_error,
     ValueError: handle_validation_error,
     jsonschema.exceptions.ValidationError: handle_validation_error,
 }
@@ -21,3 +21,7 @@ class ResourceNotFoundError(TricksterBaseError):
 
 class AuthenticationError(TricksterBaseError):
     """Indicates that request is not authenticated properly."""
+
+
+class PreconditionFailedError(TricksterBaseError):
+    """Indicates that the resource was changed since the client has seen it."""
@@ -0,0 +1,114 @@
+"""Export of recorded traffic to formats used by other tools."""
+
+import enum
+import http
+import json
+import urllib.parse
+
+from trickster.journal import JournalEntry
+from trickster.meta import get_metadata
+
+from typing import Any, Iterable, Iterator
+
+
+class ExportFormat(enum.Enum):
+    """Format of exported traffic.
+
+    - `NDJSON`: One journal entry as json per line
+    - `HAR`: HTTP Archive 1.2 document
+    """
+
+    NDJSON = 'ndjson'
+    HAR = 'har'
+
+    @property
+    def media_type(self) -> str:
+        """Get media type of the exported document."""
+        match self:
+            case ExportFormat.NDJSON:
+                return 'application/x-ndjson'
+            case ExportFormat.HAR:
+                return 'application/json'
+            case _:  # pragma: no cover
+                raise ValueError(f'Media type for {self.value} is not configured.')
+
+    def export(self, entries: Iterable[JournalEntry]) -> Iterator[str]:
+        """Export entries in this format chunk by chunk."""
+        match self:
+            case ExportFormat.NDJSON:
+                return iter_ndjson(entries)
+            case ExportFormat.HAR:
+                return iter_har(entries)
+            case _:  # pragma: no cover
+                raise ValueError(f'Export to {self.value} is not configured.')
+
+
+def iter_ndjson(entries: Iterable[JournalEntry]) -> Iterator[str]:
+    """Serialize journal entries to NDJSON one line at a time."""
+    for entry in entries:
+        yield entry.model_dump_json() + '\n'
+
+
+def iter_har(entries: Iterable[JournalEntry]) -> Iterator[str]:
+    """Serialize journal entries to HAR 1.2 document one entry at a time."""
+    metadata = get_metadata()
+    creator = json.dumps({'name': metadata.name, 'version': metadata.version})
+    yield f'{{"log":{{"version":"1.2","creator":{creator},"entries":['
+    for index, entry in enumerate(entries):
+        yield (',' if index else '') + json.dumps(to_har_entry(entry))
+    yield ']}}'
+
+
+def to_har_entry(entry: JournalEntry) -> dict[str, Any]:
+    """Convert journal entry to HAR entry."""
+    duration = entry.duration * 1000
+    return {
+        'startedDateTime': entry.timestamp.isoformat(),
+        'time': duration,
+        'request': _to_har_request(entry),
+        'response': _to_har_response(entry),
+        'cache': {},
+        'timings': {'send': 0, 'wait': duration, 'receive': 0},
+    }
+
+
+def _to_har_headers(headers: dict[str, str]) -> list[dict[str, str]]:
+    """Convert headers to list of HAR name-value pairs."""
+    return [{'name': name, 'value': value} for name, value in headers.items()]
+
+
+def _to_har_request(entry: JournalEntry) -> dict[str, Any]:
+    """Convert request part of journal entry to HAR request."""
+    host = entry.headers.get('host', 'localhost')
+    url = urllib.parse.urlunsplit(('http', host, entry.path, entry.query_string, ''))
+    query = urllib.parse.parse_qsl(entry.query_string, keep_blank_values=True)
+    request = {
+        'method': entry.method.value,
+        'url': url,
+        'httpVersion': 'HTTP/1.1',
+        'cookies': [],
+        'headers': _to_har_headers(entry.headers),
+        'queryString': [{'name': name, 'value': value} for name, value in query],
+        'headersSize': -1,
+        'bodySize': len(entry.body.encode()),
+    }
+    if entry.body:
+        request['postData'] = {'mimeType': entry.headers.get('content-type', ''), 'text': entry.body}
+    return request
+
+
+def _to_har_response(entry: JournalEntry) -> dict[str, Any]:
+    """Convert response part of journal entry to HAR response."""
+    text = '' if entry.response_body is None else json.dumps(entry.response_body, separators=(',', ':'))
+    size = len(text.encode())
+    return {
+        'status': entry.status_code,
+        'statusText': http.HTTPStatus(entry.status_code).phrase,
+        'httpVersion': 'HTTP/1.1',
+        'cookies': [],
+        'headers': _to_har_headers(entry.response_headers),
+        'content': {'size': size, 'mimeType': 'application/json', 'text': text},
+        'redirectURL': '',
+        'headersSize': -1,
+        'bodySize': size,
+    }
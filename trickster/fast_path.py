@@ -0,0 +1,108 @@
+"""Raw ASGI fast path answering mocked requests without FastAPI routing and dependency injection.
+
+The middleware sits in front of the FastAPI application and answers mocked requests the same way as the
+`mocked_response` endpoint: it selects the router of the request's namespace, matches compiled routes, counts hits,
+records the journal and sends the pre-rendered response directly. Requests of internal endpoints and of the API
+documentation are passed to the application.
+"""
+
+from __future__ import annotations
+
+import http
+import time
+
+import anyio
+from fastapi.concurrency import run_in_threadpool
+from starlette.requests import Request
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from trickster.config import get_config
+from trickster.exception_handler import handle_resource_not_found_error, handle_validation_error
+from trickster.exceptions import ResourceNotFoundError
+from trickster.journal import JournalEntry
+from trickster.model import RequestBody
+from trickster.endpoints.mocked import find_response, match_route
+from trickster.namespaces import get_namespaces, get_request_router
+from trickster.plan import CompiledResponse
+from trickster.router import Router
+from trickster.shared_state import get_shared_state
+from trickster.snapshot import get_snapshotter
+
+from typing import Collection
+
+
+class MockedFastPath:
+    """Answers mocked requests before they reach the FastAPI application.
+
+    Requests with paths under `passthrough_prefix`, paths in `passthrough_paths` and requests the mocked endpoint
+    doesn't accept are handled by the application.
+    """
+
+    def __init__(self, app: ASGIApp, passthrough_prefix: str, passthrough_paths: Collection[str] = ()) -> None:
+        self.app = app
+        self.passthrough_prefix = passthrough_prefix.rstrip('/')
+        self.passthrough_paths = frozenset(passthrough_paths)
+        self.methods = frozenset(method.value for method in http.HTTPMethod)
+
+    def is_passthrough(self, scope: Scope) -> bool:
+        """Check whether the request should be handled by the application."""
+        if scope['type'] != 'http' or scope['method'] not in self.methods:
+            return True
+        path = scope['path']
+        return path in self.passthrough_paths or path == self.passthrough_prefix or \
+            path.startswith(self.passthrough_prefix + '/')
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Answer mocked request or pass the request to the application."""
+        if self.is_passthrough(scope):
+            await self.app(scope, receive, send)
+            return
+
+        scope['path_params'] = {'path': scope['path']}
+        request = Request(scope, receive)
+        config = get_config()
+        try:
+            await self.handle(request, send)
+        except ValueError as e:
+            await (await handle_validation_error(request, e))(scope, receive, send)
+        finally:
+            if snapshotter := get_snapshotter(config):
+                snapshotter.mark_changed()
+
+    async def handle(self, request: Request, send: Send) -> None:
+        """Answer mocked request with up to date router state if the state is shared."""
+        config = get_config()
+        namespaces = get_namespaces(config=config)
+        if shared_state := get_shared_state(config):
+            await run_in_threadpool(shared_state.refresh, namespaces)
+        await self.respond(request, send, get_request_router(request, config, namespaces.default))
+        if shared_state and shared_state.hits_flush_due:
+            await run_in_threadpool(shared_state.flush_hits, namespaces)
+
+    async def respond(self, request: Request, send: Send, mocked_router: Router) -> None:
+        """Find, send and record response of the mocked request."""
+        started = time.perf_counter()
+        request_body = None
+        if mocked_router.needs_body(request.method, request.path_params['path'], request):
+            raw_body = await request.body()
+            request_body = RequestBody(lambda: raw_body)
+        compiled_route = match_route(request, mocked_router, request_body)
+        needs_body = compiled_route is not None and compiled_route.needs_body()
+        body = await request.body() if needs_body or mocked_router.journal.enabled else b''
+        route, response = find_response(request, mocked_router, compiled_route, body)
+        if response is not None and (delay := response.get_delay()):
+            await anyio.sleep(delay)
+        await self.send_response(request, send, response)
+        if mocked_router.journal.enabled:
+            duration = time.perf_counter() - started
+            recorded = response.response if response else None
+            mocked_router.journal.record(JournalEntry.from_request(request, body, route, recorded, duration))
+
+    @staticmethod
+    async def send_response(request: Request, send: Send, response: CompiledResponse | None) -> None:
+        """Send the response, or the not found error if there is none."""
+        if response is not None:
+            await response.send(send)
+        else:
+            error = ResourceNotFoundError('No route or response was found for your request.')
+            await (await handle_resource_not_found_error(request, error))(request.scope, request.receive, send)
@@ -0,0 +1,128 @@
+"""GraphQL requests parsed for matching routes by their operations."""
+
+from __future__ import annotations
+
+import enum
+import functools
+import re
+
+from typing import Any
+
+
+class GraphQLOperationType(enum.Enum):
+    """Type of GraphQL operation."""
+
+    QUERY = 'query'
+    MUTATION = 'mutation'
+    SUBSCRIPTION = 'subscription'
+
+
+class GraphQLOperation:
+    """Operation defined in a GraphQL document."""
+
+    __slots__ = ('operation_type', 'name')
+
+    def __init__(self, operation_type: GraphQLOperationType, name: str | None) -> None:
+        self.operation_type = operation_type
+        self.name = name
+
+
+_TOKEN_REGEX = re.compile(r'''
+    (?P<ignored>[\s,\ufeff]+|\#[^\n\r]*)
+    | (?P<string>"""(?:\\"""|[^"]|"(?!""))*"""|"(?:\\.|[^"\\\n\r])*")
+    | (?P<punctuator>\.\.\.|[!$&():=@\[\]{|}])
+    | (?P<name>[_A-Za-z][_0-9A-Za-z]*)
+    | (?P<number>-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?)
+''', re.VERBOSE)
+
+
+def _tokenize(document: str) -> list[tuple[str, str]]:
+    """Split GraphQL document to tokens, pairs of token kind and value, without whitespace and comments."""
+    tokens = []
+    position = 0
+    while position < len(document):
+        match = _TOKEN_REGEX.match(document, position)
+        if not match:
+            raise ValueError(f'Invalid GraphQL document at position {position}.')
+        if match.lastgroup != 'ignored':
+            tokens.append((match.lastgroup, match.group()))
+        position = match.end()
+    return tokens  # type: ignore[return-value]
+
+
+def _skip_selection_set(tokens: list[tuple[str, str]], position: int) -> int:
+    """Get position of the first token after the selection set starting at `position`."""
+    depth = 0
+    for index in range(position, len(tokens)):
+        if tokens[index][0] == 'punctuator':
+            depth += {'{': 1, '}': -1}.get(tokens[index][1], 0)
+            if depth == 0:
+                return index + 1
+    raise ValueError('Selection set in GraphQL document is not closed.')
+
+
+def _find_selection_set(tokens: list[tuple[str, str]], position: int) -> int:
+    """Find position of selection set of a definition, skipping its variables and directives."""
+    depth = 0
+    for index in range(position, len(tokens)):
+        kind, value = tokens[index]
+        if kind == 'punctuator':
+            if value == '{' and depth == 0:
+                return index
+            depth += {'(': 1, ')': -1}.get(value, 0)
+    raise ValueError('Definition in GraphQL document has no selection set.')
+
+
+@functools.lru_cache(maxsize=1024)
+def parse_document(document: str) -> tuple[GraphQLOperation, ...]:
+    """Parse operations defined in GraphQL document, raise `ValueError` if the document is not valid.
+
+    Only the outline of the document needed to match requests is parsed: types and names of operations, selection
+    sets and fragments are skipped. Clients send the same documents over and over, so parsed documents are cached.
+    """
+    tokens = _tokenize(document)
+    operations = []
+    position = 0
+    while position < len(tokens):
+        kind, value = tokens[position]
+        if (kind, value) == ('punctuator', '{'):
+            operations.append(GraphQLOperation(GraphQLOperationType.QUERY, None))
+        elif kind == 'name' and value in ('query', 'mutation', 'subscription', 'fragment'):
+            if value != 'fragment':
+                name_kind, name = tokens[position + 1] if position + 1 < len(tokens) else ('', '')
+                operations.append(GraphQLOperation(GraphQLOperationType(value), name if name_kind == 'name' else None))
+            position = _find_selection_set(tokens, position)
+        else:
+            raise ValueError(f'Unexpected "{value}" in GraphQL document.')
+        position = _skip_selection_set(tokens, position)
+    if not operations:
+        raise ValueError('GraphQL document has no operations.')
+    return tuple(operations)
+
+
+class GraphQLRequest:
+    """GraphQL request with the operation it executes."""
+
+    __slots__ = ('operation', 'variables')
+
+    def __init__(self, operation: GraphQLOperation, variables: dict[str, Any]) -> None:
+        self.operation = operation
+        self.variables = variables
+
+    @classmethod
+    def from_json(cls, body: Any) -> GraphQLRequest | None:
+        """Get GraphQL request from json body of a http request, `None` if it's not a valid GraphQL request.
+
+        The executed operation is the one named by `operationName`, or the only operation of the document.
+        """
+        if not isinstance(body, dict) or not isinstance(query := body.get('query'), str):
+            return None
+        if not isinstance(variables := body.get('variables') or {}, dict):
+            return None
+        try:
+            operations = parse_document(query)
+        except ValueError:
+            return None
+        if (operation_name := body.get('operationName')) is None:
+            return cls(operations[0], variables) if len(operations) == 1 else None
+        return next((cls(operation, variables) for operation in operations if operation.name == operation_name), None)
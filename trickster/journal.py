@@ -0,0 +1,292 @@
+"""Journal of mocked requests and verification of how Trickster was called."""
+
+from __future__ import annotations
+
+import collections
+import datetime
+import heapq
+import http
+import json
+import threading
+import uuid
+
+from fastapi import Request
+from pydantic import BaseModel, Field, PrivateAttr, field_validator, model_validator
+
+from trickster.jsonpath import JsonPath
+from trickster.model import ParametrizedPath, Route, Response
+
+from typing import Any, Callable, Collection
+
+
+class JournalEntry(BaseModel):
+    """Mocked request recorded by Trickster together with information about the returned response."""
+
+    id: uuid.UUID = Field(default_factory=uuid.uuid4, description='Unique identifier')  # noqa: A003
+    timestamp: datetime.datetime = Field(
+        default_factory=lambda: datetime.datetime.now(datetime.UTC), description='Time the request was received')
+    method: http.HTTPMethod = Field(description='Http method of the request')
+    path: str = Field(description='Path of the request')
+    query_string: str = Field(default='', description='Raw query string of the request')
+    headers: dict[str, str] = Field(default_factory=dict, description='Headers of the request')
+    body: str = Field(default='', description='Body of the request')
+    route_id: uuid.UUID | None = Field(default=None, description='ID of the matched route')
+    response_id: uuid.UUID | None = Field(default=None, description='ID of the returned response')
+    status_code: int = Field(description='Status code of the returned response')
+    response_headers: dict[str, str] = Field(default_factory=dict, description='Headers of the returned response')
+    response_body: dict | list | None = Field(default=None, description='Body of the returned response')
+    duration: float = Field(default=0.0, description='Time it took to handle the request in seconds')
+
+    _json_body: tuple[Any] | None = PrivateAttr(default=None)
+
+    @classmethod
+    def from_request(
+        cls, request: Request, body: bytes, route: Route | None, response: Response | None, duration: float
+    ) -> JournalEntry:
+        """Create journal entry from a mocked request and its outcome."""
+        return cls(
+            method=http.HTTPMethod(request.method),
+            path=request.url.path,
+            query_string=request.url.query,
+            headers=dict(request.headers),
+            body=body.decode(errors='replace'),
+            route_id=route.id if route else None,
+            response_id=response.id if response else None,
+            status_code=response.status_code if response else http.HTTPStatus.NOT_FOUND,
+            response_headers=response.headers if response else {},
+            response_body=response.body if response else None,
+            duration=duration
+        )
+
+    def get_json_body(self) -> Any:
+        """Get request body parsed as json, `JsonPath.MISSING` if the body is not a valid json.
+
+        The body is parsed only once, the result is cached for subsequent calls.
+        """
+        if self._json_body is None:
+            try:
+                self._json_body = (json.loads(self.body),)
+            except ValueError:
+                self._json_body = (JsonPath.MISSING,)
+        return self._json_body[0]
+
+
+class Journal:
+    """Bounded journal of recorded requests.
+
+    Apart from the list of all entries, the journal keeps indexes of entries by http method and by matched route,
+    so questions about a single route or method don't need to go through the whole journal. Once the journal is full,
+    the oldest entries are evicted from the journal and from all indexes.
+    """
+
+    def __init__(self, max_entries: int = 1000) -> None:
+        self.max_entries = max_entries
+        self._entries: collections.deque[JournalEntry] = collections.deque()
+        self._by_method: dict[http.HTTPMethod, collections.deque[JournalEntry]] = {}
+        self._by_route: dict[uuid.UUID, collections.deque[JournalEntry]] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """Check whether the journal records any requests."""
+        return self.max_entries > 0
+
+    def record(self, entry: JournalEntry) -> None:
+        """Add new entry to the journal and evict the oldest entries if the journal is full."""
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries.append(entry)
+            self._by_method.setdefault(entry.method, collections.deque()).append(entry)
+            if entry.route_id is not None:
+                self._by_route.setdefault(entry.route_id, collections.deque()).append(entry)
+            while len(self._entries) > self.max_entries:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Remove the oldest entry.
+
+        Entries are added to indexes in the same order as to the journal, so the oldest entry is always
+        the first one in its indexes too.
+        """
+        entry = self._entries.popleft()
+        self._remove_from_index(self._by_method, entry.method)
+        if entry.route_id is not None:
+            self._remove_from_index(self._by_route, entry.route_id)
+
+    @staticmethod
+    def _remove_from_index(index: dict[Any, collections.deque[JournalEntry]], key: Any) -> None:
+        """Remove the oldest entry from an index and drop the key if there are no entries left."""
+        entries = index[key]
+        entries.popleft()
+        if not entries:
+            del index[key]
+
+    def get_entries(self) -> list[JournalEntry]:
+        """Get all recorded entries from the oldest."""
+        with self._lock:
+            return list(self._entries)
+
+    def get_candidates(
+        self, method: http.HTTPMethod | None = None, route_id: uuid.UUID | None = None
+    ) -> list[JournalEntry]:
+        """Get the smallest set of entries that can contain all entries with given method and route."""
+        with self._lock:
+            candidates: Collection[JournalEntry] = self._entries
+            if method is not None:
+                candidates = self._by_method.get(method, ())
+            if route_id is not None:
+                route_entries = self._by_route.get(route_id, ())
+                if len(route_entries) < len(candidates):
+                    candidates = route_entries
+            return list(candidates)
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._entries.clear()
+            self._by_method.clear()
+            self._by_route.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class JournalPredicate(BaseModel):
+    """Conditions recorded requests must meet and how many times they are expected to be found in the journal.
+
+    If no count constraint is provided, the request is expected to be recorded at least once.
+    """
+
+    http_method: http.HTTPMethod | None = Field(default=None, description='Http method of the request')
+    path: ParametrizedPath | None = Field(default=None, description='Path pattern the request path must match')
+    route_id: uuid.UUID | None = Field(default=None, description='ID of the route the request matched')
+    headers: dict[str, str] = Field(default_factory=dict, description='Expected values of request headers')
+    body: dict[str, Any] = Field(default_factory=dict, description='Expected values in body addressed by JSONPath')
+    count: int | None = Field(default=None, ge=0, description='Exact number of expected requests')
+    min_count: int | None = Field(default=None, ge=0, description='Minimal number of expected requests')
+    max_count: int | None = Field(default=None, ge=0, description='Maximal number of expected requests')
+    near_misses: int = Field(default=5, ge=0, description='Number of closest non-matching requests to return')
+
+    @field_validator('body')
+    @classmethod
+    def validate_body(cls, value: dict[str, Any]) -> dict[str, Any]:
+        """Validate that all body conditions are valid JSONPath expressions."""
+        for expression in value:
+            JsonPath(expression)
+        return value
+
+    @model_validator(mode='after')  # type: ignore # github.com/python/mypy/issues/15620
+    @classmethod
+    def validate_model(cls, predicate: JournalPredicate) -> JournalPredicate:
+        """Validate that exact count is not combined with a range."""
+        if predicate.count is not None and (predicate.min_count is not None or predicate.max_count is not None):
+            raise ValueError('Count can\'t be combined with min_count or max_count.')
+        return predicate
+
+    def compile(self) -> CompiledJournalPredicate:  # noqa: A003
+        """Compile predicate so it can be efficiently evaluated against many journal entries."""
+        return CompiledJournalPredicate(self)
+
+
+JournalCondition = tuple[str, Callable[[JournalEntry], bool]]
+
+
+class CompiledJournalPredicate:
+    """Journal predicate converted to a list of simple checks.
+
+    All expressions in the predicate are parsed once on compilation, evaluating the predicate against a journal entry
+    only runs the checks.
+    """
+
+    __slots__ = ('http_method', 'route_id', 'min_count', 'max_count', 'near_misses', 'conditions')
+
+    def __init__(self, predicate: JournalPredicate) -> None:
+        self.http_method = predicate.http_method
+        self.route_id = predicate.route_id
+        self.near_misses = predicate.near_misses
+        self.min_count, self.max_count = self._get_count_range(predicate)
+        self.conditions = self._get_conditions(predicate)
+
+    @staticmethod
+    def _get_count_range(predicate: JournalPredicate) -> tuple[int, int | None]:
+        """Get minimal and maximal number of expected requests."""
+        if predicate.count is not None:
+            return predicate.count, predicate.count
+        if predicate.min_count is None and predicate.max_count is None:
+            return 1, None
+        return predicate.min_count or 0, predicate.max_count
+
+    @staticmethod
+    def _get_conditions(predicate: JournalPredicate) -> list[JournalCondition]:
+        """Convert predicate to a list of named checks."""
+        conditions: list[JournalCondition] = []
+        if (method := predicate.http_method) is not None:
+            conditions.append(('http_method', lambda entry: entry.method == method))
+        if (route_id := predicate.route_id) is not None:
+            conditions.append(('route_id', lambda entry: entry.route_id == route_id))
+        if predicate.path is not None:
+            conditions.append(('path', _path_condition(predicate.path)))
+        for name, value in predicate.headers.items():
+            conditions.append((f'headers.{name}', _header_condition(name.lower(), value)))
+        for expression, value in predicate.body.items():
+            conditions.append((f'body{expression[1:]}', _body_condition(JsonPath(expression), value)))
+        return conditions
+
+    def get_mismatches(self, entry: JournalEntry) -> list[str]:
+        """Get names of all conditions the entry doesn't meet."""
+        return [name for name, check in self.conditions if not check(entry)]
+
+    def matches(self, entry: JournalEntry) -> bool:
+        """Check whether the entry meets all conditions."""
+        return all(check(entry) for _, check in self.conditions)
+
+    def verify(self, journal: Journal) -> VerificationResult:
+        """Count matching entries in the journal and check the count is within expected range."""
+        candidates = journal.get_candidates(self.http_method, self.route_id)
+        count = sum(1 for entry in candidates if self.matches(entry))
+        passed = self.min_count <= count and (self.max_count is None or count <= self.max_count)
+        return VerificationResult(
+            passed=passed,
+            count=count,
+            near_misses=[] if passed else self._find_near_misses(journal)
+        )
+
+    def _find_near_misses(self, journal: Journal) -> list[NearMiss]:
+        """Find entries that don't match the predicate but meet the most conditions."""
+        misses = (NearMiss(entry=entry, mismatches=self.get_mismatches(entry)) for entry in journal.get_entries())
+        return heapq.nsmallest(
+            self.near_misses,
+            (miss for miss in misses if miss.mismatches),
+            key=lambda miss: len(miss.mismatches)
+        )
+
+
+def _path_condition(path: ParametrizedPath) -> Callable[[JournalEntry], bool]:
+    """Create check of a request path."""
+    return lambda entry: path.match_path(entry.path) is not None
+
+
+def _header_condition(name: str, value: str) -> Callable[[JournalEntry], bool]:
+    """Create check of a header value."""
+    return lambda entry: entry.headers.get(name) == value
+
+
+def _body_condition(path: JsonPath, value: Any) -> Callable[[JournalEntry], bool]:
+    """Create check of a value in json body."""
+    return lambda entry: path.resolve(entry.get_json_body()) == value
+
+
+class NearMiss(BaseModel):
+    """Recorded request that didn't match a predicate."""
+
+    entry: JournalEntry = Field(description='Recorded request')
+    mismatches: list[str] = Field(description='Conditions the request didn\'t meet')
+
+
+class VerificationResult(BaseModel):
+    """Result of verification of the journal against a predicate."""
+
+    passed: bool = Field(description='Whether the number of matching requests is within expected range')
+    count: int = Field(description='Number of matching requests')
+    near_misses: list[NearMiss] = Field(default_factory=list, description='Closest non-matching requests')
@@ -0,0 +1,98 @@
+"""Compiled JSONPath expressions used to address values in json documents."""
+
+from __future__ import annotations
+
+import re
+
+from typing import Any
+
+
+class JsonPath:
+    """JSONPath expression compiled to a sequence of lookup steps.
+
+    Only the subset of JSONPath that addresses a single value is supported: the root `$` followed by members
+    `.name` or `['name']` and array indices `[0]`, e.g. `$.items[0].id`. The expression is parsed only once,
+    resolving it against a document is then a simple walk through the document.
+    """
+
+    __slots__ = ('expression', 'steps')
+
+    _STEP_REGEX = re.compile(r"\.(?P<member>[^.\[\]'\s]+)|\[(?P<index>-?\d+)\]|\['(?P<quoted>[^']*)'\]")
+
+    MISSING: Any = object()  # Returned when the path doesn't exist in a document
+
+    def __init__(self, expression: str) -> None:
+        self.expression = expression
+        self.steps = self._parse(expression)
+
+    @classmethod
+    def _parse(cls, expression: str) -> tuple[str | int, ...]:
+        """Parse JSONPath expression to a sequence of member names and indices."""
+        if not expression.startswith('$'):
+            raise ValueError(f'JSONPath "{expression}" must start with "$".')
+
+        steps: list[str | int] = []
+        position = 1
+        while position < len(expression):
+            match = cls._STEP_REGEX.match(expression, position)
+            if not match:
+                raise ValueError(f'Invalid JSONPath "{expression}" at position {position}.')
+            if match['index'] is not None:
+                steps.append(int(match['index']))
+            else:
+                steps.append(match['member'] if match['member'] is not None else match['quoted'])
+            position = match.end()
+        return tuple(steps)
+
+    def resolve(self, document: Any) -> Any:
+        """Get value addressed by the path or `JsonPath.MISSING` if there is no such value."""
+        value = document
+        for step in self.steps:
+            if not isinstance(value, dict if isinstance(step, str) else list):
+                return self.MISSING
+            try:
+                value = value[step]
+            except (KeyError, IndexError):
+                return self.MISSING
+        return value
+
+    def __str__(self) -> str:
+        return self.expression
+
+
+class JsonPointer(JsonPath):
+    """JSON pointer compiled to a sequence of lookup steps, e.g. `/items/0/id`.
+
+    Tokens of the pointer address members of objects, or items of arrays if they are array indices. `~1` and `~0`
+    in tokens are unescaped to `/` and `~`, the empty pointer addresses the whole document.
+    """
+
+    __slots__ = ()
+
+    _INDEX_REGEX = re.compile(r'0|[1-9]\d*')
+
+    @classmethod
+    def _parse(cls, expression: str) -> tuple[str | int, ...]:
+        """Parse JSON pointer to a sequence of unescaped tokens."""
+        if expression and not expression.startswith('/'):
+            raise ValueError(f'JSON pointer "{expression}" must start with "/".')
+        return tuple(token.replace('~1', '/').replace('~0', '~') for token in expression.split('/')[1:])
+
+    def resolve(self, document: Any) -> Any:
+        """Get value addressed by the pointer or `JsonPath.MISSING` if there is no such value."""
+        value = document
+        for step in self.steps:
+            if isinstance(value, list) and self._INDEX_REGEX.fullmatch(step):  # type: ignore[arg-type]
+                step = int(step)
+            elif not isinstance(value, dict):
+                return self.MISSING
+            try:
+                value = value[step]
+            except (KeyError, IndexError):
+                return self.MISSING
+        return value
+
+
+def compile_path(expression: str) -> JsonPath:
+    """Compile JSONPath expression, or JSON pointer if the expression is empty or starts with `/`."""
+    return JsonPointer(expression) if not expression or expression.startswith('/') else JsonPath(expression)
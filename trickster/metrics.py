@@ -0,0 +1,48 @@
+"""Metrics of Trickster exposed in Prometheus text format."""
+
+from __future__ import annotations
+
+import functools
+import threading
+
+
+class Counter:
+    """Metric whose value only increases."""
+
+    def __init__(self, name: str, description: str) -> None:
+        self.name = name
+        self.description = description
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def increment(self, value: int = 1) -> None:
+        """Increase value of the counter."""
+        with self._lock:
+            self.value += value
+
+    def render(self) -> str:
+        """Render the counter in Prometheus text format."""
+        return f'# HELP {self.name} {self.description}\n# TYPE {self.name} counter\n{self.name} {self.value}\n'
+
+
+class Metrics:
+    """Metrics of this process."""
+
+    def __init__(self) -> None:
+        self.counters: dict[str, Counter] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, description: str) -> Counter:
+        """Get counter by its name, create it if it doesn't exist."""
+        with self._lock:
+            return self.counters.setdefault(name, Counter(name, description))
+
+    def render(self) -> str:
+        """Render all metrics in Prometheus text format."""
+        return ''.join(counter.render() for counter in list(self.counters.values()))
+
+
+@functools.cache
+def get_metrics() -> Metrics:
+    """Get metrics of this process."""
+    return Metrics()
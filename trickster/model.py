@@ -3,22 +3,29 @@
 from __future__ import annotations
 
 import abc
+import datetime
 import enum
 import http
+import json
 import functools
 import uuid
 import re
 import random
+import sys
 import time
 
 import jsonschema
 from typing_extensions import Annotated
-from pydantic import BaseModel, Field, model_serializer, model_validator, ConfigDict
+from pydantic import BaseModel, Field, PrivateAttr, model_serializer, model_validator, ConfigDict, ValidationInfo
+from pydantic import AfterValidator, field_validator
 from fastapi import Request
 from fastapi.responses import JSONResponse
 from trickster.exceptions import AuthenticationError
+from trickster.graphql import GraphQLOperationType, GraphQLRequest
+from trickster.jsonpath import JsonPath, compile_path
+from trickster.utils import json_equals, merge_patch
 
-from typing import Any, Literal, Union
+from typing import Any, Callable, ClassVar, Iterable, Literal, Union
 
 
 HitCounter = Annotated[int, Field(gte=0, default=0, description='Number of times route or response was used')]
@@ -26,6 +33,44 @@ JsonBody = Annotated[dict | list, Field(description='Request or response body as
 PathParams = Annotated[dict[str, Any], Field(description='Parameter parsed from a route path')]
 
 
+def get_expiration(ttl: float) -> datetime.datetime:
+    """Get time when something with time to live in seconds expires."""
+    return datetime.datetime.now(datetime.UTC) + datetime.timedelta(seconds=ttl)
+
+
+def normalize_expiration(expires_at: datetime.datetime | None) -> datetime.datetime | None:
+    """Treat time of expiration without timezone as UTC, so it can be compared with other expirations."""
+    if expires_at is not None and expires_at.tzinfo is None:
+        return expires_at.replace(tzinfo=datetime.UTC)
+    return expires_at
+
+
+ExpirationTime = Annotated[datetime.datetime | None, AfterValidator(normalize_expiration)]
+
+
+def get_patched_fields(model: BaseModel, input_model: type[BaseModel], patch: dict[str, Any]) -> dict[str, Any]:
+    """Apply JSON merge patch to fields of a model and get validated values of the patched fields.
+
+    Only patched fields and fields required by the input model are validated again.
+    """
+    if unknown := patch.keys() - input_model.model_fields.keys():
+        raise ValueError(f'Unknown fields {", ".join(sorted(unknown))}.')
+    required = {name for name, field in input_model.model_fields.items() if field.is_required()}
+    current = model.model_dump(include=patch.keys() | required)
+    patched = input_model.model_validate(merge_patch(current, patch))
+    return {name: getattr(patched, name) for name in patch}
+
+
+def normalize_host(host: str | None) -> str | None:
+    """Normalize host of a route to lower case, validate that it's only a host with optional port."""
+    if host is not None and (not host or any(character in host for character in '/?#@ ')):
+        raise ValueError(f'Invalid host "{host}", only host with optional port is allowed, e.g. "api.example.com".')
+    return host.lower() if host is not None else None
+
+
+RouteHost = Annotated[str | None, AfterValidator(normalize_host)]
+
+
 class ParametrizedPath(BaseModel):
     """URL path that can match path of mocked request.
 
@@ -45,7 +90,7 @@ class ParametrizedPath(BaseModel):
     - `uuid4`: string in UUID4 format
     """
 
-    _VARIABLE_TYPE_PATTERNS = {
+    _VARIABLE_TYPE_PATTERNS: ClassVar[dict[str, str]] = {
         'integer': r'[1-9]\d*',
         'number': r'\d+(?:[\.,]\d+)?',
         'string': r'[^\\/\s?]+',
@@ -67,7 +112,7 @@ class ParametrizedPath(BaseModel):
         if not isinstance(value, str):
             raise ValueError(f'MatchablePath: string expected not {type(value)}')
         value = cls._normalize(value)
-        return {'path': value}
+        return {'path': sys.intern(value)}  # Routes of namespaces and reloaded routes often share paths
 
     @classmethod
     def _normalize(cls, value: str) -> str:
@@ -85,6 +130,11 @@ class ParametrizedPath(BaseModel):
         types_pattern = '|'.join(self._VARIABLE_TYPE_PATTERNS.keys())
         return re.compile(rf'(?P<placeholder>{{(?P<name>\w+):(?P<type>{types_pattern})}})')
 
+    @property
+    def has_variables(self) -> bool:
+        """Check whether the path contains any variables."""
+        return self.variables_regex.search(self.path) is not None
+
     @functools.cached_property
     def path_regex(self) -> re.Pattern:
         """Regular expression that can match and parse-out variables from a path."""
@@ -124,18 +174,398 @@ class ResponseValidator(BaseModel):
     status_code: http.HTTPStatus = Field(description='Status code as integer')
     json_schema: dict[str, Any] = Field(description='Json schema')
 
+    _compiled: Any = PrivateAttr(default=None)  # Validator of the json schema, compiled on first use
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> ResponseValidator:
+        """Deep copy the validator, copies share the compiled json schema."""
+        memo = {} if memo is None else memo
+        memo[id(self._compiled)] = self._compiled
+        return super().__deepcopy__(memo)
+
+    def __getstate__(self) -> dict[Any, Any]:
+        """Pickle the validator without the compiled json schema, it can't be pickled and is compiled again."""
+        state = super().__getstate__()
+        return {**state, '__pydantic_private__': {**state['__pydantic_private__'], '_compiled': None}}
+
+    def get_compiled(self, check_schema: bool = True) -> Any:
+        """Get validator of the json schema, the schema is checked and compiled when it's used for the first time.
+
+        Routes created from OpenApi specifications have validators of all operations, but only few of them are ever
+        used, so compiling them upfront would only slow down startup. Checking can be skipped by `check_schema` for
+        schemas that were already checked another way.
+        """
+        if self._compiled is None:
+            self._compiled = compile_json_schema(self.json_schema, check_schema)
+        return self._compiled
+
     def validate_response(self, response: Response) -> None:
         """Validate response against json schema."""
         if response.status_code != self.status_code:
             raise ValueError('Route response validation failed.')
         try:
-            jsonschema.validate(response.body, self.json_schema)
+            if error := jsonschema.exceptions.best_match(self.get_compiled().iter_errors(response.body)):
+                raise error
         except jsonschema.exceptions.ValidationError as e:
             raise ValueError(f'JsonSchema validation failed with message {e.message} on instance {e.instance}') from e
         except jsonschema.exceptions.SchemaError as e:
             raise ValueError(f'JsonSchema validation failed: {e.message}') from e
 
 
+class RequestValidator(BaseModel):
+    """Validator of mocked requests.
+
+    Routes with a validator respond to requests with query parameters or body not matching the json schemas with
+    an error response with `status_code`. Query parameters are validated as an object, their values are converted to
+    types of their schemas and parameters with `array` schema are lists of all their values. Body of a request is
+    read only if the validator has a body schema or requires a body.
+    """
+
+    query_schema: dict[str, Any] | None = Field(default=None, description='Json schema of query parameters')
+    body_schema: dict[str, Any] | None = Field(default=None, description='Json schema of json request body')
+    body_required: bool = Field(default=False, description='Whether requests without body are invalid')
+    status_code: http.HTTPStatus = Field(
+        default=http.HTTPStatus.BAD_REQUEST, description='Status code of responses to invalid requests')
+
+    _compiled_query: Any = PrivateAttr(default=None)  # Validator of query parameters, compiled on first use
+    _compiled_body: Any = PrivateAttr(default=None)  # Validator of request body, compiled on first use
+
+    @field_validator('status_code')
+    @classmethod
+    def validate_status_code(cls, status_code: http.HTTPStatus) -> http.HTTPStatus:
+        """Validate that invalid requests are answered with a client error."""
+        if not 400 <= status_code < 500:
+            raise ValueError('Status code of responses to invalid requests must be 4xx.')
+        return status_code
+
+    @model_validator(mode='after')  # type: ignore # github.com/python/mypy/issues/15620
+    @classmethod
+    def validate_schemas(cls, validator: RequestValidator, info: ValidationInfo) -> RequestValidator:
+        """Validate that query and body schemas are valid json schemas.
+
+        The validation is skipped for trusted data (validation context `{'trusted': True}`), e.g. state of a router
+        dumped by Trickster itself.
+        """
+        if info.context and info.context.get('trusted'):
+            return validator
+        for name, json_schema in (('query', validator.query_schema), ('body', validator.body_schema)):
+            if json_schema is not None:
+                try:
+                    jsonschema.validators.validator_for(json_schema).check_schema(json_schema)
+                except jsonschema.exceptions.SchemaError as e:
+                    raise ValueError(f'JsonSchema of {name} of the request validator is invalid: {e.message}') from e
+        return validator
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> RequestValidator:
+        """Deep copy the validator, copies share the compiled json schemas."""
+        memo = {} if memo is None else memo
+        memo[id(self._compiled_query)] = self._compiled_query
+        memo[id(self._compiled_body)] = self._compiled_body
+        return super().__deepcopy__(memo)
+
+    def __getstate__(self) -> dict[Any, Any]:
+        """Pickle the validator without the compiled json schemas."""
+        state = super().__getstate__()
+        compiled = {'_compiled_query': None, '_compiled_body': None}
+        return {**state, '__pydantic_private__': {**state['__pydantic_private__'], **compiled}}
+
+    @property
+    def needs_body(self) -> bool:
+        """Check whether validation needs body of the request."""
+        return self.body_schema is not None or self.body_required
+
+    def validate_request(self, query: Iterable[tuple[str, str]], body: bytes) -> None:
+        """Validate query parameters and body of a request, raise `ValueError` describing the violation.
+
+        Json schemas were checked when the validator was created, so they are compiled without checking them again.
+        """
+        if self.query_schema is not None:
+            if self._compiled_query is None:
+                self._compiled_query = compile_json_schema(self.query_schema, check_schema=False)
+            self._validate(self._compiled_query, self._get_query_values(query), 'query parameters')
+        if self.needs_body:
+            self._validate_body(body)
+
+    def _validate_body(self, body: bytes) -> None:
+        """Validate body of a request."""
+        if not body:
+            if self.body_required:
+                raise ValueError('Request body is missing.')
+        elif self.body_schema is not None:
+            try:
+                value = json.loads(body)
+            except ValueError as e:
+                raise ValueError(f'Request body is not a valid json: {e}') from e
+            if self._compiled_body is None:
+                self._compiled_body = compile_json_schema(self.body_schema, check_schema=False)
+            self._validate(self._compiled_body, value, 'request body')
+
+    @staticmethod
+    def _validate(compiled: Any, value: Any, name: str) -> None:
+        """Validate value by compiled json schema."""
+        if error := jsonschema.exceptions.best_match(compiled.iter_errors(value)):
+            raise ValueError(f'Invalid {name} at {error.json_path}: {error.message}')
+
+    def _get_query_values(self, query: Iterable[tuple[str, str]]) -> dict[str, Any]:
+        """Get query parameters as an object with values converted to types of their schemas."""
+        properties = (self.query_schema or {}).get('properties') or {}
+        values: dict[str, Any] = {}
+        for name, value in query:
+            schema = properties.get(name) or {}
+            if schema.get('type') == 'array':
+                values.setdefault(name, []).append(_convert_query_value(value, (schema.get('items') or {}).get('type')))
+            else:
+                values[name] = _convert_query_value(value, schema.get('type'))
+        return values
+
+
+def _convert_query_value(value: str, value_type: str | None) -> Any:
+    """Convert value of a query parameter to a type of json schema, keep the string if it can't be converted."""
+    try:
+        match value_type:
+            case 'integer':
+                return int(value)
+            case 'number':
+                return float(value)
+            case 'boolean':
+                return {'true': True, 'false': False}[value]
+    except (ValueError, KeyError):
+        pass
+    return value
+
+
+def compile_json_schema(json_schema: dict[str, Any], check_schema: bool = True) -> Any:
+    """Compile validator of a json schema, the schema is checked by its meta schema first unless disabled."""
+    validator_class = jsonschema.validators.validator_for(json_schema)
+    if check_schema:
+        validator_class.check_schema(json_schema)
+    return validator_class(json_schema)
+
+
+class PredicateSource(enum.Enum):
+    """Part of a request a predicate checks."""
+
+    QUERY = 'query'
+    HEADER = 'header'
+    COOKIE = 'cookie'
+
+
+class PredicateOperator(enum.Enum):
+    """Condition a predicate checks.
+
+    - `EQUALS`: Value is equal to the predicate value
+    - `REGEX`: Whole value matches the predicate value as a regular expression
+    - `PRESENT`: Value is present in the request
+    - `ABSENT`: Value is not present in the request
+    - `SCHEMA`: Value is valid by the predicate value as a json schema, only for body predicates
+    """
+
+    EQUALS = 'equals'
+    REGEX = 'regex'
+    PRESENT = 'present'
+    ABSENT = 'absent'
+    SCHEMA = 'schema'
+
+
+class RequestPredicate(BaseModel):
+    """Condition on a query parameter, header or cookie of mocked requests.
+
+    A route with predicates matches only requests satisfying all of them. Query parameters with multiple values are
+    checked by their last value, names of headers are case-insensitive and normalized to lower case.
+    """
+
+    source: PredicateSource = Field(description='Part of the request the predicate checks')
+    name: str = Field(description='Name of the query parameter, header or cookie')
+    operator: PredicateOperator = Field(default=PredicateOperator.EQUALS, description='Condition of the predicate')
+    value: str | None = Field(default=None, description='Value compared by `equals` and `regex` operators')
+
+    _regex: re.Pattern | None = PrivateAttr(default=None)
+
+    @model_validator(mode='after')
+    def validate_value(self) -> RequestPredicate:
+        """Validate that operators comparing values have a valid value."""
+        if self.source == PredicateSource.HEADER:
+            self.name = self.name.lower()
+        if self.operator == PredicateOperator.SCHEMA:
+            raise ValueError('Only body predicates can use operator "schema".')
+        if self.operator in (PredicateOperator.EQUALS, PredicateOperator.REGEX) and self.value is None:
+            raise ValueError(f'Predicate with operator "{self.operator.value}" requires a value.')
+        if self.operator == PredicateOperator.REGEX:
+            self._regex = compile_regex(self.value)  # type: ignore[arg-type]
+        return self
+
+    def get_value(self, request: Request) -> str | None:
+        """Get value the predicate checks from a request, `None` if the request doesn't have it."""
+        return get_request_value(request, self.source, self.name)
+
+    def match(self, request: Request) -> bool:
+        """Check whether the request satisfies the predicate."""
+        value = self.get_value(request)
+        match self.operator:
+            case PredicateOperator.EQUALS:
+                return value == self.value
+            case PredicateOperator.REGEX:
+                return value is not None and self._regex.fullmatch(value) is not None  # type: ignore[union-attr]
+            case PredicateOperator.PRESENT:
+                return value is not None
+            case _:
+                return value is None
+
+
+def get_request_hosts(request: Request) -> tuple[str, ...]:
+    """Get host of a request from its `Host` header in lower case, with port and without it if it has one."""
+    authority = request.headers.get('host', '').lower()
+    host, separator, port = authority.rpartition(':')
+    return (authority, host) if separator and port.isdigit() else (authority,)
+
+
+def get_request_value(request: Request, source: PredicateSource, name: str) -> str | None:
+    """Get value of a query parameter, header or cookie of a request, `None` if the request doesn't have it."""
+    match source:
+        case PredicateSource.QUERY:
+            return request.query_params.get(name)
+        case PredicateSource.HEADER:
+            return request.headers.get(name)
+        case _:
+            return request.cookies.get(name)
+
+
+def compile_regex(pattern: str) -> re.Pattern:
+    """Compile regular expression of a predicate."""
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        raise ValueError(f'Invalid regular expression "{pattern}": {e}') from e
+
+
+class BodyPredicate(BaseModel):
+    """Condition on a value in json body of mocked requests.
+
+    The value is addressed by a JSONPath expression, e.g. `$.method`, or a JSON pointer, e.g. `/method`. A route with
+    body predicates matches only requests with a json body satisfying all of them, bodies that aren't a valid json
+    have no values. Paths, regular expressions and json schemas are compiled once.
+    """
+
+    path: str = Field(default='$', description='JSONPath expression or JSON pointer of the checked value')
+    operator: PredicateOperator = Field(default=PredicateOperator.EQUALS, description='Condition of the predicate')
+    value: Any = Field(default=None, description='Json value, regular expression or json schema of the condition')
+
+    _compiled_path: JsonPath = PrivateAttr()
+    _regex: re.Pattern | None = PrivateAttr(default=None)
+    _compiled_schema: Any = PrivateAttr(default=None)  # Validator of the json schema, compiled on first use
+
+    @model_validator(mode='after')
+    def validate_value(self) -> BodyPredicate:
+        """Validate the path and that operators comparing values have a valid value."""
+        self._compiled_path = compile_path(self.path)
+        if self.operator in (PredicateOperator.PRESENT, PredicateOperator.ABSENT):
+            return self
+        if 'value' not in self.model_fields_set:
+            raise ValueError(f'Predicate with operator "{self.operator.value}" requires a value.')
+        if self.operator == PredicateOperator.REGEX:
+            if not isinstance(self.value, str):
+                raise ValueError('Value of predicate with operator "regex" must be a string.')
+            self._regex = compile_regex(self.value)
+        elif self.operator == PredicateOperator.SCHEMA:
+            self._check_schema()
+        return self
+
+    def _check_schema(self) -> None:
+        """Check that value of the predicate is a valid json schema."""
+        if not isinstance(self.value, dict):
+            raise ValueError('Value of predicate with operator "schema" must be a json schema.')
+        try:
+            jsonschema.validators.validator_for(self.value).check_schema(self.value)
+        except jsonschema.exceptions.SchemaError as e:
+            raise ValueError(f'JsonSchema of the predicate is invalid: {e.message}') from e
+
+    def __deepcopy__(self, memo: dict[int, Any] | None = None) -> BodyPredicate:
+        """Deep copy the predicate, copies share the compiled json schema."""
+        memo = {} if memo is None else memo
+        memo[id(self._compiled_schema)] = self._compiled_schema
+        return super().__deepcopy__(memo)
+
+    def __getstate__(self) -> dict[Any, Any]:
+        """Pickle the predicate without the compiled json schema."""
+        state = super().__getstate__()
+        return {**state, '__pydantic_private__': {**state['__pydantic_private__'], '_compiled_schema': None}}
+
+    def match(self, document: Any) -> bool:
+        """Check whether json body of a request satisfies the predicate, `JsonPath.MISSING` for invalid bodies."""
+        value = self._compiled_path.resolve(document)
+        match self.operator:
+            case PredicateOperator.EQUALS:
+                return value is not JsonPath.MISSING and json_equals(value, self.value)
+            case PredicateOperator.REGEX:
+                return isinstance(value, str) and self._regex.fullmatch(value) is not None  # type: ignore[union-attr]
+            case PredicateOperator.PRESENT:
+                return value is not JsonPath.MISSING
+            case PredicateOperator.ABSENT:
+                return value is JsonPath.MISSING
+            case _:
+                if self._compiled_schema is None:
+                    self._compiled_schema = compile_json_schema(self.value, check_schema=False)
+                return value is not JsonPath.MISSING and self._compiled_schema.is_valid(value)
+
+
+class GraphQLPredicate(BaseModel):
+    """Condition on GraphQL operation executed by mocked requests.
+
+    A route with the predicate matches only GraphQL requests with json body executing an operation with the name and
+    type of the predicate, whose variables include all `variables` with equal values.
+    """
+
+    operation_name: str | None = Field(default=None, description='Name of the operation, any name if not set')
+    operation_type: GraphQLOperationType | None = Field(
+        default=None, description='Type of the operation, any type if not set')
+    variables: dict[str, Any] = Field(default_factory=dict, description='Values of variables of the operation')
+
+    def match(self, request: GraphQLRequest | None) -> bool:
+        """Check whether GraphQL request satisfies the predicate, `None` for requests that aren't GraphQL requests."""
+        if request is None:
+            return False
+        if self.operation_name is not None and request.operation.name != self.operation_name:
+            return False
+        if self.operation_type is not None and request.operation.operation_type != self.operation_type:
+            return False
+        return all(
+            name in request.variables and json_equals(request.variables[name], value)
+            for name, value in self.variables.items()
+        )
+
+
+class RequestBody:
+    """Body of a mocked request, read and parsed as json only when a route needs it and at most once."""
+
+    __slots__ = ('_read', '_body', '_json', '_graphql')
+
+    def __init__(self, read: Callable[[], bytes]) -> None:
+        self._read = read
+        self._body: bytes | None = None
+        self._json: tuple[Any] | None = None
+        self._graphql: tuple[GraphQLRequest | None] | None = None
+
+    def read(self) -> bytes:
+        """Get the body, read it on first use."""
+        if self._body is None:
+            self._body = self._read()
+        return self._body
+
+    def get_json(self) -> Any:
+        """Get the body parsed as json, `JsonPath.MISSING` if it's not a valid json, parse it on first use."""
+        if self._json is None:
+            try:
+                self._json = (json.loads(self.read()),)
+            except ValueError:
+                self._json = (JsonPath.MISSING,)
+        return self._json[0]
+
+    def get_graphql(self) -> GraphQLRequest | None:
+        """Get GraphQL request in the body, `None` if it's not a GraphQL request, parse it on first use."""
+        if self._graphql is None:
+            self._graphql = (GraphQLRequest.from_json(self.get_json()),)
+        return self._graphql[0]
+
+
 class RouteMatch(BaseModel):
     """Information from a route matching process."""
 
@@ -152,6 +582,8 @@ class ResponseDelay(BaseModel):
     seconds between these two numbers.
     """
 
+    model_config = ConfigDict(frozen=True)
+
     min_delay: float = Field(ge=0, default=0.0, description='Minimum delay')
     max_delay: float = Field(ge=0, default=0.0, description='Maximum delay')
 
@@ -189,6 +621,9 @@ class ResponseDelay(BaseModel):
         time.sleep(random.uniform(self.min_delay, self.max_delay))
 
 
+NO_DELAY = ResponseDelay()  # Delays are immutable, so responses without delay share one instance
+
+
 class Response(BaseModel):
     """User-defined response Trickster should return when a request matches a response."""
 
@@ -197,7 +632,7 @@ class Response(BaseModel):
 
     status_code: http.HTTPStatus = Field(description='Status code of the response as int')
     body: JsonBody
-    delay: ResponseDelay = ResponseDelay()
+    delay: ResponseDelay = Field(default_factory=lambda: NO_DELAY, description='Delay of the response in seconds')
     headers: dict[str, str] = Field(default_factory=dict, description='Header of the response')
     weight: float = Field(ge=0.0, default=1.0, description='Weight of the response when selecting random response')
 
@@ -213,6 +648,17 @@ class Response(BaseModel):
         """Stop program for a specified amount of time."""
         self.delay.delay_response()
 
+    def patch(self, patch: dict[str, Any], validate: Callable[[Response], None] | None = None) -> None:
+        """Apply JSON merge patch to the response, ID and hits are kept.
+
+        If status code or body is patched, the patched response is checked by `validate` before any change is made.
+        """
+        changes = get_patched_fields(self, InputResponse, patch)
+        if validate is not None and changes.keys() & {'status_code', 'body'}:
+            validate(self.model_copy(update=changes))
+        for name, value in changes.items():
+            setattr(self, name, value)
+
 
 class ResponseSelector(enum.Enum):
     """Algorithm to select response from matched route.
@@ -295,21 +741,44 @@ class Route(BaseModel):
 
     id: uuid.UUID = Field(default_factory=uuid.uuid4, description='Unique identifier')  # noqa: A003
     hits: HitCounter = 0
+    version: int = Field(default=1, description='Version of the route, incremented on each change')
 
+    host: RouteHost = Field(
+        default=None, description='Host with optional port of requests the route matches, any host if not set')
     path: ParametrizedPath
     http_methods: list[http.HTTPMethod] = Field(default=[http.HTTPMethod.GET], description='Method the route matches')
     response_validators: list[ResponseValidator] = Field(default_factory=list, description='Response validators')
+    request_validator: RequestValidator | None = Field(default=None, description='Validator of mocked requests')
+    predicates: list[RequestPredicate] = Field(
+        default_factory=list, description='Conditions on query parameters, headers and cookies of matched requests')
+    body_predicates: list[BodyPredicate] = Field(
+        default_factory=list, description='Conditions on values in json body of matched requests')
+    graphql: GraphQLPredicate | None = Field(default=None, description='Condition on GraphQL operation of requests')
     responses: list[Response] = Field(default_factory=list, description='Possible responses of the route')
     response_selector: ResponseSelector = Field(
         default=ResponseSelector.RANDOM, description='Strategy for response selection')
     auth: Union[Auth.get_subclasses()] | None = Field(default=None, discriminator='method')  # type: ignore
+    tags: list[str] = Field(default_factory=list, description='Labels used to filter routes')
+    expires_at: ExpirationTime = Field(default=None, description='Time the route is removed')
+
+    @model_validator(mode='before')
+    @classmethod
+    def convert_ttl(cls, data: Any) -> Any:
+        """Convert time to live in seconds to expiration time."""
+        if isinstance(data, dict) and data.get('ttl') is not None:
+            return {**data, 'expires_at': get_expiration(data['ttl'])}
+        return data
 
     @model_validator(mode='after')  # type: ignore # github.com/python/mypy/issues/15620
     @classmethod
-    def validate_model(cls, route: Route) -> Route:
-        """Validate that all combinations of responses and their validators are valid."""
-        for response in route.responses:
-            route.validate_new_response(response)
+    def validate_model(cls, route: Route, info: ValidationInfo) -> Route:
+        """Validate that all combinations of responses and their validators are valid.
+
+        The validation is skipped for trusted data (validation context `{'trusted': True}`), e.g. state of a router
+        dumped by Trickster itself.
+        """
+        if not (info.context and info.context.get('trusted')):
+            route.validate_existing_response_validator_combinations()
         return route
 
     def validate_existing_response_validator_combinations(self):
@@ -338,15 +807,32 @@ class Route(BaseModel):
                 return
         raise ValueError(f'Response "{response.id}" doesn\'t match ony of the configured validators.')
 
-    def match(self, request: Request) -> tuple[http.HTTPMethod, PathParams] | None:
-        """If route matches a request, return http method and path params."""
+    def match(self, request: Request, body: RequestBody | None = None) -> tuple[http.HTTPMethod, PathParams] | None:
+        """If route matches a request, return http method and path params.
+
+        Routes with body predicates or GraphQL predicate match only if the body of the request is given.
+        """
         http_method = self.match_method(http.HTTPMethod(request.method))
-        if http_method is not None:
+        if http_method is not None and self.match_host(request) and self.match_predicates(request, body):
             path_params = self.path.match_path(request.path_params['path'])
             if path_params is not None:
                 return http_method, path_params
         return None
 
+    def match_host(self, request: Request) -> bool:
+        """Check whether the request was sent to the host of the route."""
+        return self.host is None or self.host in get_request_hosts(request)
+
+    def match_predicates(self, request: Request, body: RequestBody | None = None) -> bool:
+        """Check whether the request satisfies all predicates, body predicates and GraphQL predicate of the route."""
+        if not all(predicate.match(request) for predicate in self.predicates):
+            return False
+        if not self.body_predicates and self.graphql is None:
+            return True
+        if body is None or not all(predicate.match(body.get_json()) for predicate in self.body_predicates):
+            return False
+        return self.graphql is None or self.graphql.match(body.get_graphql())
+
     def match_method(self, method: http.HTTPMethod) -> http.HTTPMethod | None:
         """Return http method if it matched configured method for this route."""
         if method in self.http_methods:
@@ -377,6 +863,26 @@ class Route(BaseModel):
         if self.auth is not None:
             self.auth.authenticate(request)
 
+    def is_expired(self, now: datetime.datetime) -> bool:
+        """Check whether the route expired before `now`."""
+        return self.expires_at is not None and self.expires_at <= now
+
+    def patch(self, patch: dict[str, Any], validate: bool = True) -> None:
+        """Apply JSON merge patch to the route, ID and hits of the route and its responses are kept.
+
+        Only patched fields are validated again, responses are validated only if responses or validators changed
+        and `validate` is set.
+        """
+        changes = get_patched_fields(self, InputRoute, patch)
+        if (ttl := changes.pop('ttl', None)) is not None:
+            changes['expires_at'] = get_expiration(ttl)
+        if 'responses' in changes:
+            changes['responses'] = [Response(**response.model_dump()) for response in changes['responses']]
+        if validate and changes.keys() & {'responses', 'response_validators'}:
+            self.model_copy(update=changes).validate_existing_response_validator_combinations()
+        for name, value in changes.items():
+            setattr(self, name, value)
+
 
 class HealthcheckStatus(BaseModel):
     """Healthcheck endpoint response schema."""
@@ -412,9 +918,24 @@ class InputResponse(BaseModel):
 class InputRoute(BaseModel):
     """User-defined route that can match request and return a response."""
 
+    host: RouteHost = None
     path: ParametrizedPath
     responses: list[InputResponse] = []
     http_methods: list[http.HTTPMethod] = [http.HTTPMethod.GET]
     response_validators: list[ResponseValidator] = []
+    request_validator: RequestValidator | None = None
+    predicates: list[RequestPredicate] = []
+    body_predicates: list[BodyPredicate] = []
+    graphql: GraphQLPredicate | None = None
     response_selector: ResponseSelector = ResponseSelector.RANDOM
     auth: Union[Auth.get_subclasses()] | None = Field(discriminator='method', default=None)  # type: ignore
+    tags: list[str] = []
+    ttl: float | None = Field(default=None, gt=0, description='Seconds until the route is removed')
+    expires_at: ExpirationTime = Field(default=None, description='Time the route is removed')
+
+    @model_validator(mode='after')
+    def validate_expiration(self) -> InputRoute:
+        """Validate that only one way of expiration is used."""
+        if self.ttl is not None and self.expires_at is not None:
+            raise ValueError('Only one of "ttl" and "expires_at" can be set.')
+        return self
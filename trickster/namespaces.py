@@ -0,0 +1,265 @@
+"""Namespaces isolating routes of different clients of one Trickster instance.
+
+Each namespace has its own router with its own routes, error responses, journal and counters, so e.g. parallel test
+runs don't clobber each other. Namespace of a request is selected by a header or optionally by a path prefix,
+requests without namespace use the default router.
+"""
+
+from __future__ import annotations
+
+import collections
+import datetime
+import functools
+import heapq
+import json
+import re
+import threading
+import uuid
+
+from fastapi import Depends, Request
+from pydantic import BaseModel, Field, model_validator
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from trickster.config import Config, get_config
+from trickster.model import ExpirationTime, get_expiration
+from trickster.router import Router, create_router, get_router
+
+from typing import Any, Iterator, Mapping
+
+
+NAMESPACE_PATTERN = re.compile(r'[A-Za-z0-9_.-]{1,64}')
+
+
+class InputNamespace(BaseModel):
+    """User-defined settings of a namespace."""
+
+    ttl: float | None = Field(default=None, gt=0, description='Seconds until the namespace is removed')
+    expires_at: ExpirationTime = Field(default=None, description='Time the namespace is removed')
+
+    @model_validator(mode='after')
+    def validate_expiration(self) -> InputNamespace:
+        """Validate that only one way of expiration is used."""
+        if self.ttl is not None and self.expires_at is not None:
+            raise ValueError('Only one of "ttl" and "expires_at" can be set.')
+        return self
+
+    def get_expiration(self) -> datetime.datetime | None:
+        """Get time the namespace is removed."""
+        return get_expiration(self.ttl) if self.ttl is not None else self.expires_at
+
+
+class Namespace(BaseModel):
+    """Information about a namespace."""
+
+    name: str = Field(description='Name of the namespace')
+    expires_at: datetime.datetime | None = Field(description='Time the namespace is removed')
+    routes: int = Field(description='Number of routes of the namespace')
+
+
+class NamespacesState(Router):
+    """Dumped state of the default router together with states of routers of all other namespaces."""
+
+    namespaces: dict[str, Router] = Field(default_factory=dict, description='Routers of namespaces by their names')
+
+
+class Namespaces:
+    """Routers of all namespaces.
+
+    Router of a namespace is created when the namespace is used for the first time and found by a single dict lookup
+    afterwards. The registry can be stored and restored as a whole, so it can be shared by multiple processes and
+    persisted in snapshots the same way as a single router.
+    """
+
+    def __init__(self, config: Config) -> None:
+        self.config = config
+        self.routers: dict[str, Router] = {}
+        self._lock = threading.Lock()
+        self._track_hits = False
+        self._expirations: list[tuple[datetime.datetime, str]] = []  # Heap of namespaces by expiration
+        self._restores = 0  # Number of times the state was restored, restored routers may keep their versions
+
+    @property
+    def default(self) -> Router:
+        """Get router of the default namespace."""
+        return get_router(config=self.config)
+
+    def get(self, name: str) -> Router:
+        """Get router of a namespace, create it if the namespace doesn't exist."""
+        if router := self.routers.get(name):
+            return router
+        self._validate_name(name)
+        with self._lock:
+            if name not in self.routers:
+                self.routers[name] = self._create_router()
+            return self.routers[name]
+
+    def lookup(self, name: str) -> Router:
+        """Get router of a namespace without creating the namespace.
+
+        If the namespace doesn't exist, a new empty router that isn't registered is returned, so requests with an
+        unknown namespace, e.g. a typo, behave as in an empty namespace without leaving the namespace behind.
+        """
+        if router := self.routers.get(name):
+            return router
+        self._validate_name(name)
+        return create_router(self.config)
+
+    @staticmethod
+    def _validate_name(name: str) -> None:
+        """Validate name of a namespace."""
+        if not NAMESPACE_PATTERN.fullmatch(name):
+            raise ValueError(f'Namespace "{name}" must be 1-64 letters, digits, ".", "_" or "-".')
+
+    def set_expiration(self, name: str, expires_at: datetime.datetime | None) -> Router:
+        """Set time the namespace is removed, create the namespace if it doesn't exist."""
+        router = self.get(name)
+        router.expires_at = expires_at
+        if expires_at is not None:
+            heapq.heappush(self._expirations, (expires_at, name))
+        return router
+
+    def has_expired(self, now: datetime.datetime) -> bool:
+        """Check whether any namespace or route of any namespace expired before `now`."""
+        if self._expirations and self._expirations[0][0] <= now:
+            return True
+        return any(
+            router.next_expiration is not None and router.next_expiration <= now for router in self.iter_routers()
+        )
+
+    def remove_expired(self, now: datetime.datetime) -> tuple[int, int]:
+        """Remove namespaces and routes that expired before `now`, return numbers of removed namespaces and routes.
+
+        Only namespaces and routes scheduled to expire are checked.
+        """
+        removed_namespaces = 0
+        while self._expirations and self._expirations[0][0] <= now:
+            name = heapq.heappop(self._expirations)[1]
+            router = self.routers.get(name)
+            if router is not None and router.expires_at is not None and router.expires_at <= now:
+                removed_namespaces += self.delete(name)
+        removed_routes = sum(
+            router.remove_expired_routes(now)
+            for router in self.iter_routers() if router.next_expiration is not None and router.next_expiration <= now
+        )
+        return removed_namespaces, removed_routes
+
+    def delete(self, name: str) -> bool:
+        """Delete namespace with all its routes, return `False` if the namespace doesn't exist."""
+        with self._lock:
+            return self.routers.pop(name, None) is not None
+
+    def _create_router(self) -> Router:
+        """Create router of a new namespace."""
+        router = create_router(self.config)
+        if self._track_hits:
+            router.track_hits()
+        return router
+
+    def iter_routers(self) -> Iterator[Router]:
+        """Iterate over routers of all namespaces including the default one."""
+        yield self.default
+        yield from list(self.routers.values())
+
+    def track_hits(self) -> None:
+        """Start keeping track of hits of all namespaces that were not collected using `pop_pending_hits` yet."""
+        self._track_hits = True
+        for router in self.iter_routers():
+            router.track_hits()
+
+    def pop_pending_hits(self) -> collections.Counter[uuid.UUID]:
+        """Get hits of all namespaces counted since the last call and start counting from zero."""
+        pending_hits: collections.Counter[uuid.UUID] = collections.Counter()
+        for router in self.iter_routers():
+            pending_hits.update(router.pop_pending_hits())
+        return pending_hits
+
+    def set_hits(self, hits: Mapping[uuid.UUID, int]) -> None:
+        """Set hit counters of routes and responses of all namespaces."""
+        for router in self.iter_routers():
+            router.set_hits(hits)
+
+    @property
+    def state_version(self) -> tuple[Any, ...]:
+        """Get versions of routers of all namespaces, they change whenever the dumped state changes."""
+        routers = tuple((name, router.state_version) for name, router in list(self.routers.items()))
+        return self._restores, self.default.state_version, routers
+
+    def dump_state(self) -> bytes:
+        """Dump state of the default router extended with states of all other namespaces.
+
+        Dumps of routers are only joined, so the state of a single router is a valid state without namespaces.
+        """
+        namespaces = b','.join(
+            json.dumps(name).encode() + b':' + router.dump_state() for name, router in list(self.routers.items())
+        )
+        return self.default.dump_state()[:-1] + b',"namespaces":{' + namespaces + b'}}'
+
+    def restore_state(self, state: bytes) -> None:
+        """Replace state of all namespaces with previously dumped state, journals of kept namespaces are kept."""
+        restored = NamespacesState.model_validate_json(state, context={'trusted': True})
+        self._restores += 1
+        self.default.replace_state(restored)
+        with self._lock:
+            routers = {}
+            for name, restored_router in restored.namespaces.items():
+                routers[name] = self.routers.get(name) or self._create_router()
+                routers[name].replace_state(restored_router)
+            self.routers = routers
+            self._expirations = [
+                (router.expires_at, name) for name, router in routers.items() if router.expires_at is not None
+            ]
+            heapq.heapify(self._expirations)
+
+
+@functools.lru_cache(typed=False)
+def get_namespaces(config: Config = Depends(get_config)) -> Namespaces:
+    """Get routers of all namespaces."""
+    return Namespaces(config)
+
+
+def get_request_router(
+    request: Request, config: Config = Depends(get_config), default_router: Router = Depends(get_router)
+) -> Router:
+    """Get router of the namespace selected by the request, the namespace isn't created if it doesn't exist."""
+    if name := request.headers.get(config.namespace_header):
+        return get_namespaces(config=config).lookup(name)
+    return default_router
+
+
+def get_or_create_request_router(
+    request: Request, config: Config = Depends(get_config), default_router: Router = Depends(get_router)
+) -> Router:
+    """Get router of the namespace selected by the request, create the namespace if it doesn't exist.
+
+    Used by internal endpoints changing routes or error responses, the only requests that create namespaces.
+    """
+    if name := request.headers.get(config.namespace_header):
+        return get_namespaces(config=config).get(name)
+    return default_router
+
+
+class NamespacePrefixMiddleware:
+    """Selects namespace by path prefix, request to `<prefix>/<namespace>/<path>` is handled as `/<path>`.
+
+    The namespace is passed to the application as the namespace header, so both ways of selecting the namespace
+    are handled the same.
+    """
+
+    def __init__(self, app: ASGIApp, prefix: str, header: str) -> None:
+        self.app = app
+        self.prefix = prefix.rstrip('/') + '/'
+        self.header = header.lower().encode('latin-1')
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Rewrite path and headers of requests with the namespace prefix."""
+        if scope['type'] == 'http' and scope['path'].startswith(self.prefix):
+            name = scope['path'][len(self.prefix):].partition('/')[0]
+            skipped = len(self.prefix) + len(name)
+            headers = [(key, value) for key, value in scope['headers'] if key != self.header]
+            scope = {
+                **scope,
+                'path': scope['path'][skipped:] or '/',
+                'raw_path': scope.get('raw_path', b'')[skipped:] or b'/',
+                'headers': [*headers, (self.header, name.encode('latin-1'))],
+            }
+        await self.app(scope, receive, send)
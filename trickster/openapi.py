@@ -1,34 +1,158 @@
 """Functionality to work with OpenApi format."""
 
+import concurrent.futures
+import functools
+import hashlib
+import itertools
+import os
 import pathlib
+import zlib
 
+import jsonschema
+import pydantic
 from openapi_parser import parse
 from openapi_parser import specification as openspec
+from prance.util import formats  # type: ignore[import]
 
-from trickster.model import Route, ResponseValidator
+from trickster.config import Config
+from trickster.examples import ExampleGenerator
+from trickster.logger import get_logger
+from trickster.meta import get_metadata
+from trickster.model import ParametrizedPath, RequestValidator, Response, Route, ResponseValidator
 from trickster.utils import remove_none_values
 
-from typing import Self, Any, cast
+from typing import Self, Any, Iterator, Sequence, cast
+
+
+class OpenApiCache:
+    """Routes converted from OpenApi specifications stored on disk.
+
+    Parsing and converting a large specification takes much longer than loading the converted routes. Routes are
+    stored in a file named by hash of the specification, Trickster version and conversion options, so a changed
+    specification or a different version of Trickster never uses stale routes. IDs and counters are not stored,
+    routes loaded from the cache get new ones the same way as newly converted routes.
+    """
+
+    _routes_adapter = pydantic.TypeAdapter(list[Route])
+    _excluded = {'__all__': {
+        'id': True,
+        'hits': True,
+        'version': True,
+        'responses': {'__all__': {'id', 'hits'}},
+        'response_validators': {'__all__': {'id'}},
+    }}
+
+    def __init__(self, directory: pathlib.Path, version: str) -> None:
+        self.directory = directory
+        self.version = version
+
+    def get_path(self, spec: bytes, examples: bool = False) -> pathlib.Path:
+        """Get path to the file with cached routes of a specification."""
+        key = hashlib.sha256(self.version.encode() + (b'\0examples\0' if examples else b'\0') + spec).hexdigest()
+        return self.directory / f'{key}.json'
+
+    def load(self, spec: bytes, examples: bool = False) -> list[Route] | None:
+        """Load cached routes of a specification, `None` if they are not cached or the cache is damaged."""
+        try:
+            data = self.get_path(spec, examples).read_bytes()
+            routes = self._routes_adapter.validate_json(data, context={'trusted': True})
+        except (OSError, ValueError):
+            return None
+        self._share_definitions(routes)
+        return routes
+
+    @staticmethod
+    def _share_definitions(routes: list[Route]) -> None:
+        """Make validators share json schemas of components again, the same way as converted routes do."""
+        definitions: dict[str, Any] = {}
+        for route in routes:
+            for validator in route.response_validators:
+                if isinstance(defs := validator.json_schema.get('$defs'), dict):
+                    validator.json_schema['$defs'] = {
+                        name: definitions.setdefault(name, definition) for name, definition in defs.items()
+                    }
+
+    def store(self, spec: bytes, routes: list[Route], examples: bool = False) -> None:
+        """Store routes converted from a specification.
+
+        The routes are written to a temporary file first, so concurrently starting workers never read partial file.
+        """
+        path = self.get_path(spec, examples)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f'.{path.name}.{os.getpid()}.tmp')
+        temporary_path.write_bytes(self._routes_adapter.dump_json(routes, exclude=self._excluded))
+        temporary_path.replace(path)
+
+
+@functools.lru_cache(typed=False)
+def get_openapi_cache(config: Config) -> OpenApiCache | None:
+    """Get cache of routes converted from OpenApi specifications if it's configured."""
+    if config.openapi_cache is None:
+        return None
+    return OpenApiCache(config.openapi_cache, get_metadata().version)
 
 
 class OpenApiSpec:
     """OpenApi specification adapter."""
 
     JSON_SCHEMA_VERSION = 'https://json-schema.org/draft/2020-12/schema'
+    COMPONENT_REF_PREFIX = '#/components/schemas/'
+    DEFINITION_REF_PREFIX = '#/$defs/'
 
-    def __init__(self, spec: openspec.Specification) -> None:
+    def __init__(self, spec: openspec.Specification, raw_spec: dict[str, Any] | None = None) -> None:
         self.spec = spec
+        self.raw_spec = raw_spec or {}  # Specification with unresolved references, used to find used components
+        self._definitions: dict[str, dict[str, Any]] = {}  # Json schemas of components by their names
+        self._definition_refs: dict[str, set[str]] = {}  # Names of components referenced by each component
+        self._component_examples: dict[str, Any] | None = None
+        self._checked_definitions: set[str] = set()  # Names of components with json schema checked by meta schema
 
     @classmethod
     def load(cls, spec_file: pathlib.Path) -> Self:
         """Load OpenApi spec from a file."""
         if spec_file.exists():
             spec = parse(str(spec_file))
-            return cls(spec)
+            return cls(spec, formats.parse_spec(spec_file.read_text(), str(spec_file)))
         else:
             # We can't rely on ParserError because openapi_parser raises the same error for any problem with parsing
             raise FileNotFoundError(f'OpenApi specification file "{spec_file}" was not found.')
 
+    @classmethod
+    def load_routes(
+        cls,
+        spec_file: pathlib.Path,
+        cache: OpenApiCache | None = None,
+        examples: bool = False,
+        request_validation: bool = False,
+    ) -> list[Route]:
+        """Load Trickster routes from OpenApi spec file, use routes from the cache if the spec was converted before.
+
+        Request validators are always converted and cached, they are removed from the routes unless
+        `request_validation` is set.
+        """
+        routes = cls._load_routes(spec_file, cache, examples)
+        if not request_validation:
+            for route in routes:
+                route.request_validator = None
+        return routes
+
+    @classmethod
+    def _load_routes(cls, spec_file: pathlib.Path, cache: OpenApiCache | None, examples: bool) -> list[Route]:
+        """Load Trickster routes from OpenApi spec file or from the cache."""
+        if cache is None:
+            return cls.load(spec_file).get_routes(examples)
+        try:
+            spec = spec_file.read_bytes()
+        except FileNotFoundError as e:
+            raise FileNotFoundError(f'OpenApi specification file "{spec_file}" was not found.') from e
+        if (routes := cache.load(spec, examples)) is None:
+            routes = cls.load(spec_file).get_routes(examples)
+            try:
+                cache.store(spec, routes, examples)
+            except OSError as e:
+                get_logger().warning(f'Routes of OpenApi specification "{spec_file}" were not cached: {e}')
+        return routes
+
     def _get_operation_method(self, operation: openspec.Operation) -> str:
         """Get http method from operation."""
         return operation.method.value.upper()
@@ -52,12 +176,16 @@ class OpenApiSpec:
             }
         return {}  # pragma: no cover
 
-    def _object_schema_to_json_schema(self, schema: openspec.Object) -> dict[str, Any]:
+    def _object_schema_to_json_schema(self, schema: openspec.Object, raw: Any) -> dict[str, Any]:
         """Create json schema from object openapi schema."""
+        raw_properties = _get_raw(raw, 'properties')
         return {
             **self._schema_to_base_json_schema(schema),
             'required': schema.required,
-            'properties': {prop.name: self._schema_to_json_schema(prop.schema) for prop in schema.properties},
+            'properties': {
+                prop.name: self._schema_to_json_schema(prop.schema, _get_raw(raw_properties, prop.name))
+                for prop in schema.properties
+            },
         }
 
     def _string_schema_to_json_schema(self, schema: openspec.String) -> dict[str, Any]:
@@ -69,11 +197,11 @@ class OpenApiSpec:
             'pattern': schema.pattern
         }
 
-    def _array_schema_to_json_schema(self, schema: openspec.Array) -> dict[str, Any]:
+    def _array_schema_to_json_schema(self, schema: openspec.Array, raw: Any) -> dict[str, Any]:
         """Create json schema from array openapi schema."""
         return {
             **self._schema_to_base_json_schema(schema),
-            'items': self._schema_to_json_schema(schema.items)
+            'items': self._schema_to_json_schema(schema.items, _get_raw(raw, 'items'))
         }
 
     def _number_schema_to_json_schema(self, schema: openspec.Number) -> dict[str, Any]:
@@ -84,54 +212,286 @@ class OpenApiSpec:
             'maximum': schema.maximum
         }
 
-    def _anyof_schema_to_json_schema(self, schema: openspec.AnyOf) -> dict[str, Any]:
+    def _anyof_schema_to_json_schema(self, schema: openspec.AnyOf, raw: Any) -> dict[str, Any]:
         """Create json schema from anyOf openapi schema."""
+        raw_schemas = _get_raw(raw, 'anyOf')
+        if not isinstance(raw_schemas, list) or len(raw_schemas) != len(schema.schemas):
+            raw_schemas = [None] * len(schema.schemas)
         return {
-            'anyOf': [self._schema_to_json_schema(item_schema) for item_schema in schema.schemas]
+            'anyOf': [
+                self._schema_to_json_schema(item_schema, raw_item)
+                for item_schema, raw_item in zip(schema.schemas, raw_schemas)
+            ]
         }
 
-    def _schema_to_json_schema(self, schema: openspec.Schema, is_root=False) -> dict[str, Any]:
-        """Recursively convert openapi schema to json schema."""
-        result = {'$schema': self.JSON_SCHEMA_VERSION} if is_root else {}
+    def _get_component_name(self, raw: Any) -> str | None:
+        """Get name of the component a raw schema refers to, `None` if the schema isn't a reference to a component."""
+        ref = _get_raw(raw, '$ref')
+        if isinstance(ref, str) and ref.startswith(self.COMPONENT_REF_PREFIX):
+            name = ref[len(self.COMPONENT_REF_PREFIX):]
+            if name in self.spec.schemas:
+                return name
+        return None
+
+    def _component_to_json_schema(self, name: str) -> dict[str, Any]:
+        """Get reference to json schema of a component, each component is converted only once."""
+        if name not in self._definitions:
+            definition = self._definitions[name] = {}  # Registered before conversion because of recursive schemas
+            raw = _get_raw(_get_raw(_get_raw(self.raw_spec, 'components'), 'schemas'), name)
+            definition.update(self._schema_to_json_schema(self.spec.schemas[name], raw))
+            self._definition_refs[name] = self._find_refs(definition)
+        return {'$ref': f'{self.DEFINITION_REF_PREFIX}{name}'}
+
+    @classmethod
+    def _find_refs(cls, json_schema: Any) -> set[str]:
+        """Find names of components referenced by json schema, references of the found components are not followed."""
+        if isinstance(json_schema, dict):
+            ref = json_schema.get('$ref')
+            if isinstance(ref, str) and ref.startswith(cls.DEFINITION_REF_PREFIX):
+                return {ref[len(cls.DEFINITION_REF_PREFIX):]}
+            return set().union(*(cls._find_refs(value) for value in json_schema.values()))
+        if isinstance(json_schema, list):
+            return set().union(*(cls._find_refs(item) for item in json_schema))
+        return set()
+
+    def _get_definitions(self, names: set[str]) -> dict[str, dict[str, Any]]:
+        """Get json schemas of components and of all components they reference."""
+        pending, found = list(names), set()
+        while pending:
+            if (name := pending.pop()) not in found:
+                found.add(name)
+                pending.extend(self._definition_refs[name])
+        return {name: self._definitions[name] for name in sorted(found)}
+
+    def _get_root_json_schema(self, schema: openspec.Schema, raw: Any) -> dict[str, Any]:
+        """Convert openapi schema of a response to json schema.
+
+        Used components are converted only once and shared by json schemas of all responses using them, json schema of
+        a response includes them as `$defs`.
+        """
+        result = {'$schema': self.JSON_SCHEMA_VERSION, **self._schema_to_json_schema(schema, raw)}
+        if names := self._find_refs(result):
+            result['$defs'] = self._get_definitions(names)
+        return result
+
+    def _schema_to_json_schema(self, schema: openspec.Schema, raw: Any = None) -> dict[str, Any]:
+        """Recursively convert openapi schema to json schema.
+
+        `raw` is the same schema with unresolved references, references to components are kept as `$ref`.
+        """
+        if (name := self._get_component_name(raw)) is not None:
+            return self._component_to_json_schema(name)
+        result: dict[str, Any] = {}
         if schema is not None:
             match schema.type:
                 case openspec.DataType.OBJECT:
-                    result.update(self._object_schema_to_json_schema(cast(openspec.Object, schema)))
+                    result.update(self._object_schema_to_json_schema(cast(openspec.Object, schema), raw))
                 case openspec.DataType.STRING:
                     result.update(self._string_schema_to_json_schema(cast(openspec.String, schema)))
                 case openspec.DataType.ARRAY:
-                    result.update(self._array_schema_to_json_schema(cast(openspec.Array, schema)))
+                    result.update(self._array_schema_to_json_schema(cast(openspec.Array, schema), raw))
                 case openspec.DataType.INTEGER | openspec.DataType.NUMBER:
                     result.update(self._number_schema_to_json_schema(cast(openspec.Number, schema)))
                 case openspec.DataType.ANY_OF:
-                    result.update(self._anyof_schema_to_json_schema((cast(openspec.AnyOf, schema))))
+                    result.update(self._anyof_schema_to_json_schema(cast(openspec.AnyOf, schema), raw))
                 case openspec.DataType.NULL | openspec.DataType.BOOLEAN:
                     result.update(self._schema_to_base_json_schema(schema))
                 case _:  # pragma: no cover
                     raise ValueError(f'Unsupported schema type {schema.type}')
         return remove_none_values(result)
 
-    def _get_response_validators_from_responses(self, responses: list[openspec.Response]) -> list[ResponseValidator]:
+    def _get_response_validators_from_responses(
+        self, responses: list[openspec.Response], raw_responses: Any
+    ) -> list[ResponseValidator]:
         """Get list of response validators."""
         validators = []
         for response in responses:
             if response.content:
+                content = response.content[0]
+                raw = _get_raw_media_type(raw_responses, response)
                 validator = ResponseValidator(
                     status_code=response.code,  # type: ignore
-                    json_schema=self._schema_to_json_schema(response.content[0].schema, is_root=True)
+                    json_schema=self._get_root_json_schema(content.schema, _get_raw(raw, 'schema'))
                 )
                 validators.append(validator)
         return validators
 
-    def get_routes(self) -> list[Route]:
-        """Get Trickster routes from OpenApi specification."""
+    def _get_component_examples(self) -> dict[str, Any]:
+        """Get first example of each component that has one."""
+        if self._component_examples is None:
+            raw_schemas = _get_raw(_get_raw(self.raw_spec, 'components'), 'schemas')
+            self._component_examples = {
+                name: examples[0] for name, raw in (raw_schemas or {}).items() if (examples := _get_examples(raw))
+            }
+        return self._component_examples
+
+    def _check_json_schema(self, json_schema: dict[str, Any]) -> bool:
+        """Check json schema of a response or a request by its meta schema.
+
+        Checking is much slower than validating, so json schemas of components are checked only once for all responses
+        using them, the rest of the json schema is checked separately.
+        """
+        validator_class = jsonschema.validators.validator_for(json_schema)
+        try:
+            validator_class.check_schema({key: value for key, value in json_schema.items() if key != '$defs'})
+            for name in json_schema.get('$defs', {}).keys() - self._checked_definitions:
+                validator_class.check_schema(self._definitions[name])
+                self._checked_definitions.add(name)
+        except jsonschema.exceptions.SchemaError:
+            return False
+        return True
+
+    def _get_example_candidates(self, raw: Any, validator: ResponseValidator, seed: int) -> Iterator[Any]:
+        """Get examples of a response in order of preference, the generated example is created only if needed."""
+        yield from _get_examples(raw)
+        raw_schema = _get_raw(raw, 'schema')
+        if (name := self._get_component_name(raw_schema)) is not None:
+            raw_schema = _get_raw(_get_raw(_get_raw(self.raw_spec, 'components'), 'schemas'), name)
+        yield from _get_examples(raw_schema)
+        yield ExampleGenerator(validator.json_schema, seed, self._get_component_examples()).generate()
+
+    def _get_example_responses(
+        self, name: str, responses: list[openspec.Response], raw_responses: Any, validators: list[ResponseValidator]
+    ) -> list[Response]:
+        """Create responses of successful status codes of an operation.
+
+        Bodies are the first valid example of the response in the specification. If there is none, a body is generated
+        from the json schema of the response, with a seed based on `name` so every start creates the same bodies.
+        """
+        created = []
+        for response, validator in zip((response for response in responses if response.content), validators):
+            if not 200 <= validator.status_code < 300 or not self._check_json_schema(validator.json_schema):
+                continue
+            validator.get_compiled(check_schema=False)
+            seed = zlib.crc32(f'{name} {validator.status_code}'.encode())
+            for body in self._get_example_candidates(_get_raw_media_type(raw_responses, response), validator, seed):
+                try:
+                    created_response = Response(status_code=validator.status_code, body=body)  # type: ignore[call-arg]
+                    validator.validate_response(created_response)
+                except ValueError:
+                    continue
+                created.append(created_response)
+                break
+        return created
+
+    def _get_query_json_schema(self, parameters: list[openspec.Parameter]) -> dict[str, Any] | None:
+        """Get json schema of query parameters as an object, `None` if there are no query parameters."""
+        query = [parameter for parameter in parameters if parameter.location == openspec.ParameterLocation.QUERY]
+        if not query:
+            return None
+        return {
+            '$schema': self.JSON_SCHEMA_VERSION,
+            'type': 'object',
+            'properties': {parameter.name: self._schema_to_json_schema(parameter.schema) for parameter in query},
+            'required': [parameter.name for parameter in query if parameter.required],
+        }
+
+    def _get_request_validator(self, operation: openspec.Operation, raw_operation: Any) -> RequestValidator | None:
+        """Get validator of requests by query parameters and json body of an operation, `None` if it has neither."""
+        query_schema = self._get_query_json_schema(operation.parameters)
+        body_schema, body_required = None, False
+        if (request_body := operation.request_body) and request_body.content:
+            content = request_body.content[0]
+            if content.type.value.endswith('json'):
+                raw = _get_raw(_get_raw(_get_raw(raw_operation, 'requestBody'), 'content'), content.type.value)
+                body_schema = self._get_root_json_schema(content.schema, _get_raw(raw, 'schema'))
+                body_required = bool(request_body.required)
+        schemas = [json_schema for json_schema in (query_schema, body_schema) if json_schema is not None]
+        if not schemas or not all(self._check_json_schema(json_schema) for json_schema in schemas):
+            return None
+        return RequestValidator.model_validate(
+            {'query_schema': query_schema, 'body_schema': body_schema, 'body_required': body_required},
+            context={'trusted': True}  # Json schemas were checked, components only once for all validators
+        )
+
+    def get_routes(self, examples: bool = False) -> list[Route]:
+        """Get Trickster routes from OpenApi specification.
+
+        If `examples` is set, routes respond with examples of their successful responses instead of error responses.
+        Routes of operations with query parameters or json request body have request validators.
+        """
         routes = []
         for path in self.spec.paths:
+            raw_path = _get_raw(_get_raw(self.raw_spec, 'paths'), path.url)
             for operation in path.operations:
+                raw_operation = _get_raw(raw_path, operation.method.value)
+                raw_responses = _get_raw(raw_operation, 'responses')
+                method = self._get_operation_method(operation)
+                validators = self._get_response_validators_from_responses(operation.responses, raw_responses)
                 route = Route(
                     path=self._get_path_and_operation_url(path, operation),  # type: ignore
-                    http_methods=[self._get_operation_method(operation)],  # type: ignore
-                    response_validators=self._get_response_validators_from_responses(operation.responses)
+                    http_methods=[method],  # type: ignore
+                    responses=self._get_example_responses(
+                        f'{method} {path.url}', operation.responses, raw_responses, validators
+                    ) if examples else [],
+                    response_validators=validators,
+                    request_validator=self._get_request_validator(operation, raw_operation),
+                    tags=operation.tags
                 )
                 routes.append(route)
         return routes
+
+
+def _get_raw(raw: Any, key: str | int) -> Any:
+    """Get item of a raw specification node, `None` if the node isn't a dict or doesn't have the item."""
+    return raw.get(key) if isinstance(raw, dict) else None
+
+
+def _get_raw_media_type(raw_responses: Any, response: openspec.Response) -> Any:
+    """Get raw node of the first media type of a response with content.
+
+    Status codes are strings in json specifications, but yaml parses unquoted status codes as integers.
+    """
+    media_type = response.content[0].type.value  # type: ignore[index]
+    raw_response = _get_raw(raw_responses, str(response.code))
+    if raw_response is None:
+        raw_response = _get_raw(raw_responses, response.code)  # type: ignore[arg-type]
+    return _get_raw(_get_raw(raw_response, 'content'), media_type)
+
+
+def _get_examples(raw: Any) -> list[Any]:
+    """Get examples of a raw media type or schema node, from both `example` and `examples`."""
+    examples = [raw['example']] if isinstance(raw, dict) and 'example' in raw else []
+    match _get_raw(raw, 'examples'):
+        case list() as values:  # Examples of a schema
+            examples.extend(values)
+        case dict() as named:  # Named example objects of a media type
+            examples.extend(item['value'] for item in named.values() if isinstance(item, dict) and 'value' in item)
+    return examples
+
+
+def load_specs_routes(
+    spec_files: Sequence[pathlib.Path],
+    prefixes: Sequence[str],
+    cache: OpenApiCache | None = None,
+    examples: bool = False,
+    request_validation: bool = False,
+) -> list[list[Route] | None]:
+    """Load routes of multiple OpenApi specifications, `None` for specifications that don't exist.
+
+    Parsing is CPU-bound, so multiple specifications are parsed by a pool of processes and loading all of them takes
+    about as long as loading the largest one. Paths of routes of each specification start with its prefix.
+    """
+    if len(spec_files) < 2:
+        return [
+            _load_spec_routes(spec_file, prefix, cache, examples, request_validation)
+            for spec_file, prefix in zip(spec_files, prefixes)
+        ]
+    with concurrent.futures.ProcessPoolExecutor(max_workers=min(len(spec_files), os.cpu_count() or 1)) as executor:
+        return list(executor.map(
+            _load_spec_routes, spec_files, prefixes, itertools.repeat(cache), itertools.repeat(examples),
+            itertools.repeat(request_validation)
+        ))
+
+
+def _load_spec_routes(
+    spec_file: pathlib.Path, prefix: str, cache: OpenApiCache | None, examples: bool, request_validation: bool
+) -> list[Route] | None:
+    """Load routes of an OpenApi specification with paths starting with the prefix."""
+    try:
+        routes = OpenApiSpec.load_routes(spec_file, cache, examples, request_validation)
+    except FileNotFoundError:
+        return None
+    for route in routes:
+        route.path = ParametrizedPath.model_validate(prefix + route.path.path)
+    return routes
@@ -0,0 +1,389 @@
+"""Compiled runtime plans of routes used to answer mocked requests.
+
+Pydantic models of routes and responses are the representation used by the internal API. Mocked requests use plain
+objects compiled from them instead, so matching and answering a request validates and allocates as little as possible.
+Routers compile their routes on first use into a `RoutePlan` and compile a route again whenever its version changes.
+"""
+
+from __future__ import annotations
+
+import collections
+import http
+import itertools
+import json
+import random
+import re
+import time
+
+import fastapi
+from starlette.requests import Request
+from starlette.types import Send
+
+from trickster.model import PredicateOperator, PredicateSource, RequestBody, Response, ResponseSelector, Route
+from trickster.model import get_request_hosts, get_request_value
+from trickster.jsonpath import JsonPath, compile_path
+from trickster.utils import get_json_key
+
+from typing import Any, Iterable
+
+
+# Bit of each http method in method masks
+METHOD_BITS: dict[str, int] = {method: 1 << index for index, method in enumerate(http.HTTPMethod)}
+_method_masks: dict[int, int] = {}  # Interned method masks, so routes with the same methods share one int object
+
+# Query parameter, header or cookie checked by predicates, path of a value in json body if the source is `BODY`
+PredicateKey = tuple[PredicateSource | str, str]
+BODY = 'body'
+GRAPHQL_OPERATION_KEY: PredicateKey = ('graphql', 'operation_name')  # Key of names of executed GraphQL operations
+IndexedRoute = tuple[int, 'CompiledRoute']  # Compiled route with its position in the router
+
+
+def get_method_mask(methods: Iterable[str]) -> int:
+    """Get bitmask of http methods."""
+    mask = 0
+    for method in methods:
+        mask |= METHOD_BITS[method]
+    return _method_masks.setdefault(mask, mask)
+
+
+class CompiledResponse:
+    """Response with pre-rendered body."""
+
+    __slots__ = ('response', 'body', 'status_code', 'headers', 'min_delay', 'max_delay', 'raw_headers')
+
+    def __init__(self, response: Response) -> None:
+        self.response = response
+        self.body = json.dumps(
+            response.body, ensure_ascii=False, allow_nan=False, indent=None, separators=(',', ':')
+        ).encode('utf-8')  # Same rendering as JSONResponse
+        self.status_code = int(response.status_code)
+        self.headers = dict(response.headers)
+        self.min_delay = response.delay.min_delay
+        self.max_delay = response.delay.max_delay
+        self.raw_headers = self.render().raw_headers
+
+    def get_delay(self) -> float:
+        """Get random delay of the response in seconds within the configured range."""
+        return random.uniform(self.min_delay, self.max_delay) if self.max_delay else 0.0
+
+    def delay_response(self) -> None:
+        """Pause the program for the configured time."""
+        if delay := self.get_delay():
+            time.sleep(delay)
+
+    def render(self) -> fastapi.Response:
+        """Create a response that can be returned by FastApi."""
+        return fastapi.Response(self.body, self.status_code, self.headers, media_type='application/json')
+
+    async def send(self, send: Send) -> None:
+        """Send the response directly to an ASGI server, with the same status, headers and body as `render`."""
+        await send({'type': 'http.response.start', 'status': self.status_code, 'headers': self.raw_headers})
+        await send({'type': 'http.response.body', 'body': self.body})
+
+
+class CompiledRoute:
+    """Route compiled for matching and answering mocked requests.
+
+    Compiled routes are kept for all routes of a router, so they are kept small: methods are an integer bitmask,
+    paths without variables are compared as strings and responses are compiled only when the route is matched.
+    """
+
+    __slots__ = (
+        'route', 'version', 'method_mask', 'path', 'path_regex', '_responses', '_cum_weights', 'selector', 'auth',
+        'request_validator', 'predicates', 'body_predicates', 'graphql', 'matches_body', 'equal_values', 'host'
+    )
+
+    def __init__(self, route: Route) -> None:
+        self.route = route
+        self.version = route.version
+        self.method_mask = get_method_mask(method.value for method in route.http_methods)
+        self.path = route.path.path
+        self.path_regex: re.Pattern | None = route.path.path_regex if route.path.has_variables else None
+        self._responses: tuple[CompiledResponse, ...] | None = None
+        self._cum_weights: tuple[float, ...] = ()
+        self.selector = route.response_selector
+        self.auth = route.auth
+        self.request_validator = route.request_validator
+        self.predicates = tuple(route.predicates)
+        self.body_predicates = tuple(route.body_predicates)
+        self.graphql = route.graphql
+        self.matches_body = bool(self.body_predicates) or self.graphql is not None
+        self.equal_values = self._get_equal_values(route)
+        self.host = route.host
+
+    @property
+    def responses(self) -> tuple[CompiledResponse, ...]:
+        """Get compiled responses of the route, compile them on first use."""
+        if self._responses is None:
+            return self.compile_responses()
+        return self._responses
+
+    def compile_responses(self) -> tuple[CompiledResponse, ...]:
+        """Compile responses of the route now instead of on first use and return them."""
+        self._cum_weights = tuple(itertools.accumulate(response.weight for response in self.route.responses))
+        self._responses = tuple(CompiledResponse(response) for response in self.route.responses)
+        return self._responses
+
+    def is_current(self, route: Route) -> bool:
+        """Check whether the compiled route is up to date with the route."""
+        return self.route is route and self.version == route.version
+
+    def match(self, method: str, path: str) -> bool:
+        """Check whether the route matches method and normalized path of a request."""
+        if not METHOD_BITS.get(method, 0) & self.method_mask:
+            return False
+        if self.path_regex is None:
+            return path == self.path
+        return self.path_regex.match(path) is not None
+
+    def match_request(self, request: Request | None, body: RequestBody | None = None) -> bool:
+        """Check whether the request satisfies all predicates, body predicates and GraphQL predicate of the route.
+
+        Routes with predicates never match when the request isn't given, routes with body predicates or GraphQL
+        predicate when the body isn't given. The body is read and parsed only if the route checks it.
+        """
+        if self.predicates and (request is None or not all(predicate.match(request) for predicate in self.predicates)):
+            return False
+        if not self.matches_body:
+            return True
+        if body is None or not all(predicate.match(body.get_json()) for predicate in self.body_predicates):
+            return False
+        return self.graphql is None or self.graphql.match(body.get_graphql())
+
+    @staticmethod
+    def _get_equal_values(route: Route) -> dict[PredicateKey, Any]:
+        """Get values `equals` predicates of the route require, by keys of the checked values.
+
+        Only scalar values in body are included, as keys by `get_json_key`, so `true` and `1` are different values.
+        """
+        values: dict[PredicateKey, Any] = {}
+        for predicate in route.predicates:
+            if predicate.operator == PredicateOperator.EQUALS:
+                values.setdefault((predicate.source, predicate.name), predicate.value)
+        for body_predicate in route.body_predicates:
+            is_scalar = not isinstance(body_predicate.value, list | dict)
+            if body_predicate.operator == PredicateOperator.EQUALS and is_scalar:
+                values.setdefault((BODY, body_predicate.path), get_json_key(body_predicate.value))
+        if route.graphql is not None and route.graphql.operation_name is not None:
+            values[GRAPHQL_OPERATION_KEY] = route.graphql.operation_name
+        return values
+
+    def authenticate(self, request: Request) -> None:
+        """Check if request is properly authenticated."""
+        if self.auth is not None:
+            self.auth.authenticate(request)
+
+    def needs_body(self) -> bool:
+        """Check whether answering a request needs its body."""
+        return self.request_validator is not None and self.request_validator.needs_body
+
+    def select_response(self) -> CompiledResponse:
+        """Select response using the response selector of the route."""
+        if not (responses := self.responses):
+            raise ValueError('No suitable response found.')
+
+        match self.selector:
+            case ResponseSelector.FIRST:
+                return responses[0]
+            case ResponseSelector.RANDOM:
+                return random.choices(responses, cum_weights=self._cum_weights, k=1)[0]
+            case ResponseSelector.BALANCED:
+                return min(responses, key=lambda compiled: compiled.response.hits)
+            case _:  # pragma: no cover
+                raise ValueError(f'Response selection algorithm for {self.selector.value} is not configured.')
+
+
+class PredicateTree:
+    """Decision tree finding the first of routes with the same path matching a request.
+
+    Each node splits its routes by the query parameter, header, cookie, value in json body or GraphQL operation name
+    that most of them require to be equal to some value, so a request is checked only against routes requiring
+    the value it has and routes that don't check the value at all. Nodes with few routes or without such values are
+    leaves whose routes are checked one by one. Adding many variants of a route that differ in predicates therefore
+    doesn't slow down matching. Body of the request is parsed only when a node splits routes by the body or a route
+    checks it.
+    """
+
+    __slots__ = ('key', 'body_path', 'first_index', 'routes', 'children', 'rest')
+
+    MAX_LEAF_SIZE = 4
+
+    def __init__(self, routes: list[IndexedRoute], used_keys: frozenset[PredicateKey] = frozenset()) -> None:
+        self.first_index = routes[0][0]
+        self.key = self._select_key(routes, used_keys)
+        self.body_path = compile_path(self.key[1]) if self.key is not None and self.key[0] == BODY else None
+        self.routes = routes if self.key is None else []
+        self.children: dict[Any, PredicateTree] = {}
+        self.rest: PredicateTree | None = None
+        if self.key is not None:
+            self._split(routes, used_keys | {self.key})
+
+    @classmethod
+    def _select_key(cls, routes: list[IndexedRoute], used_keys: frozenset[PredicateKey]) -> PredicateKey | None:
+        """Select the most selective key, required by most routes and then with most distinct values.
+
+        `None` is returned if splitting the routes isn't worth it.
+        """
+        if len(routes) <= cls.MAX_LEAF_SIZE:
+            return None
+        counts: collections.Counter[PredicateKey] = collections.Counter()
+        values: dict[PredicateKey, set[Any]] = collections.defaultdict(set)
+        for _, compiled in routes:
+            for key, value in compiled.equal_values.items():
+                if key not in used_keys:
+                    counts[key] += 1
+                    values[key].add(value)
+        if not counts:
+            return None
+        key = max(counts, key=lambda key: (counts[key], len(values[key])))
+        return key if counts[key] > 1 else None
+
+    def _split(self, routes: list[IndexedRoute], used_keys: frozenset[PredicateKey]) -> None:
+        """Split routes into children by their required value of the key and the rest not requiring any value."""
+        groups: dict[Any, list[IndexedRoute]] = {}
+        rest: list[IndexedRoute] = []
+        for indexed in routes:
+            value = indexed[1].equal_values.get(self.key, JsonPath.MISSING)  # type: ignore[arg-type]
+            (rest if value is JsonPath.MISSING else groups.setdefault(value, [])).append(indexed)
+        self.children = {value: PredicateTree(group, used_keys) for value, group in groups.items()}
+        self.rest = PredicateTree(rest, used_keys) if rest else None
+
+    def match(
+        self, method: str, path: str, request: Request | None, body: RequestBody | None = None
+    ) -> IndexedRoute | None:
+        """Find the first route matching the request, with its position in the router."""
+        if self.key is None:
+            return self._match_leaf(method, path, request, body)
+        found = None
+        if (child := self.children.get(self._get_value(request, body))) is not None:
+            found = child.match(method, path, request, body)
+        if self.rest is None or (found is not None and found[0] < self.rest.first_index):
+            return found  # Routes of the rest are after the found one
+        other = self.rest.match(method, path, request, body)
+        return other if found is None or (other is not None and other[0] < found[0]) else found
+
+    def _get_value(self, request: Request | None, body: RequestBody | None) -> Any:
+        """Get value of the key of the node in the request, `JsonPath.MISSING` if the request doesn't have it."""
+        if self.body_path is not None:
+            value = self.body_path.resolve(body.get_json()) if body is not None else JsonPath.MISSING
+            if value is JsonPath.MISSING or isinstance(value, list | dict):
+                return JsonPath.MISSING
+            return get_json_key(value)
+        if self.key == GRAPHQL_OPERATION_KEY:
+            value = _get_graphql_operation_name(body)
+        else:
+            value = get_request_value(request, *self.key) if request is not None else None  # type: ignore[misc]
+        return JsonPath.MISSING if value is None else value
+
+    def _match_leaf(
+        self, method: str, path: str, request: Request | None, body: RequestBody | None
+    ) -> IndexedRoute | None:
+        """Find the first route of a leaf matching the request by checking them one by one."""
+        for indexed in self.routes:
+            if indexed[1].match(method, path) and indexed[1].match_request(request, body):
+                return indexed
+        return None
+
+
+def _get_graphql_operation_name(body: RequestBody | None) -> str | None:
+    """Get name of GraphQL operation executed by a request, `None` if it's not a GraphQL request or isn't named."""
+    graphql = body.get_graphql() if body is not None else None
+    return graphql.operation.name if graphql is not None else None
+
+
+class RouteIndex:
+    """Compiled routes of one host indexed by their paths.
+
+    Routes with paths without variables are grouped by path into `PredicateTree`s, routes with variables are checked
+    one by one.
+    """
+
+    __slots__ = ('trees', 'variable_routes', 'body_masks', 'variable_body_routes')
+
+    def __init__(self, routes: list[IndexedRoute]) -> None:
+        groups: dict[str, list[IndexedRoute]] = {}
+        self.variable_routes: list[IndexedRoute] = []
+        self.body_masks: dict[str, int] = {}  # Methods of routes with body predicates by their paths
+        for index, compiled in routes:
+            if compiled.path_regex is None:
+                groups.setdefault(compiled.path, []).append((index, compiled))
+                if compiled.matches_body:
+                    self.body_masks[compiled.path] = self.body_masks.get(compiled.path, 0) | compiled.method_mask
+            else:
+                self.variable_routes.append((index, compiled))
+        self.trees = {path: PredicateTree(group) for path, group in groups.items()}
+        self.variable_body_routes = [compiled for _, compiled in self.variable_routes if compiled.matches_body]
+
+    def needs_body(self, method: str, path: str) -> bool:
+        """Check whether matching a request with the method and normalized path may need its body."""
+        if METHOD_BITS.get(method, 0) & self.body_masks.get(path, 0):
+            return True
+        return any(compiled.match(method, path) for compiled in self.variable_body_routes)
+
+    def match(
+        self, method: str, path: str, request: Request | None, body: RequestBody | None
+    ) -> IndexedRoute | None:
+        """Find the first route matching method, normalized path and predicates of a request."""
+        found = tree.match(method, path, request, body) if (tree := self.trees.get(path)) is not None else None
+        for index, compiled in self.variable_routes:
+            if found is not None and index > found[0]:
+                break
+            if compiled.match(method, path) and compiled.match_request(request, body):
+                return index, compiled
+        return found
+
+
+class RoutePlan:
+    """Compiled routes of a router indexed for matching mocked requests.
+
+    Routes are split by their host into `RouteIndex`es, a request is matched only against routes of its host and
+    routes without a host. Requests match the first matching route in the order of the router, as if all routes were
+    checked one by one. The plan is built again when routes or the version of the router change, compiled routes
+    that are still up to date are reused.
+    """
+
+    __slots__ = ('routes', 'version', 'size', 'compiled_routes', 'any_host', 'hosts')
+
+    def __init__(self, routes: list[Route], version: int, previous: RoutePlan | None = None) -> None:
+        reusable = {id(compiled.route): compiled for compiled in previous.compiled_routes} if previous else {}
+        self.routes = routes
+        self.version = version
+        self.size = len(routes)
+        self.compiled_routes: list[CompiledRoute] = [self._compile(route, reusable) for route in routes]
+        groups: dict[str | None, list[IndexedRoute]] = {}
+        for index, compiled in enumerate(self.compiled_routes):
+            groups.setdefault(compiled.host, []).append((index, compiled))
+        self.any_host = RouteIndex(groups.pop(None, []))
+        self.hosts = {host: RouteIndex(group) for host, group in groups.items()}
+
+    @staticmethod
+    def _compile(route: Route, reusable: dict[int, CompiledRoute]) -> CompiledRoute:
+        """Compile the route, reuse its compiled route if it's up to date."""
+        if (compiled := reusable.get(id(route))) is not None and compiled.is_current(route):
+            return compiled
+        return CompiledRoute(route)
+
+    def is_current(self, routes: list[Route], version: int) -> bool:
+        """Check whether the plan is up to date with routes and version of a router."""
+        return self.routes is routes and self.version == version and self.size == len(routes)
+
+    def _get_indexes(self, request: Request | None) -> list[RouteIndex]:
+        """Get indexes of routes a request can match, routes with a host match only requests with the same host."""
+        if not self.hosts or request is None:
+            return [self.any_host]
+        hosts = get_request_hosts(request)
+        return [index for host in hosts if (index := self.hosts.get(host)) is not None] + [self.any_host]
+
+    def needs_body(self, method: str, path: str, request: Request | None = None) -> bool:
+        """Check whether matching a request with the method and normalized path may need its body."""
+        return any(index.needs_body(method, path) for index in self._get_indexes(request))
+
+    def match(
+        self, method: str, path: str, request: Request | None = None, body: RequestBody | None = None
+    ) -> CompiledRoute | None:
+        """Find the first compiled route matching host, method, normalized path and predicates of a request."""
+        found = None
+        for index in self._get_indexes(request):
+            if (other := index.match(method, path, request, body)) and (found is None or other[0] < found[0]):
+                found = other
+        return found[1] if found is not None else None
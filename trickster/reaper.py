@@ -0,0 +1,63 @@
+"""Removal of expired routes and namespaces."""
+
+from __future__ import annotations
+
+import datetime
+import threading
+
+from trickster.config import Config
+from trickster.logger import get_logger
+from trickster.metrics import get_metrics
+from trickster.namespaces import Namespaces
+from trickster.shared_state import modify_state
+
+
+class Reaper:
+    """Removes expired routes and namespaces in a background thread.
+
+    Routers and the namespace registry keep heaps of scheduled expirations, so each check only looks at the earliest
+    expirations instead of scanning all routes.
+    """
+
+    def __init__(self, config: Config, namespaces: Namespaces, interval: float = 1.0) -> None:
+        self.config = config
+        self.namespaces = namespaces
+        self.interval = interval
+        self.reaped_routes = get_metrics().counter('trickster_reaped_routes_total', 'Number of expired routes removed')
+        self.reaped_namespaces = get_metrics().counter(
+            'trickster_reaped_namespaces_total', 'Number of expired namespaces removed'
+        )
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def reap(self) -> None:
+        """Remove routes and namespaces that already expired."""
+        now = datetime.datetime.now(datetime.UTC)
+        if not self.namespaces.has_expired(now):
+            return
+        with modify_state(self.config) as namespaces:
+            removed_namespaces, removed_routes = namespaces.remove_expired(now)
+        self.reaped_namespaces.increment(removed_namespaces)
+        self.reaped_routes.increment(removed_routes)
+        get_logger().warning(f'Removed {removed_namespaces} expired namespaces and {removed_routes} expired routes.')
+
+    def _run(self) -> None:
+        """Remove expired routes and namespaces periodically until stopped."""
+        while not self._stopped.wait(self.interval):
+            try:
+                self.reap()
+            except Exception as e:
+                get_logger().warning(f'Expired routes were not removed: {e}')
+
+    def start(self) -> None:
+        """Start removing expired routes and namespaces in a background thread."""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='trickster-reaper', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop removing expired routes and namespaces."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
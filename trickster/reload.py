@@ -0,0 +1,198 @@
+"""Hot reload of the configuration file and the OpenApi specification.
+
+Watched files are checked periodically. When one of them changes, it's parsed again and only the differences against
+the previously loaded version are applied to the router: routes and error responses that were removed from the file
+are removed, new ones are added and routes with changed response or request validators get the new validators.
+Routes and error responses created using internal endpoints, responses of routes and hit counters are kept.
+
+Differences are identified by content (path and methods of routes, all attributes of error responses), so applying
+the same change twice, e.g. by multiple processes sharing the state, has the same effect as applying it once. Loaded
+routes are removed and changed by their IDs, so routes created using internal endpoints with the same path and
+methods are never touched.
+"""
+
+from __future__ import annotations
+
+import http
+import pathlib
+import threading
+
+from trickster.config import Config, JsonConfigSettingsSource
+from trickster.logger import get_logger
+from trickster.model import InputResponse, Response, Route
+from trickster.openapi import OpenApiSpec, get_openapi_cache
+from trickster.router import Router
+from trickster.shared_state import modify_state
+
+
+RouteKey = tuple[str, tuple[str, ...]]
+FileSignature = tuple[int, int] | None
+
+
+def get_route_key(route: Route) -> RouteKey:
+    """Get key identifying a route by its path and methods."""
+    return route.path.path, tuple(sorted(route.http_methods))
+
+
+def get_response_key(response: Response | InputResponse) -> str:
+    """Get key identifying a response by its content."""
+    return response.model_dump_json(include={'status_code', 'body', 'delay', 'headers', 'weight'})
+
+
+def _get_validators_key(route: Route) -> tuple[list[tuple[http.HTTPStatus, dict]], dict | None]:
+    """Get comparable representation of response and request validators of a route without their IDs."""
+    response_validators = [(validator.status_code, validator.json_schema) for validator in route.response_validators]
+    return response_validators, route.request_validator.model_dump() if route.request_validator else None
+
+
+def apply_routes_diff(routes: list[Route], old_routes: list[Route], new_routes: list[Route]) -> list[Route]:
+    """Get routes with applied differences between old and new version of loaded routes.
+
+    Only the loaded routes themselves, identified by their IDs, are removed or changed, so routes created using
+    internal endpoints are kept even if they have the same path and methods.
+    """
+    old = {get_route_key(route): route for route in old_routes}
+    new = {get_route_key(route): route for route in new_routes}
+    removed = {old[key].id for key in old.keys() - new.keys()}
+
+    result = [route for route in routes if route.id not in removed]
+    indexes = {route.id: index for index, route in enumerate(result)}
+    for key in old.keys() & new.keys():
+        if (index := indexes.get(old[key].id)) is None:
+            continue
+        validators = _get_validators_key(new[key])
+        route = result[index]
+        if _get_validators_key(old[key]) != validators and _get_validators_key(route) != validators:
+            result[index] = route.model_copy(update={
+                'response_validators': new[key].response_validators,
+                'request_validator': new[key].request_validator,
+                'version': route.version + 1,
+            })
+
+    present = {get_route_key(route) for route in result}
+    return result + [route for key, route in new.items() if key not in old and key not in present]
+
+
+def get_loaded_routes(routes: list[Route], old_routes: list[Route], new_routes: list[Route]) -> list[Route]:
+    """Get new version of loaded routes as they are in routes with applied differences, with IDs of kept routes."""
+    old = {get_route_key(route): route.id for route in old_routes}
+    current = {route.id: route for route in routes}
+    return [current.get(old[key], route) if (key := get_route_key(route)) in old else route for route in new_routes]
+
+
+def apply_error_responses_diff(
+    error_responses: list[Response], old_responses: list[InputResponse], new_responses: list[InputResponse]
+) -> list[Response]:
+    """Get error responses with applied differences between old and new version of configured error responses."""
+    old = {get_response_key(response) for response in old_responses}
+    new = {get_response_key(response): response for response in new_responses}
+    removed = old - new.keys()
+
+    result = [response for response in error_responses if get_response_key(response) not in removed]
+    present = {get_response_key(response) for response in result}
+    return result + [
+        Response(**response.model_dump()) for key, response in new.items() if key not in old and key not in present
+    ]
+
+
+class Reloader:
+    """Watches configuration file and OpenApi specification and applies their changes to the router.
+
+    Only the router of the default namespace is changed, other namespaces don't use the configured routes.
+    """
+
+    def __init__(self, config: Config, router: Router, spec_routes: list[Route], interval: float = 1.0) -> None:
+        self.config = config
+        self.router = router
+        self.interval = interval
+        self.config_path = pathlib.Path(JsonConfigSettingsSource(Config)._resolve_file_path())
+        self.spec_path = config.openapi_boostrap
+        self.error_responses = list(config.settings.error_responses)
+        self.spec_routes = spec_routes
+        self._signatures = {path: self._get_signature(path) for path in self._get_watched_paths()}
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def _get_watched_paths(self) -> list[pathlib.Path]:
+        """Get paths of all watched files."""
+        return [self.config_path] + ([self.spec_path] if self.spec_path else [])
+
+    @staticmethod
+    def _get_signature(path: pathlib.Path) -> FileSignature:
+        """Get modification time and size of a file, `None` if the file doesn't exist."""
+        try:
+            stat = path.stat()
+        except OSError:
+            return None
+        return stat.st_mtime_ns, stat.st_size
+
+    def _has_changed(self, path: pathlib.Path) -> bool:
+        """Check whether the file changed since the last check."""
+        signature = self._get_signature(path)
+        changed = self._signatures.get(path) != signature
+        self._signatures[path] = signature
+        return changed
+
+    def check(self) -> None:
+        """Reload watched files that changed since the last check."""
+        spec_changed = self.spec_path is not None and self._has_changed(self.spec_path)
+        if self._has_changed(self.config_path):
+            spec_changed = self.reload_config() or spec_changed
+        if spec_changed:
+            self.reload_spec()
+
+    def reload_config(self) -> bool:
+        """Apply changes of error responses from the configuration file, return whether OpenApi spec path changed."""
+        try:
+            new_config = Config()  # type: ignore[call-arg]
+        except Exception as e:
+            get_logger().warning(f'Configuration file "{self.config_path}" was not reloaded: {e}')
+            return False
+
+        new_error_responses = new_config.settings.error_responses
+        with modify_state(self.config), self.router.modify():
+            self.router.error_responses = apply_error_responses_diff(
+                self.router.error_responses, self.error_responses, new_error_responses
+            )
+        self.error_responses = list(new_error_responses)
+        get_logger().warning(f'Reloaded configuration file "{self.config_path}".')
+
+        if new_config.openapi_boostrap != self.spec_path:
+            self.spec_path = new_config.openapi_boostrap
+            return True
+        return False
+
+    def reload_spec(self) -> None:
+        """Apply changes of routes from the OpenApi specification."""
+        if self.spec_path:
+            self._signatures[self.spec_path] = self._get_signature(self.spec_path)
+        try:
+            cache = get_openapi_cache(self.config)
+            options = self.config.openapi_examples, self.config.openapi_request_validation
+            new_routes = OpenApiSpec.load_routes(self.spec_path, cache, *options) if self.spec_path else []
+        except Exception as e:
+            get_logger().warning(f'OpenApi specification "{self.spec_path}" was not reloaded: {e}')
+            return
+
+        with modify_state(self.config), self.router.modify():
+            self.router.routes = apply_routes_diff(self.router.routes, self.spec_routes, new_routes)
+            self.spec_routes = get_loaded_routes(self.router.routes, self.spec_routes, new_routes)
+        get_logger().warning(f'Reloaded OpenApi specification "{self.spec_path}".')
+
+    def _run(self) -> None:
+        """Check watched files periodically until stopped."""
+        while not self._stopped.wait(self.interval):
+            self.check()
+
+    def start(self) -> None:
+        """Start watching files in a background thread."""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, name='trickster-reload', daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop watching files."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
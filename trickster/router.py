@@ -2,16 +2,50 @@
 
 from __future__ import annotations
 
+import bisect
+import collections
+import contextlib
+import datetime
 import functools
+import heapq
+import threading
 import uuid
 import http
 
 from fastapi import Depends
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr
 from starlette.requests import Request
 
 from trickster.config import Config, get_config
-from trickster.model import Route, RouteMatch, Response, ResponseSelector
+from trickster.exceptions import PreconditionFailedError
+from trickster.journal import Journal
+from trickster.model import ExpirationTime, RequestBody, Route, RouteMatch, Response, ResponseSelector
+from trickster.plan import CompiledRoute, RoutePlan
+
+from typing import Any, Iterator, Mapping, Protocol
+
+
+class RouterState(Protocol):
+    """State of one or more routers that can be stored, restored and whose hits can be shared."""
+
+    def dump_state(self) -> bytes:
+        """Dump the state to json."""
+
+    def restore_state(self, state: bytes) -> None:
+        """Replace the state with previously dumped state."""
+
+    def track_hits(self) -> None:
+        """Start keeping track of hits that were not collected using `pop_pending_hits` yet."""
+
+    def pop_pending_hits(self) -> collections.Counter[uuid.UUID]:
+        """Get hits counted since the last call and start counting from zero."""
+
+    def set_hits(self, hits: Mapping[uuid.UUID, int]) -> None:
+        """Set hit counters of routes and responses."""
+
+    @property
+    def state_version(self) -> tuple[Any, ...]:
+        """Get value that changes whenever the dumped state changes, except for hit counters."""
 
 
 class Router(BaseModel):
@@ -22,6 +56,20 @@ class Router(BaseModel):
     )
     error_responses: list[Response] = Field(default_factory=list, description='List of error responses')
     routes: list[Route] = Field(default_factory=list, description='All configured routes')
+    journal: Journal = Field(default_factory=Journal, exclude=True, description='Journal of mocked requests')
+    expires_at: ExpirationTime = Field(default=None, description='Time the namespace of router is removed')
+    version: int = Field(default=1, description='Version of routes and error responses, incremented on each change')
+
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
+    _pending_hits: collections.Counter[uuid.UUID] | None = PrivateAttr(default=None)
+    _expirations: list[tuple[datetime.datetime, uuid.UUID]] = PrivateAttr(default_factory=list)  # Heap of routes
+    _modify_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+    _plan: RoutePlan | None = PrivateAttr(default=None)  # Compiled `routes`, built again when they change
+
+    def model_post_init(self, __context: Any) -> None:
+        """Schedule expiration of routes the router was created with."""
+        self._schedule_all_expirations()
 
     def match(self, request: Request) -> RouteMatch | None:
         """Find a route that matches request and return it with matched parameters."""
@@ -34,13 +82,171 @@ class Router(BaseModel):
                 )
         return None
 
+    def match_compiled(
+        self, method: str, path: str, request: Request | None = None, body: RequestBody | None = None
+    ) -> CompiledRoute | None:
+        """Find compiled route that matches host, method, path and predicates of a mocked request.
+
+        Routes with host or predicates match only if the request is given, routes with body predicates only if its
+        body is.
+        """
+        return self.get_plan().match(method, normalize_path(path), request, body)
+
+    def needs_body(self, method: str, path: str, request: Request | None = None) -> bool:
+        """Check whether matching a mocked request may need its body, i.e. it can match a route with body predicates.
+
+        Mocked requests handled asynchronously read the body before matching only if needed.
+        """
+        return self.get_plan().needs_body(method, normalize_path(path), request)
+
+    def get_plan(self) -> RoutePlan:
+        """Get compiled routes, compile them again if routes changed since they were compiled."""
+        routes, plan = self.routes, self._plan
+        if plan is None or not plan.is_current(routes, self.version):
+            plan = self._plan = RoutePlan(routes, self.version, plan)
+        return plan
+
+    def compile_routes(self) -> None:
+        """Compile all routes and their responses now, so first requests don't wait for it."""
+        for compiled in self.get_plan().compiled_routes:
+            compiled.compile_responses()
+
+    def count_hit(self, item: Route | Response) -> None:
+        """Increase hit counter of a route or a response."""
+        item.hits += 1
+        if self._pending_hits is not None:
+            self._pending_hits[item.id] += 1
+
+    def track_hits(self) -> None:
+        """Start keeping track of hits that were not collected using `pop_pending_hits` yet."""
+        if self._pending_hits is None:
+            self._pending_hits = collections.Counter()
+
+    def pop_pending_hits(self) -> collections.Counter[uuid.UUID]:
+        """Get hits counted since the last call and start counting from zero."""
+        pending_hits, self._pending_hits = self._pending_hits or collections.Counter(), collections.Counter()
+        return pending_hits
+
+    def iter_hit_counted(self) -> Iterator[Route | Response]:
+        """Iterate over all routes and responses that count their hits."""
+        for route in self.routes:
+            yield route
+            yield from route.responses
+            if route.auth is not None and route.auth.error_response is not None:
+                yield route.auth.error_response
+        yield from self.error_responses
+
+    def set_hits(self, hits: Mapping[uuid.UUID, int]) -> None:
+        """Set hit counters of routes and responses, counters of items missing in `hits` are set to zero."""
+        for item in self.iter_hit_counted():
+            item.hits = hits.get(item.id, 0)
+
+    @property
+    def state_version(self) -> tuple[Any, ...]:
+        """Get version of the router together with its expiration, they change whenever the dumped state changes."""
+        return self.version, self.expires_at
+
+    def dump_state(self) -> bytes:
+        """Dump routes, their responses, validators and counters and error responses to json."""
+        return self.model_dump_json(
+            include={'error_response_selector', 'error_responses', 'routes', 'expires_at', 'version'}
+        ).encode()
+
+    def restore_state(self, state: bytes) -> None:
+        """Replace routes and error responses with previously dumped state.
+
+        The state is trusted, so combinations of responses and validators are not validated again.
+        """
+        self.replace_state(Router.model_validate_json(state, context={'trusted': True}))
+
+    def replace_state(self, restored: Router) -> None:
+        """Replace routes and error responses with the ones of another router, journal is kept."""
+        self.error_response_selector = restored.error_response_selector
+        self.error_responses = restored.error_responses
+        self.routes = restored.routes
+        self.expires_at = restored.expires_at
+        self.version = restored.version
+        self._schedule_all_expirations()
+
+    @contextlib.contextmanager
+    def modify(self, if_match: str | None = None, route: Route | None = None) -> Iterator[None]:
+        """Change routes or error responses, or only the given route, without interleaving with other changes.
+
+        If `if_match` is set, the change is allowed only if it matches ETag of the route, or of the router if no
+        route is given. Versions of the router and the route are incremented after the change.
+        """
+        with self._modify_lock:
+            version = self.version if route is None else route.version
+            if if_match is not None and not matches_etag(if_match, version):
+                resource = 'Routes and error responses were' if route is None else f'Route "{route.id}" was'
+                raise PreconditionFailedError(f'{resource} changed, current ETag is {format_etag(version)}.')
+            yield
+            self.version += 1
+            if route is not None:
+                route.version += 1
+
+    def _schedule_all_expirations(self) -> None:
+        """Schedule expiration of all routes."""
+        self._expirations = [(route.expires_at, route.id) for route in self.routes if route.expires_at is not None]
+        heapq.heapify(self._expirations)
+
+    def schedule_expiration(self, route: Route) -> None:
+        """Schedule removal of the route at its expiration time, must be called when expiration of a route changes."""
+        if route.expires_at is not None:
+            heapq.heappush(self._expirations, (route.expires_at, route.id))
+
+    @property
+    def next_expiration(self) -> datetime.datetime | None:
+        """Get the earliest scheduled expiration of a route."""
+        return self._expirations[0][0] if self._expirations else None
+
+    def remove_expired_routes(self, now: datetime.datetime) -> int:
+        """Remove routes that expired before `now`, return number of removed routes.
+
+        Only routes scheduled to expire are checked, routes that were removed or whose expiration changed since
+        they were scheduled are skipped.
+        """
+        scheduled: set[uuid.UUID] = set()
+        while self._expirations and self._expirations[0][0] <= now:
+            scheduled.add(heapq.heappop(self._expirations)[1])
+        if not scheduled:
+            return 0
+        expired = {route.id for route in self.routes if route.id in scheduled and route.is_expired(now)}
+        if expired:
+            with self.modify():
+                self.routes = [route for route in self.routes if route.id not in expired]
+        return len(expired)
+
     def get_routes(self) -> list[Route]:
         """Get all configured routes."""
         return self.routes
 
+    def find_routes(
+        self,
+        path_prefix: str | None = None,
+        http_method: http.HTTPMethod | None = None,
+        tag: str | None = None,
+        has_hits: bool | None = None
+    ) -> list[Route]:
+        """Get routes matching all given filters, filters set to `None` are ignored."""
+        return [
+            route for route in self.routes
+            if (path_prefix is None or route.path.path.startswith(path_prefix))
+            and (http_method is None or http_method in route.http_methods)
+            and (tag is None or tag in route.tags)
+            and (has_hits is None or bool(route.hits) == has_hits)
+        ]
+
     def add_route(self, route: Route) -> None:
         """Add new route."""
         self.routes.append(route)
+        self.schedule_expiration(route)
+
+    def add_routes(self, routes: list[Route]) -> None:
+        """Add multiple new routes at once, so no request sees only some of them."""
+        self.routes = self.routes + routes
+        for route in routes:
+            self.schedule_expiration(route)
 
     def delete_route(self, route: Route) -> None:
         """Delete configured route."""
@@ -87,8 +293,58 @@ class Router(BaseModel):
         self.error_responses.remove(error_response)
 
 
+def normalize_path(path: str) -> str:
+    """Normalize path of a mocked request to start with `/`."""
+    return path if path.startswith('/') else f'/{path}'
+
+
+def format_etag(version: int) -> str:
+    """Format version of a route or a router as ETag."""
+    return f'"{version}"'
+
+
+def matches_etag(if_match: str, version: int) -> bool:
+    """Check whether value of `If-Match` header matches ETag of given version."""
+    tags = {tag.strip() for tag in if_match.split(',')}
+    return '*' in tags or format_etag(version) in tags
+
+
+def paginate(
+    routes: list[Route], all_routes: list[Route], cursor: str | None, limit: int | None
+) -> tuple[list[Route], str | None]:
+    """Get page of routes following `cursor` and cursor of the next page.
+
+    `routes` are filtered `all_routes` in the same order. The cursor is position of the last route of the previous
+    page in `all_routes` and its ID, so the page follows the route even if it was deleted or doesn't match filters
+    anymore. Cursor of the next page is `None` if there are no more routes.
+    """
+    positions = {route.id: index for index, route in enumerate(all_routes)}
+    start = 0
+    if cursor is not None:
+        position = _get_cursor_position(cursor, positions)
+        start = bisect.bisect_right(routes, position, key=lambda route: positions[route.id])
+    if limit is None or start + limit >= len(routes):
+        return routes[start:], None
+    page = routes[start:start + limit]
+    return page, f'{positions[page[-1].id]}:{page[-1].id}'
+
+
+def _get_cursor_position(cursor: str, positions: dict[uuid.UUID, int]) -> int:
+    """Get position of the route the cursor points to, the position before it if the route was deleted."""
+    position, _, route_id = cursor.partition(':')
+    try:
+        return positions.get(uuid.UUID(route_id), int(position) - 1)
+    except ValueError:
+        raise ValueError(f'Cursor "{cursor}" is invalid.') from None
+
+
+def create_router(config: Config) -> Router:
+    """Create new router with configured error responses."""
+    error_responses = [Response(**response.model_dump()) for response in config.settings.error_responses]
+    return Router(error_responses=error_responses, journal=Journal(config.journal_size))
+
+
 @functools.lru_cache(typed=False)
 def get_router(config: Config = Depends(get_config)) -> Router:
-    """Get a router."""
-    error_responses = [Response(**response.model_dump()) for response in config.settings.error_responses]
-    return Router(error_responses=error_responses)
+    """Get a router of the default namespace."""
+    return create_router(config)
@@ -0,0 +1,276 @@
+"""State of the router shared by multiple Trickster processes.
+
+When Trickster runs in multiple worker processes, each of them has its own router. To make all workers behave the
+same, the router state is stored in a SQLite database in WAL mode. Every request first checks the version of the
+stored state and reloads the router if another worker changed it. Requests to internal endpoints that modify the
+router hold the database write lock while they are handled and store the new state before the response is sent.
+
+Hits are counted locally and periodically added to aggregated counters in the database, internal endpoints
+always show the aggregated counters of all workers.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import functools
+import pathlib
+import sqlite3
+import threading
+import time
+import uuid
+
+from fastapi import Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response
+from fastapi.routing import APIRoute
+
+from trickster.config import Config, get_config
+from trickster.namespaces import Namespaces, get_namespaces
+from trickster.router import RouterState
+from trickster.snapshot import get_snapshotter
+
+from typing import Any, Callable, Coroutine, Iterator
+
+
+RouteHandler = Callable[[Request], Coroutine[Any, Any, Response]]
+
+
+class SharedState:
+    """Router state stored in a SQLite database."""
+
+    _SCHEMA = (
+        'CREATE TABLE IF NOT EXISTS router_state (id INTEGER PRIMARY KEY CHECK (id = 1), version INTEGER, state BLOB)',
+        'CREATE TABLE IF NOT EXISTS hits (id TEXT PRIMARY KEY, hits INTEGER)',
+    )
+
+    def __init__(self, database: pathlib.Path, hits_interval: float = 1.0) -> None:
+        self.database = database
+        self.hits_interval = hits_interval
+        self.version: int | None = None  # Version of the state loaded to this process
+        self._local = threading.local()
+        self._write_connection = self._connect()
+        self._write_lock = threading.Lock()
+        self._refresh_lock = threading.Lock()
+        self._last_hits_flush = time.monotonic()
+        for statement in self._SCHEMA:
+            self._write_connection.execute(statement)
+
+    def _connect(self) -> sqlite3.Connection:
+        """Open new connection to the database."""
+        connection = sqlite3.connect(self.database, isolation_level=None, check_same_thread=False, timeout=30)
+        connection.execute('PRAGMA journal_mode=WAL')
+        connection.execute('PRAGMA synchronous=NORMAL')
+        return connection
+
+    @property
+    def _read_connection(self) -> sqlite3.Connection:
+        """Get connection used for reading by the current thread."""
+        if not hasattr(self._local, 'connection'):
+            self._local.connection = self._connect()
+        return self._local.connection
+
+    def get_version(self, connection: sqlite3.Connection | None = None) -> int | None:
+        """Get version of the stored state, `None` if no state was stored yet."""
+        connection = connection or self._read_connection
+        row = connection.execute('SELECT version FROM router_state WHERE id = 1').fetchone()
+        return row[0] if row else None
+
+    def get_hits(self, connection: sqlite3.Connection | None = None) -> dict[uuid.UUID, int]:
+        """Get aggregated hits of all processes."""
+        connection = connection or self._read_connection
+        return {uuid.UUID(item_id): hits for item_id, hits in connection.execute('SELECT id, hits FROM hits')}
+
+    def refresh(self, router: RouterState, connection: sqlite3.Connection | None = None) -> None:
+        """Load the stored state to the router if it was changed by another process."""
+        connection = connection or self._read_connection
+        if self.get_version(connection) == self.version:
+            return
+        with self._refresh_lock:
+            row = connection.execute('SELECT version, state FROM router_state WHERE id = 1').fetchone()
+            if row is not None and row[0] != self.version:
+                router.restore_state(row[1])
+                router.set_hits(self.get_hits(connection))
+                self.version = row[0]
+
+    def sync_hits(self, router: RouterState) -> None:
+        """Add hits counted by this process to aggregated counters and show aggregated counters in the router."""
+        with self._write_lock:
+            self._flush_hits(router)
+        router.set_hits(self.get_hits())
+
+    @property
+    def hits_flush_due(self) -> bool:
+        """Check whether enough time passed since the last flush of hits."""
+        return time.monotonic() - self._last_hits_flush >= self.hits_interval
+
+    def flush_hits(self, router: RouterState) -> None:
+        """Add hits counted by this process to aggregated counters.
+
+        Flush is skipped if another thread is writing to the database, hits will be flushed next time.
+        """
+        if self._write_lock.acquire(False):
+            try:
+                self._flush_hits(router)
+            finally:
+                self._write_lock.release()
+
+    def _flush_hits(self, router: RouterState) -> None:
+        """Add hits counted by this process to aggregated counters, caller must hold the write lock."""
+        self._last_hits_flush = time.monotonic()
+        if pending_hits := router.pop_pending_hits():
+            in_transaction = self._write_connection.in_transaction
+            if not in_transaction:
+                self._write_connection.execute('BEGIN IMMEDIATE')
+            self._write_connection.executemany(
+                'INSERT INTO hits (id, hits) VALUES (?, ?) ON CONFLICT (id) DO UPDATE SET hits = hits + excluded.hits',
+                [(str(item_id), hits) for item_id, hits in pending_hits.items()]
+            )
+            if not in_transaction:
+                self._write_connection.execute('COMMIT')
+
+    def begin(self, router: RouterState) -> None:
+        """Start modification of the state.
+
+        Acquires the database write lock, so no other process can modify the state until `commit` or `rollback`,
+        and loads the latest state to the router.
+        """
+        self._write_lock.acquire()
+        try:
+            self._write_connection.execute('BEGIN IMMEDIATE')
+            self.refresh(router, self._write_connection)
+        except Exception:
+            self._write_lock.release()
+            raise
+
+    def commit(self, router: RouterState) -> None:
+        """Store the modified state of the router and release the write lock."""
+        try:
+            self._flush_hits(router)
+            version = (self.get_version(self._write_connection) or 0) + 1
+            self._write_connection.execute(
+                'INSERT INTO router_state (id, version, state) VALUES (1, ?, ?) '
+                'ON CONFLICT (id) DO UPDATE SET version = excluded.version, state = excluded.state',
+                (version, router.dump_state())
+            )
+            self._write_connection.execute('COMMIT')
+            self.version = version
+        finally:
+            self._write_lock.release()
+
+    def release(self, router: RouterState) -> None:
+        """End modification that didn't change the state, only hits are stored, and release the write lock."""
+        try:
+            self._flush_hits(router)
+            self._write_connection.execute('COMMIT')
+        finally:
+            self._write_lock.release()
+
+    def rollback(self) -> None:
+        """Abandon modification of the state and release the write lock.
+
+        The router may have been modified partially, so the state is loaded again with the next refresh.
+        """
+        self.version = None
+        self._release()
+
+    def _release(self) -> None:
+        """End the transaction without any changes and release the write lock."""
+        try:
+            self._write_connection.execute('ROLLBACK')
+        finally:
+            self._write_lock.release()
+
+    @contextlib.contextmanager
+    def transaction(self, router: RouterState) -> Iterator[None]:
+        """Modify the state within a transaction, changes are stored if no exception is raised."""
+        self.begin(router)
+        try:
+            yield
+        except BaseException:
+            self.rollback()
+            raise
+        self.commit(router)
+
+    def initialize(self, router: RouterState) -> None:
+        """Load the state if some other process already stored it, store the state of the router otherwise."""
+        router.track_hits()
+        self.begin(router)
+        if self.version is None:
+            self.commit(router)
+        else:
+            self._release()
+
+
+@functools.lru_cache(typed=False)
+def get_shared_state(config: Config) -> SharedState | None:
+    """Get shared state if it's configured."""
+    if config.shared_state is None:
+        return None
+    return SharedState(config.shared_state, config.shared_hits_interval)
+
+
+@contextlib.contextmanager
+def modify_state(config: Config) -> Iterator[Namespaces]:
+    """Modify routers of all namespaces outside of a request, share and persist the changes if configured."""
+    namespaces = get_namespaces(config=config)
+    shared_state = get_shared_state(config)
+    with shared_state.transaction(namespaces) if shared_state else contextlib.nullcontext():
+        yield namespaces
+    if snapshotter := get_snapshotter(config):
+        snapshotter.mark_changed()
+
+
+class SharedStateRoute(APIRoute):
+    """Route that loads changes of the router state made by other processes before handling a request."""
+
+    def get_route_handler(self) -> RouteHandler:
+        """Wrap route handler with synchronization of the router state."""
+        handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            config = get_config()
+            if shared_state := get_shared_state(config):
+                return await self.handle_shared(request, handler, shared_state, get_namespaces(config=config))
+            return await handler(request)
+
+        return route_handler
+
+    async def handle_shared(
+        self, request: Request, handler: RouteHandler, shared_state: SharedState, router: RouterState
+    ) -> Response:
+        """Handle a request with up to date router state."""
+        await run_in_threadpool(shared_state.refresh, router)
+        response = await handler(request)
+        if shared_state.hits_flush_due:
+            await run_in_threadpool(shared_state.flush_hits, router)
+        return response
+
+
+class InternalSharedStateRoute(SharedStateRoute):
+    """Route that also stores changes of the router state made by a request, so other processes can load them."""
+
+    async def handle_shared(
+        self, request: Request, handler: RouteHandler, shared_state: SharedState, router: RouterState
+    ) -> Response:
+        """Handle a request with up to date router state and store its changes.
+
+        Requests that don't change the state, e.g. verification of the journal, don't store it, so other processes
+        don't have to load it again.
+        """
+        if request.method in ('GET', 'HEAD'):
+            await run_in_threadpool(shared_state.refresh, router)
+            await run_in_threadpool(shared_state.sync_hits, router)
+            return await handler(request)
+
+        await run_in_threadpool(shared_state.begin, router)
+        state_version = router.state_version
+        try:
+            response = await handler(request)
+        except BaseException:
+            await run_in_threadpool(shared_state.rollback)
+            raise
+        if router.state_version == state_version:
+            await run_in_threadpool(shared_state.release, router)
+        else:
+            await run_in_threadpool(shared_state.commit, router)
+        return response
@@ -0,0 +1,160 @@
+"""Snapshots of the router state stored on disk."""
+
+from __future__ import annotations
+
+import datetime
+import functools
+import pathlib
+import threading
+import zlib
+
+from fastapi import Depends, Request
+from pydantic import BaseModel, Field
+
+from trickster.config import Config, get_config
+from trickster.exceptions import ResourceNotFoundError
+from trickster.router import RouterState
+
+from typing import AsyncIterator
+
+
+class SnapshotError(ValueError):
+    """Snapshot file can't be used to restore the router state."""
+
+
+class SnapshotInfo(BaseModel):
+    """Information about a stored snapshot."""
+
+    path: pathlib.Path = Field(description='Path to the snapshot file')
+    size: int = Field(description='Size of the snapshot in bytes')
+    modified: datetime.datetime = Field(description='Time the snapshot was stored')
+
+
+class Snapshotter:
+    """Stores snapshots of the router state to a file and restores the state from it.
+
+    A snapshot is a compressed json dump of all routes with their responses, validators and counters and all error
+    responses. Changes of the state are only marked and the snapshot is stored by a background thread at most once
+    per interval, so a burst of changes results in a single snapshot.
+    """
+
+    MAGIC = b'TRICKSTER-SNAPSHOT-1\n'  # Prefix identifying snapshot files and their format version
+
+    def __init__(self, path: pathlib.Path, interval: float = 10.0) -> None:
+        self.path = path
+        self.interval = interval
+        self._changed = False
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def encode(cls, router: RouterState) -> bytes:
+        """Encode router state to snapshot."""
+        return cls.MAGIC + zlib.compress(router.dump_state(), level=1)
+
+    @classmethod
+    def decode(cls, snapshot: bytes) -> bytes:
+        """Decode router state from snapshot."""
+        if not snapshot.startswith(cls.MAGIC):
+            raise SnapshotError('File is not a Trickster snapshot.')
+        try:
+            return zlib.decompress(snapshot[len(cls.MAGIC):])
+        except zlib.error as e:
+            raise SnapshotError('Snapshot is corrupted.') from e
+
+    def get_info(self) -> SnapshotInfo:
+        """Get information about the stored snapshot."""
+        stat = self.path.stat()
+        return SnapshotInfo(
+            path=self.path,
+            size=stat.st_size,
+            modified=datetime.datetime.fromtimestamp(stat.st_mtime, datetime.UTC)
+        )
+
+    def save(self, router: RouterState) -> SnapshotInfo:
+        """Store snapshot of the router state.
+
+        The snapshot is written to a temporary file first, so an interrupted write never damages the previous one.
+        """
+        with self._lock:
+            self._changed = False
+            temporary_path = self.path.with_name(f'.{self.path.name}.tmp')
+            temporary_path.write_bytes(self.encode(router))
+            temporary_path.replace(self.path)
+        return self.get_info()
+
+    def load(self, router: RouterState) -> bool:
+        """Restore router state from the stored snapshot, return `False` if there is no snapshot."""
+        try:
+            snapshot = self.path.read_bytes()
+        except FileNotFoundError:
+            return False
+        router.restore_state(self.decode(snapshot))
+        return True
+
+    def mark_changed(self) -> None:
+        """Mark the router state as changed, so it's stored with the next periodic snapshot."""
+        self._changed = True
+
+    def save_if_changed(self, router: RouterState) -> None:
+        """Store snapshot if the router state was changed since the last snapshot."""
+        if self._changed:
+            self.save(router)
+
+    def _run(self, router: RouterState) -> None:
+        """Store snapshots periodically until stopped."""
+        while not self._stopped.wait(self.interval):
+            self.save_if_changed(router)
+
+    def start(self, router: RouterState) -> None:
+        """Start storing snapshots periodically in a background thread."""
+        self._stopped.clear()
+        self._thread = threading.Thread(target=self._run, args=(router,), name='trickster-snapshot', daemon=True)
+        self._thread.start()
+
+    def stop(self, router: RouterState) -> None:
+        """Stop storing snapshots periodically and store the last changes."""
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.save_if_changed(router)
+
+
+@functools.lru_cache(typed=False)
+def get_snapshotter(config: Config) -> Snapshotter | None:
+    """Get snapshotter if snapshots are configured."""
+    if config.snapshot_path is None:
+        return None
+    return Snapshotter(config.snapshot_path, config.snapshot_interval)
+
+
+def get_required_snapshotter(config: Config = Depends(get_config)) -> Snapshotter:
+    """Get snapshotter, raise error if snapshots are not configured."""
+    if snapshotter := get_snapshotter(config):
+        return snapshotter
+    raise ResourceNotFoundError('Snapshots are not configured.')
+
+
+def _mark_changed() -> None:
+    """Mark router state as changed if snapshots are configured."""
+    if snapshotter := get_snapshotter(get_config()):
+        snapshotter.mark_changed()
+
+
+async def track_changes() -> AsyncIterator[None]:
+    """Mark router state as changed after a mocked request, as mocked requests change hit counters."""
+    try:
+        yield
+    finally:
+        _mark_changed()
+
+
+async def track_internal_changes(request: Request) -> AsyncIterator[None]:
+    """Mark router state as changed after an internal request, unless the request only reads the state."""
+    try:
+        yield
+    finally:
+        if request.method not in ('GET', 'HEAD'):
+            _mark_changed()
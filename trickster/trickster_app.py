@@ -1,27 +1,81 @@
 """Trickster application."""
 
+import functools
+
 import uvicorn
 from fastapi import FastAPI
 
 from trickster.endpoints import internal, mocked
-from trickster.config import get_config
+from trickster.config import Config, OpenApiSource, get_config
+from trickster.fast_path import MockedFastPath
 from trickster.meta import get_metadata
-from trickster.openapi import OpenApiSpec
-from trickster.router import get_router
+from trickster.model import Route
+from trickster.openapi import get_openapi_cache, load_specs_routes
+from trickster.reaper import Reaper
+from trickster.reload import Reloader
+from trickster.namespaces import NamespacePrefixMiddleware, Namespaces, get_namespaces
+from trickster.shared_state import get_shared_state
+from trickster.snapshot import Snapshotter, get_snapshotter
 from trickster.logger import get_logger
 from trickster.exception_handler import request_error_handlers
 
 
-def load_openapi_routes() -> None:
-    """Load OpenApi and configure all routes."""
+def load_openapi_routes() -> list[Route]:
+    """Load all OpenApi specifications and configure their routes, return routes of `openapi_boostrap`.
+
+    All specifications are loaded before any routes are configured, so routes of all of them are set at once.
+    """
     logger = get_logger()
-    if spec_path := get_config().openapi_boostrap:
-        try:
-            spec = OpenApiSpec.load(spec_path)
-            get_router(config=get_config()).routes = spec.get_routes()
-            logger.warning(f'Loaded OpenApi specification "{spec_path}".')
-        except FileNotFoundError:
-            logger.warning(f'OpenApi specification "{spec_path}" was not loaded.')
+    config = get_config()
+    sources = ([OpenApiSource(path=config.openapi_boostrap)] if config.openapi_boostrap else []) + config.openapi_specs
+    loaded = load_specs_routes(
+        [source.path for source in sources], [source.prefix for source in sources], get_openapi_cache(config),
+        config.openapi_examples, config.openapi_request_validation
+    )
+    routes_by_namespace: dict[str | None, list[Route]] = {}
+    for source, routes in zip(sources, loaded):
+        if routes is None:
+            logger.warning(f'OpenApi specification "{source.path}" was not loaded.')
+        else:
+            routes_by_namespace.setdefault(source.namespace, []).extend(routes)
+            logger.warning(f'Loaded OpenApi specification "{source.path}".')
+    namespaces = get_namespaces(config=config)
+    for name, routes in routes_by_namespace.items():
+        router = namespaces.get(name) if name is not None else namespaces.default
+        router.routes = routes
+        if config.openapi_examples:
+            router.compile_routes()
+    return (loaded[0] or []) if config.openapi_boostrap else []
+
+
+def restore_snapshot(snapshotter: Snapshotter, namespaces: Namespaces) -> None:
+    """Restore the router state from the stored snapshot, keep the configured routes if it can't be restored."""
+    logger = get_logger()
+    try:
+        if snapshotter.load(namespaces):
+            logger.warning(f'Restored snapshot "{snapshotter.path}".')
+    except ValueError as e:
+        logger.warning(f'Snapshot "{snapshotter.path}" was not restored: {e}')
+
+
+def load_state(app: FastAPI, config: Config) -> None:
+    """Load routes and set up persistence and sharing of the router state."""
+    namespaces = get_namespaces(config=config)
+    spec_routes = load_openapi_routes()
+    if snapshotter := get_snapshotter(config):
+        if config.snapshot_load:
+            restore_snapshot(snapshotter, namespaces)
+        app.add_event_handler('startup', functools.partial(snapshotter.start, namespaces))
+        app.add_event_handler('shutdown', functools.partial(snapshotter.stop, namespaces))
+    if shared_state := get_shared_state(config):
+        shared_state.initialize(namespaces)
+    reaper = Reaper(config, namespaces, config.reaper_interval)
+    app.add_event_handler('startup', reaper.start)
+    app.add_event_handler('shutdown', reaper.stop)
+    if config.reload_interval is not None:
+        reloader = Reloader(config, namespaces.default, spec_routes, config.reload_interval)
+        app.add_event_handler('startup', reloader.start)
+        app.add_event_handler('shutdown', reloader.stop)
 
 
 def create_app() -> FastAPI:
@@ -37,8 +91,17 @@ def create_app() -> FastAPI:
     )
     app.include_router(internal.router, prefix=config.internal_prefix)
     app.include_router(mocked.router)
+    if config.mocked_fast_path:
+        documentation = [app.openapi_url, app.redoc_url, app.swagger_ui_oauth2_redirect_url]
+        app.add_middleware(
+            MockedFastPath,
+            passthrough_prefix=config.internal_prefix,
+            passthrough_paths=[path for path in documentation if path is not None]
+        )
+    if config.namespace_prefix is not None:
+        app.add_middleware(NamespacePrefixMiddleware, prefix=config.namespace_prefix, header=config.namespace_header)
 
-    load_openapi_routes()
+    load_state(app, config)
     return app
 
 
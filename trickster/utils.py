@@ -1,6 +1,40 @@
 """Utility functions that don't fit anywhere else."""
 
+from typing import Any
+
 
 def remove_none_values(values: dict) -> dict:
     """Remove None values from dict."""
     return {k: v for k, v in values.items() if v is not None}
+
+
+def merge_patch(target: Any, patch: Any) -> Any:
+    """Apply JSON merge patch (RFC 7396) to a json value.
+
+    Objects are merged recursively, `None` removes a key and any other value replaces the original one.
+    """
+    if not isinstance(patch, dict):
+        return patch
+    result = dict(target) if isinstance(target, dict) else {}
+    for key, value in patch.items():
+        if value is None:
+            result.pop(key, None)
+        else:
+            result[key] = merge_patch(result.get(key), value)
+    return result
+
+
+def json_equals(first: Any, second: Any) -> bool:
+    """Compare two json values, unlike `==` booleans aren't equal to numbers, e.g. `true` to `1`."""
+    if isinstance(first, bool) or isinstance(second, bool):
+        return type(first) is type(second) and first == second
+    if isinstance(first, list) and isinstance(second, list):
+        return len(first) == len(second) and all(map(json_equals, first, second))
+    if isinstance(first, dict) and isinstance(second, dict):
+        return first.keys() == second.keys() and all(json_equals(value, second[key]) for key, value in first.items())
+    return first == second
+
+
+def get_json_key(value: Any) -> tuple[bool, Any]:
+    """Get key of a scalar json value for dicts, keys of values are equal only if the values are `json_equals`."""
+    return isinstance(value, bool), value